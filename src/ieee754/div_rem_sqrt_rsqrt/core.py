@@ -61,8 +61,12 @@ class DivPipeCoreConfig:
         radix point.
     :attribute log2_radix: number of bits of ``quotient_root`` that should be
         computed per pipeline stage.
+    :attribute normalised_inputs: whether the divisor and radicand must be
+        normalised (the SRT and Newton-Raphson cores): they need not be here.
     """
 
+    normalised_inputs = False
+
     def __init__(self, bit_width, fract_width, log2_radix, supported=None):
         """ Create a ``DivPipeCoreConfig`` instance. """
         self.bit_width = bit_width
@@ -73,7 +77,6 @@ class DivPipeCoreConfig:
         else:
             supported = frozenset(supported)
         self.supported = supported
-        print(f"{self}: n_stages={self.n_stages}")
 
     def __repr__(self):
         """ Get repr. """
@@ -84,7 +87,51 @@ class DivPipeCoreConfig:
     @property
     def n_stages(self):
         """ Get the number of ``DivPipeCoreCalculateStage`` needed. """
-        return (self.bit_width + self.log2_radix - 1) // self.log2_radix
+        return (self.quotient_width + self.log2_radix - 1) // self.log2_radix
+
+    @property
+    def quotient_width(self):
+        """ Get the number of ``quotient_root`` bits to be computed: a
+        square root only has ``(bit_width + fract_width + 1) // 2``.
+        """
+        bw = self.bit_width
+        if self.supported == {DP.SqrtRem}:
+            return min(bw, (bw + self.fract_width + 1) // 2)
+        return bw
+
+    @property
+    def compare_len(self):
+        """ Get the bit-width of ``compare_lhs``, ``compare_rhs`` and the
+        remainder.
+
+        Only rsqrt needs ``bit_width * 3`` (``quotient_root ** 2 *
+        divisor_radicand``): the div and sqrt trials are
+        ``(quotient_root * divisor_radicand) << fract_width`` and
+        ``quotient_root ** 2 << fract_width``.
+        """
+        bw = self.bit_width
+        fw = self.fract_width
+        if DP.RSqrtRem in self.supported:
+            return bw * 3
+        qw = self.quotient_width
+        rhs_len = qw + fw + (bw if DP.UDivRem in self.supported else qw)
+        return max(bw + fw * 2, rhs_len)
+
+    @property
+    def divisor_width(self):
+        """ Get the bit-width of the interstage ``divisor_radicand``: sqrt
+        only needs it in ``DivPipeCoreSetupStage``.
+        """
+        if self.supported == {DP.SqrtRem}:
+            return 0
+        return self.bit_width
+
+    @property
+    def root_times_radicand_width(self):
+        """ Get the bit-width of ``root_times_radicand``: rsqrt only. """
+        if DP.RSqrtRem in self.supported:
+            return self.bit_width * 2
+        return 0
 
 
 class DivPipeCoreInputData:
@@ -130,38 +177,36 @@ class DivPipeCoreInterstageData:
     :attribute core_config: ``DivPipeCoreConfig`` instance describing the
         configuration to be used.
     :attribute divisor_radicand: divisor for div/rem and radicand for
-        sqrt/rsqrt. Signal with a bit-width of ``core_config.bit_width`` and a
-        fract-width of ``core_config.fract_width`` bits.
+        sqrt/rsqrt. Signal with a bit-width of ``core_config.divisor_width``
+        and a fract-width of ``core_config.fract_width`` bits.
     :attribute operation: the ``DivPipeCoreOperation`` to be computed.
     :attribute quotient_root: the quotient or root part of the result of the
-        operation. Signal with a bit-width of ``core_config.bit_width`` and a
-        fract-width of ``core_config.fract_width`` bits.
+        operation. Signal with a bit-width of ``core_config.quotient_width``
+        and a fract-width of ``core_config.fract_width`` bits.
     :attribute root_times_radicand: ``quotient_root * divisor_radicand``.
-        Signal with a bit-width of ``core_config.bit_width * 2`` and a
-        fract-width of ``core_config.fract_width * 2`` bits.
+        Signal with a bit-width of ``core_config.root_times_radicand_width``
+        and a fract-width of ``core_config.fract_width * 2`` bits.
     :attribute compare_lhs: The left-hand-side of the comparison in the
         equation to be solved. Signal with a bit-width of
-        ``core_config.bit_width * 3`` and a fract-width of
+        ``core_config.compare_len`` and a fract-width of
         ``core_config.fract_width * 3`` bits.
     :attribute compare_rhs: The right-hand-side of the comparison in the
         equation to be solved. Signal with a bit-width of
-        ``core_config.bit_width * 3`` and a fract-width of
+        ``core_config.compare_len`` and a fract-width of
         ``core_config.fract_width * 3`` bits.
     """
 
     def __init__(self, core_config, reset_less=True):
         """ Create a ``DivPipeCoreInterstageData`` instance. """
         self.core_config = core_config
-        bw = core_config.bit_width
-        # TODO(programmerjake): re-enable once bit_width reduction is fixed
-        if False and core_config.supported == {DP.UDivRem}:
-            self.compare_len = bw * 2
-        else:
-            self.compare_len = bw * 3
-        self.divisor_radicand = Signal(bw, reset_less=reset_less)
+        self.compare_len = core_config.compare_len
+        self.divisor_radicand = Signal(core_config.divisor_width,
+                                       reset_less=reset_less)
         self.operation = DP.create_signal(reset_less=reset_less)
-        self.quotient_root = Signal(bw, reset_less=reset_less)
-        self.root_times_radicand = Signal(bw * 2, reset_less=reset_less)
+        self.quotient_root = Signal(core_config.quotient_width,
+                                    reset_less=reset_less)
+        self.root_times_radicand = Signal(
+            core_config.root_times_radicand_width, reset_less=reset_less)
         self.compare_lhs = Signal(self.compare_len, reset_less=reset_less)
         self.compare_rhs = Signal(self.compare_len, reset_less=reset_less)
 
@@ -193,7 +238,7 @@ class DivPipeCoreOutputData:
         operation. Signal with a bit-width of ``core_config.bit_width`` and a
         fract-width of ``core_config.fract_width`` bits.
     :attribute remainder: the remainder part of the result of the operation.
-        Signal with a bit-width of ``core_config.bit_width * 3`` and a
+        Signal with a bit-width of ``core_config.compare_len`` and a
         fract-width of ``core_config.fract_width * 3`` bits.
     """
 
@@ -201,11 +246,7 @@ class DivPipeCoreOutputData:
         """ Create a ``DivPipeCoreOutputData`` instance. """
         self.core_config = core_config
         bw = core_config.bit_width
-        # TODO(programmerjake): re-enable once bit_width reduction is fixed
-        if False and core_config.supported == {DP.UDivRem}:
-            self.compare_len = bw * 2
-        else:
-            self.compare_len = bw * 3
+        self.compare_len = core_config.compare_len
         self.quotient_root = Signal(bw, reset_less=reset_less)
         self.remainder = Signal(self.compare_len, reset_less=reset_less)
 
@@ -229,12 +270,7 @@ class DivPipeCoreSetupStage(Elaboratable):
         self.core_config = core_config
         self.i = self.ispec()
         self.o = self.ospec()
-        bw = core_config.bit_width
-        # TODO(programmerjake): re-enable once bit_width reduction is fixed
-        if False and core_config.supported == {DP.UDivRem}:
-            self.compare_len = bw * 2
-        else:
-            self.compare_len = bw * 3
+        self.compare_len = core_config.compare_len
 
     def ispec(self):
         """ Get the input spec for this pipeline stage."""
@@ -265,13 +301,18 @@ class DivPipeCoreSetupStage(Elaboratable):
         lhs = Signal(self.compare_len, reset_less=True)
         fw = self.core_config.fract_width
 
+        cc = self.core_config
+
         with m.Switch(self.i.operation):
-            with m.Case(int(DP.UDivRem)):
-                comb += lhs.eq(self.i.dividend << fw)
-            with m.Case(int(DP.SqrtRem)):
-                comb += lhs.eq(self.i.divisor_radicand << (fw * 2))
-            with m.Case(int(DP.RSqrtRem)):
-                comb += lhs.eq(1 << (fw * 3))
+            if DP.UDivRem in cc.supported:
+                with m.Case(int(DP.UDivRem)):
+                    comb += lhs.eq(self.i.dividend << fw)
+            if DP.SqrtRem in cc.supported:
+                with m.Case(int(DP.SqrtRem)):
+                    comb += lhs.eq(self.i.divisor_radicand << (fw * 2))
+            if DP.RSqrtRem in cc.supported:
+                with m.Case(int(DP.RSqrtRem)):
+                    comb += lhs.eq(1 << (fw * 3))
 
         comb += self.o.compare_lhs.eq(lhs)
         comb += self.o.compare_rhs.eq(0)
@@ -286,15 +327,13 @@ class Trial(Elaboratable):
         self.trial_bits = trial_bits
         self.current_shift = current_shift
         self.log2_radix = log2_radix
-        bw = core_config.bit_width
-        # TODO(programmerjake): re-enable once bit_width reduction is fixed
-        if False and core_config.supported == {DP.UDivRem}:
-            self.compare_len = bw * 2
-        else:
-            self.compare_len = bw * 3
-        self.divisor_radicand = Signal(bw, reset_less=True)
-        self.quotient_root = Signal(bw, reset_less=True)
-        self.root_times_radicand = Signal(bw * 2, reset_less=True)
+        self.compare_len = core_config.compare_len
+        self.divisor_radicand = Signal(core_config.divisor_width,
+                                       reset_less=True)
+        self.quotient_root = Signal(core_config.quotient_width,
+                                    reset_less=True)
+        self.root_times_radicand = Signal(
+            core_config.root_times_radicand_width, reset_less=True)
         self.compare_rhs = Signal(self.compare_len, reset_less=True)
         self.trial_compare_rhs = Signal(self.compare_len, reset_less=True)
         self.operation = DP.create_signal(reset_less=True)
@@ -376,12 +415,7 @@ class DivPipeCoreCalculateStage(Elaboratable):
         """ Create a ``DivPipeCoreSetupStage`` instance. """
         assert stage_index in range(core_config.n_stages)
         self.core_config = core_config
-        bw = core_config.bit_width
-        # TODO(programmerjake): re-enable once bit_width reduction is fixed
-        if False and core_config.supported == {DP.UDivRem}:
-            self.compare_len = bw * 2
-        else:
-            self.compare_len = bw * 3
+        self.compare_len = core_config.compare_len
         self.stage_index = stage_index
         self.i = self.ispec()
         self.o = self.ospec()
@@ -418,15 +452,11 @@ class DivPipeCoreCalculateStage(Elaboratable):
 
         # constants
         log2_radix = self.core_config.log2_radix
-        current_shift = self.core_config.bit_width
+        current_shift = self.core_config.quotient_width
         current_shift -= self.stage_index * log2_radix
         log2_radix = min(log2_radix, current_shift)
         assert log2_radix > 0
         current_shift -= log2_radix
-        print(f"DivPipeCoreCalc: stage {self.stage_index}"
-              + f" of {self.core_config.n_stages} handling "
-              + f"bits [{current_shift}, {current_shift+log2_radix})"
-              + f" of {self.core_config.bit_width}")
         radix = 1 << log2_radix
 
         # trials within this radix range.  carried out by Trial module,
@@ -456,6 +486,26 @@ class DivPipeCoreCalculateStage(Elaboratable):
                 comb += pass_flag.eq(self.i.compare_lhs >= t.trial_compare_rhs)
             pfl.append(pass_flag)
 
+        next_bits = self.select_trial(m, pfl, trial_compare_rhs_values)
+
+        # create outputs for next phase
+        qr = self.i.quotient_root | (next_bits << current_shift)
+        comb += self.o.quotient_root.eq(qr)
+        if DP.RSqrtRem in cc.supported:
+            rr = self.i.root_times_radicand + ((self.i.divisor_radicand *
+                                               next_bits) << current_shift)
+            comb += self.o.root_times_radicand.eq(rr)
+
+        return m
+
+    def select_trial(self, m, pfl, trial_compare_rhs_values):
+        """ get next_bits (returned) and ``o.compare_rhs`` from the pass
+        flags and the trial rhs values, one each per trial.
+        """
+        comb = m.d.comb
+        radix = len(pfl)
+        log2_radix = radix.bit_length() - 1
+
         # Cat all the pass flags list together (easier to handle, below)
         pass_flags = Signal(radix, reset_less=True)
         comb += pass_flags.eq(Cat(*pfl))
@@ -487,14 +537,135 @@ class DivPipeCoreCalculateStage(Elaboratable):
         comb += self.o.compare_rhs.eq(treereduce(crhs, operator.or_,
                                       lambda x:x))
 
+        return next_bits
+
+
+class DivPipeCoreIterativeStage(DivPipeCoreCalculateStage):
+    """ Calculate Stage of the core of the div/rem/sqrt/rsqrt pipeline, for
+    an iterative (multi-cycle) unit: the same hardware does every stage.
+
+    The stage is selected at run-time by ``shift_i`` (the number of
+    ``quotient_root`` bits still to be computed: ``quotient_width`` for the
+    first stage), and ``shift_o`` is that of the next stage.  It is 0 once
+    all bits are done, after which the stage passes its input through.
+    That includes once the remainder (``compare_lhs - compare_rhs``) is 0:
+    all of the bits still to be done are then 0 too (an exact result, so
+    an iterative unit can finish early), except for div and rsqrt of 0
+    (every trial passes: all ones).
+
+    The shifts are all done once, on the operands shared by the trials.
+    """
+
+    def __init__(self, core_config, instance=0):
+        """ Create a ``DivPipeCoreIterativeStage`` instance. """
+        self.core_config = core_config
+        self.compare_len = core_config.compare_len
+        self.instance = instance
+        self.shift_i = Signal(range(core_config.quotient_width + 1),
+                              reset_less=True)
+        self.shift_o = Signal(range(core_config.quotient_width + 1),
+                              reset_less=True)
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        setattr(m.submodules,
+                f"div_pipe_core_iterative_{self.instance}",
+                self)
+        m.d.comb += self.i.eq(i)
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        i = self.i
+
+        # copy invariant inputs to outputs (for next stage)
+        comb += self.o.divisor_radicand.eq(i.divisor_radicand)
+        comb += self.o.operation.eq(i.operation)
+        comb += self.o.compare_lhs.eq(i.compare_lhs)
+
+        # current_shift and log2_radix of DivPipeCoreCalculateStage, but
+        # Signals: log2_radix is reduced on the last stage (and 0 after it)
+        log2_radix = cc.log2_radix
+        radix = 1 << log2_radix
+        current_shift = Signal.like(self.shift_o, name="current_shift")
+        with m.If(self.shift_i > log2_radix):
+            comb += current_shift.eq(self.shift_i - log2_radix)
+        with m.Else():
+            comb += current_shift.eq(0)
+        stage_radix_bits = Signal(range(log2_radix + 1), reset_less=True)
+        comb += stage_radix_bits.eq(self.shift_i - current_shift)
+
+        # the Trial terms, less their trial_bits factors (see Trial)
+        terms = []
+        if DP.UDivRem in cc.supported:
+            div_term1 = Signal(self.compare_len, reset_less=True)
+            comb += div_term1.eq((i.divisor_radicand << fw) << current_shift)
+            terms.append((DP.UDivRem, div_term1, None))
+        if DP.SqrtRem in cc.supported:
+            sqrt_term1 = Signal(self.compare_len, reset_less=True)
+            sqrt_term2 = Signal(self.compare_len, reset_less=True)
+            comb += sqrt_term1.eq((i.quotient_root << (fw + 1))
+                                  << current_shift)
+            comb += sqrt_term2.eq(Const(1 << fw, fw + 1)
+                                  << (current_shift * 2))
+            terms.append((DP.SqrtRem, sqrt_term1, sqrt_term2))
+        if DP.RSqrtRem in cc.supported:
+            rsqrt_term1 = Signal(self.compare_len, reset_less=True)
+            rsqrt_term2 = Signal(self.compare_len, reset_less=True)
+            comb += rsqrt_term1.eq((i.root_times_radicand << 1)
+                                   << current_shift)
+            comb += rsqrt_term2.eq(i.divisor_radicand << (current_shift * 2))
+            terms.append((DP.RSqrtRem, rsqrt_term1, rsqrt_term2))
+
+        trial_compare_rhs_values = []
+        pfl = []
+        for trial_bits in range(radix):
+            trial_compare_rhs = Signal(self.compare_len, reset_less=True,
+                                       name=f"trial_compare_rhs_{trial_bits}")
+            for op, term1, term2 in terms:
+                with m.If(i.operation == int(op)):
+                    rhs = i.compare_rhs + term1 * trial_bits
+                    if term2 is not None:
+                        rhs += term2 * (trial_bits * trial_bits)
+                    comb += trial_compare_rhs.eq(rhs)
+            trial_compare_rhs_values.append(trial_compare_rhs)
+
+            # as DivPipeCoreCalculateStage, but only trial_bits that fit
+            # in stage_radix_bits can pass
+            pass_flag = Signal(name=f"pass_flag_{trial_bits}", reset_less=True)
+            if trial_bits == 0:
+                comb += pass_flag.eq(1)
+            else:
+                comb += pass_flag.eq(
+                    (stage_radix_bits >= trial_bits.bit_length()) &
+                    (i.compare_lhs >= trial_compare_rhs))
+            pfl.append(pass_flag)
+
+        next_bits = self.select_trial(m, pfl, trial_compare_rhs_values)
+
         # create outputs for next phase
-        qr = self.i.quotient_root | (next_bits << current_shift)
+        qr = i.quotient_root | (next_bits << current_shift)
         comb += self.o.quotient_root.eq(qr)
         if DP.RSqrtRem in cc.supported:
-            rr = self.i.root_times_radicand + ((self.i.divisor_radicand *
-                                               next_bits) << current_shift)
+            rr = i.root_times_radicand + ((i.divisor_radicand *
+                                          next_bits) << current_shift)
             comb += self.o.root_times_radicand.eq(rr)
 
+        # zero remainder: no more bits to do
+        nonzero = Signal(reset_less=True)
+        with m.If(i.operation == int(DP.SqrtRem)):
+            comb += nonzero.eq(1)
+        with m.Else():
+            comb += nonzero.eq(i.divisor_radicand.bool())
+        exact = Signal(reset_less=True)
+        comb += exact.eq((self.o.compare_rhs == i.compare_lhs) & nonzero)
+        comb += self.shift_o.eq(Mux(exact, 0, current_shift))
+
         return m
 
 
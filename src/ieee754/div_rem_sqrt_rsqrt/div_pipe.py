@@ -9,8 +9,19 @@ from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreConfig,
                                              DivPipeCoreOutputData,
                                              DivPipeCoreSetupStage,
                                              DivPipeCoreCalculateStage,
+                                             DivPipeCoreIterativeStage,
                                              DivPipeCoreFinalStage,
                                              )
+from ieee754.div_rem_sqrt_rsqrt.srt import (SRTDivPipeCoreInterstageData,
+                                            SRTDivPipeCoreSetupStage,
+                                            SRTDivPipeCoreCalculateStage,
+                                            SRTDivPipeCoreFinalStage,
+                                            )
+from ieee754.div_rem_sqrt_rsqrt.newton import (NRDivPipeCoreInterstageData,
+                                               NRDivPipeCoreSetupStage,
+                                               NRDivPipeCoreCalculateStage,
+                                               NRDivPipeCoreFinalStage,
+                                               )
 from ieee754.fpcommon.getop import FPPipeContext
 from ieee754.fpcommon.fpbase import FPFormat, FPNumBaseRecord
 
@@ -169,6 +180,29 @@ class DivPipeCalculateStage(DivPipeBaseStage, DivPipeCoreCalculateStage):
         return m
 
 
+class DivPipeIterativeStage(DivPipeBaseStage, DivPipeCoreIterativeStage):
+    """ ``DivPipeCalculateStage`` for an iterative (multi-cycle) unit: the
+        stage is selected by ``shift_i`` (see ``DivPipeCoreIterativeStage``).
+    """
+
+    def __init__(self, pspec, instance=0):
+        self.pspec = pspec
+        DivPipeCoreIterativeStage.__init__(self, pspec.core_config, instance)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeInterstageData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeInterstageData(self.pspec)
+
+    def elaborate(self, platform):
+        m = DivPipeCoreIterativeStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
 class DivPipeFinalStage(DivPipeBaseStage, DivPipeCoreFinalStage):
     """ FIXME: add docs. """
 
@@ -189,3 +223,183 @@ class DivPipeFinalStage(DivPipeBaseStage, DivPipeCoreFinalStage):
         m = DivPipeCoreFinalStage.elaborate(self, platform)
         self._elaborate(m, platform)
         return m
+
+
+class DivPipeSRTInterstageData(SRTDivPipeCoreInterstageData, DivPipeBaseData):
+    """ interstage data type for ``DivPipe`` with the SRT core. """
+
+    def __init__(self, pspec):
+        """ Create a ``DivPipeSRTInterstageData`` instance. """
+        SRTDivPipeCoreInterstageData.__init__(self, pspec.core_config)
+        DivPipeBaseData.__init__(self, pspec)
+
+    def __iter__(self):
+        """ Get member signals. """
+        yield from SRTDivPipeCoreInterstageData.__iter__(self)
+        yield from DivPipeBaseData.__iter__(self)
+
+    def eq(self, rhs):
+        """ Assign member signals. """
+        return SRTDivPipeCoreInterstageData.eq(self, rhs) + \
+               DivPipeBaseData.eq(self, rhs)
+
+
+class DivPipeSRTSetupStage(DivPipeBaseStage, SRTDivPipeCoreSetupStage):
+    """ ``DivPipeSetupStage`` for the SRT core. """
+
+    def __init__(self, pspec):
+        self.pspec = pspec
+        SRTDivPipeCoreSetupStage.__init__(self, pspec.core_config)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeInputData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeSRTInterstageData(self.pspec)
+
+    def elaborate(self, platform):
+        m = SRTDivPipeCoreSetupStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+class DivPipeSRTCalculateStage(DivPipeBaseStage, SRTDivPipeCoreCalculateStage):
+    """ ``DivPipeCalculateStage`` for the SRT core. """
+
+    def __init__(self, pspec, stage_idx):
+        self.pspec = pspec
+        SRTDivPipeCoreCalculateStage.__init__(self, pspec.core_config,
+                                              stage_idx)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeSRTInterstageData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeSRTInterstageData(self.pspec)
+
+    def elaborate(self, platform):
+        m = SRTDivPipeCoreCalculateStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+class DivPipeSRTFinalStage(DivPipeBaseStage, SRTDivPipeCoreFinalStage):
+    """ ``DivPipeFinalStage`` for the SRT core. """
+
+    def __init__(self, pspec):
+        self.pspec = pspec
+        SRTDivPipeCoreFinalStage.__init__(self, pspec.core_config)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeSRTInterstageData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeOutputData(self.pspec)
+
+    def elaborate(self, platform):
+        m = SRTDivPipeCoreFinalStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+class DivPipeNRInterstageData(NRDivPipeCoreInterstageData, DivPipeBaseData):
+    """ interstage data type for ``DivPipe`` with the Newton-Raphson core. """
+
+    def __init__(self, pspec):
+        """ Create a ``DivPipeNRInterstageData`` instance. """
+        NRDivPipeCoreInterstageData.__init__(self, pspec.core_config)
+        DivPipeBaseData.__init__(self, pspec)
+
+    def __iter__(self):
+        """ Get member signals. """
+        yield from NRDivPipeCoreInterstageData.__iter__(self)
+        yield from DivPipeBaseData.__iter__(self)
+
+    def eq(self, rhs):
+        """ Assign member signals. """
+        return NRDivPipeCoreInterstageData.eq(self, rhs) + \
+               DivPipeBaseData.eq(self, rhs)
+
+
+class DivPipeNRSetupStage(DivPipeBaseStage, NRDivPipeCoreSetupStage):
+    """ ``DivPipeSetupStage`` for the Newton-Raphson core. """
+
+    def __init__(self, pspec):
+        self.pspec = pspec
+        NRDivPipeCoreSetupStage.__init__(self, pspec.core_config)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeInputData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeNRInterstageData(self.pspec)
+
+    def elaborate(self, platform):
+        m = NRDivPipeCoreSetupStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+class DivPipeNRCalculateStage(DivPipeBaseStage, NRDivPipeCoreCalculateStage):
+    """ ``DivPipeCalculateStage`` for the Newton-Raphson core. """
+
+    def __init__(self, pspec, stage_idx):
+        self.pspec = pspec
+        NRDivPipeCoreCalculateStage.__init__(self, pspec.core_config,
+                                             stage_idx)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeNRInterstageData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeNRInterstageData(self.pspec)
+
+    def elaborate(self, platform):
+        m = NRDivPipeCoreCalculateStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+class DivPipeNRFinalStage(DivPipeBaseStage, NRDivPipeCoreFinalStage):
+    """ ``DivPipeFinalStage`` for the Newton-Raphson core. """
+
+    def __init__(self, pspec):
+        self.pspec = pspec
+        NRDivPipeCoreFinalStage.__init__(self, pspec.core_config)
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeNRInterstageData(self.pspec)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeOutputData(self.pspec)
+
+    def elaborate(self, platform):
+        m = NRDivPipeCoreFinalStage.elaborate(self, platform)
+        self._elaborate(m, platform)
+        return m
+
+
+def get_div_pipe_stages(pspec):
+    """ the (setup, calculate, final) stage classes for pspec: those of the
+        SRT core if PipelineSpec.srt is set, of the Newton-Raphson core if
+        PipelineSpec.newton is, otherwise those above
+    """
+    if pspec.srt:
+        return (DivPipeSRTSetupStage, DivPipeSRTCalculateStage,
+                DivPipeSRTFinalStage)
+    if pspec.newton:
+        return (DivPipeNRSetupStage, DivPipeNRCalculateStage,
+                DivPipeNRFinalStage)
+    return DivPipeSetupStage, DivPipeCalculateStage, DivPipeFinalStage
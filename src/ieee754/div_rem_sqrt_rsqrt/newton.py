@@ -0,0 +1,607 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# See Notices.txt for copyright information
+""" Newton-Raphson (multiplicative) core of the div/rem/sqrt/rsqrt pipeline.
+
+An alternative to the ``DivPipeCore*`` stages in ``core.py`` (and to the
+SRT ones in ``srt.py``), with the same input and output data and the same
+setup / calculate / final stage interface.  The digit recurrences need one
+calculate stage per ``log2_radix`` (or 2) result bits; here the number of
+correct bits doubles with each stage:
+
+* the setup stage looks up a seed for ``Y = 1/d`` (div) or ``Y =
+  1/sqrt(x)`` (sqrt and rsqrt), good to ``SEED_INDEX_BITS + 1`` bits, in a
+  small ROM indexed by the top bits of the divisor (or radicand);
+* each calculate stage is one Newton-Raphson iteration on ``Y``, being
+  two (three for sqrt and rsqrt) multiplies:
+
+  * div: ``e = 1 - d * Y``, ``Y += Y * e``  (``e`` becomes ``e**2``);
+  * sqrt, rsqrt: ``e = 1 - x * Y**2``, ``Y += Y * e / 2`` (``e`` becomes
+    ``3/4 * e**2 + 1/4 * e**3``);
+
+* the last calculate stage takes the truncated product (``a * Y``, ``x *
+  Y``, or ``Y`` itself for rsqrt), which is then within one ulp of the
+  result, and works out its remainder (one or two more multiplies);
+* the final stage works out the remainders of the results one ulp either
+  side (from the first), and picks the one whose remainder is in range.
+
+Newton-Raphson (rather than Goldschmidt) is used because the iterations are
+self-correcting: the truncation errors of one iteration do not carry on
+into the next, so that a bound on ``e`` after each iteration (and so the
+number of iterations, and the width of ``e``) is worked out, exactly, at
+elaboration time.  The results (quotient / root, and remainder) are
+bit-identical to those of ``core.py``.
+
+As with the SRT core, the inputs must be normalised:
+
+* ``UDivRem``: ``divisor_radicand`` in [1.0, 2.0) and ``dividend`` less than
+  2.0;
+* ``SqrtRem``, ``RSqrtRem``: ``divisor_radicand`` in [1.0, 4.0).
+
+See M. D. Ercegovac and T. Lang, "Digital Arithmetic", chapter 7.
+"""
+
+from nmigen import Elaboratable, Module, Signal, Mux
+from fractions import Fraction
+import functools
+import math
+
+from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreConfig,
+                                             DivPipeCoreInputData,
+                                             DivPipeCoreOutputData,
+                                             DivPipeCoreOperation)
+
+DP = DivPipeCoreOperation
+
+SEED_INDEX_BITS = 7     # divisor / radicand fraction bits indexing the ROM
+SEED_BITS = 10          # fraction bits of the seeds
+GUARD_BITS = 8          # fraction bits of Y beyond fract_width
+
+
+class NRDivPipeCoreConfig(DivPipeCoreConfig):
+    """ Configuration for the Newton-Raphson core.
+
+    :attribute bit_width: base bit-width.
+    :attribute fract_width: base fract-width. Specifies location of base-2
+        radix point.
+    :attribute supported: the operations to be built (the default is all
+        three).
+    """
+
+    # the divisor and radicand must be normalised (see above)
+    normalised_inputs = True
+
+    def __init__(self, bit_width, fract_width, supported=None):
+        """ Create a ``NRDivPipeCoreConfig`` instance. """
+        # log2_radix is not used (the result is not built up digit by
+        # digit), other than by the reference model (algorithm.py)
+        super().__init__(bit_width, fract_width, 1, supported)
+        # the quotient (one ulp over, at worst) has fract_width + 2 bits
+        assert self.fract_width + 2 <= self.bit_width
+
+    def __repr__(self):
+        """ Get repr. """
+        return f"NRDivPipeCoreConfig({self.bit_width}, " \
+            + f"{self.fract_width}, supported={self.supported})"
+
+    @property
+    def approx_width(self):
+        """ Get the number of fraction bits of ``Y`` (which is < 2). """
+        return max(self.fract_width + GUARD_BITS, SEED_BITS)
+
+    @property
+    def error_bounds(self):
+        """ Get the bound on ``|e|`` before each iteration (and after the
+            last), for each of ``"div"`` and ``"rsqrt"`` that is supported.
+        """
+        bounds = {}
+        if DP.UDivRem in self.supported:
+            bounds["div"] = _error_bounds("div", self.fract_width,
+                                          self.approx_width)
+        if DP.SqrtRem in self.supported or DP.RSqrtRem in self.supported:
+            bounds["rsqrt"] = _error_bounds("rsqrt", self.fract_width,
+                                            self.approx_width)
+        return bounds
+
+    @property
+    def n_iterations(self):
+        """ Get the number of Newton-Raphson iterations needed. """
+        # the longest: the other does harmless extra iterations
+        return max(len(b) - 1 for b in self.error_bounds.values())
+
+    @property
+    def n_stages(self):
+        """ Get the number of ``NRDivPipeCoreCalculateStage`` needed: one
+            per iteration, then one for the product.
+        """
+        return self.n_iterations + 1
+
+    @property
+    def product_width(self):
+        """ Get the width of the (signed) remainder of the product. """
+        # as core.py's, plus one bit each for the sign and (as the product
+        # may be one ulp over) the magnitude
+        return self.bit_width * 3 + 2
+
+
+# seeds and error bounds
+
+def _seed_error(kind, lo, hi, seed):
+    """ the largest ``|e|`` for the seed (an integer, SEED_BITS fraction
+        bits) over v in [lo, hi].  e is monotonic in v, so it is the larger
+        at either end.
+    """
+    y = Fraction(seed, 1 << SEED_BITS)
+    if kind == "div":
+        return max(abs(1 - v * y) for v in (lo, hi))
+    return max(abs(1 - v * y * y) for v in (lo, hi))
+
+
+@functools.lru_cache()
+def seed_table(kind):
+    """ the seed ROM of kind ``"div"`` (1/d) or ``"rsqrt"`` (1/sqrt(x)):
+        {index: seed}, the index being the top bits of the divisor (in
+        [1, 2)) or radicand (in [1, 4)), down to SEED_INDEX_BITS fraction
+        bits, and the seed having SEED_BITS fraction bits.
+    """
+    width = 1 << SEED_INDEX_BITS
+    top = 2 if kind == "div" else 4
+    table = {}
+    for idx in range(width, top * width):
+        lo, hi = Fraction(idx, width), Fraction(idx + 1, width)
+        # the seed which balances the error at either end, rounded either
+        # way: whichever is the better
+        mid = (lo + hi) / 2
+        if kind == "div":
+            best = math.floor((1 << SEED_BITS) / mid)
+        else:
+            best = math.isqrt(math.floor((1 << (2 * SEED_BITS)) / mid))
+        table[idx] = min((best, best + 1),
+                         key=lambda s: _seed_error(kind, lo, hi, s))
+    return table
+
+
+@functools.lru_cache()
+def seed_error_bound(kind):
+    """ the largest ``|e|`` of any of the seeds of seed_table(kind) """
+    width = 1 << SEED_INDEX_BITS
+    return max(_seed_error(kind, Fraction(idx, width),
+                           Fraction(idx + 1, width), seed)
+               for idx, seed in seed_table(kind).items())
+
+
+@functools.lru_cache()
+def _error_bounds(kind, fract_width, approx_width):
+    """ the bound on |e| before each iteration, until (and including) one
+        that is less than 2**-(fract_width+1): then the truncated product
+        is within one ulp of the result.
+
+        the truncations (of Y, and of the products making up e and Y * e)
+        each lose less than one ulp of Y (2**-approx_width), which adds up
+        to under 5 ulps in e for div, and under 9 for rsqrt.
+    """
+    ulp = Fraction(1, 1 << approx_width)
+    target = Fraction(1, 1 << (fract_width + 1))
+    bounds = [seed_error_bound(kind)]
+    while bounds[-1] >= target:
+        e = bounds[-1]
+        if kind == "div":
+            e = e * e + 5 * ulp
+        else:
+            e = 3 * e * e / 4 + e * e * e / 4 + 9 * ulp
+        assert e < bounds[-1], "not converging: approx_width too small"
+        bounds.append(e)
+    return tuple(bounds)
+
+
+def error_width(bound, approx_width):
+    """ the width of a signed e (approx_width fraction bits) with |e| <=
+        bound
+    """
+    return max(approx_width + 1 + math.ceil(math.log2(bound)), 1) + 1
+
+
+def seed_index(core_config, divisor_radicand):
+    """ the seed_table index of divisor_radicand (a python int) """
+    return (divisor_radicand << SEED_INDEX_BITS) >> core_config.fract_width
+
+
+class NRDivPipeCoreInterstageData:
+    """ interstage data type for the Newton-Raphson core.
+
+    :attribute core_config: ``NRDivPipeCoreConfig`` instance describing the
+        configuration to be used.
+    :attribute dividend: dividend for div/rem. Signal with a bit-width of
+        ``core_config.bit_width + core_config.fract_width`` and a
+        fract-width of ``core_config.fract_width * 2`` bits.
+    :attribute divisor_radicand: divisor for div/rem and radicand for
+        sqrt/rsqrt. Signal with a bit-width of ``core_config.bit_width`` and
+        a fract-width of ``core_config.fract_width`` bits.
+    :attribute operation: the ``DivPipeCoreOperation`` to be computed.
+    :attribute approx: ``Y``, the approximation of ``1/d`` or
+        ``1/sqrt(x)``. Signal with a fract-width of
+        ``core_config.approx_width`` bits (and 1 integer bit).
+    :attribute quotient_root: the product: the quotient or root, to within
+        one ulp. Signal with a bit-width of ``core_config.fract_width + 2``
+        and a fract-width of ``core_config.fract_width`` bits.
+    :attribute root_times_radicand: ``quotient_root * divisor_radicand``
+        (rsqrt only). Signal with a fract-width of ``core_config.fract_width
+        * 2`` bits.
+    :attribute remainder: the remainder (as in ``core.py``) of
+        ``quotient_root``: negative if it is one ulp over. Signed, with a
+        bit-width of ``core_config.product_width``.
+    """
+
+    def __init__(self, core_config, reset_less=True):
+        """ Create a ``NRDivPipeCoreInterstageData`` instance. """
+        self.core_config = core_config
+        bw = core_config.bit_width
+        fw = core_config.fract_width
+        self.dividend = Signal(bw + fw, reset_less=reset_less)
+        self.divisor_radicand = Signal(bw, reset_less=reset_less)
+        self.operation = DP.create_signal(reset_less=reset_less)
+        self.approx = Signal(core_config.approx_width + 1,
+                             reset_less=reset_less)
+        self.quotient_root = Signal(fw + 2, reset_less=reset_less)
+        self.root_times_radicand = Signal(2 * fw + 4, reset_less=reset_less)
+        self.remainder = Signal((core_config.product_width, True),
+                                reset_less=reset_less)
+
+    def __iter__(self):
+        """ Get member signals. """
+        yield self.dividend
+        yield self.divisor_radicand
+        yield self.operation
+        yield self.approx
+        yield self.quotient_root
+        yield self.root_times_radicand
+        yield self.remainder
+
+    def eq(self, rhs):
+        """ Assign member signals. """
+        return [self.dividend.eq(rhs.dividend),
+                self.divisor_radicand.eq(rhs.divisor_radicand),
+                self.operation.eq(rhs.operation),
+                self.approx.eq(rhs.approx),
+                self.quotient_root.eq(rhs.quotient_root),
+                self.root_times_radicand.eq(rhs.root_times_radicand),
+                self.remainder.eq(rhs.remainder)]
+
+
+class NRSeedROM(Elaboratable):
+    """ looks up the seed (SEED_BITS fraction bits) for the index """
+
+    def __init__(self, table, index_width):
+        self.table = table
+        self.index = Signal(index_width, reset_less=True)
+        self.seed = Signal(SEED_BITS + 1, reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        with m.Switch(self.index):
+            for idx, seed in sorted(self.table.items()):
+                with m.Case(idx):
+                    m.d.comb += self.seed.eq(seed)
+        return m
+
+
+class NRDivPipeCoreSetupStage(Elaboratable):
+    """ Setup Stage of the Newton-Raphson core: the seed. """
+
+    def __init__(self, core_config):
+        """ Create a ``NRDivPipeCoreSetupStage`` instance."""
+        self.core_config = core_config
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeCoreInputData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return NRDivPipeCoreInterstageData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        m.submodules.div_pipe_core_setup = self
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o  # return processed data (ignore i)
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        aw = cc.approx_width
+
+        comb += self.o.dividend.eq(self.i.dividend)
+        comb += self.o.divisor_radicand.eq(self.i.divisor_radicand)
+        comb += self.o.operation.eq(self.i.operation)
+
+        # index: the top bits of d in [1, 2) (or x in [1, 4))
+        index = Signal(SEED_INDEX_BITS + 2, reset_less=True)
+        comb += index.eq((self.i.divisor_radicand << SEED_INDEX_BITS) >> fw)
+
+        seeds = []
+        if DP.UDivRem in cc.supported:
+            m.submodules.div_seed = rom = NRSeedROM(seed_table("div"),
+                                                    len(index))
+            comb += rom.index.eq(index)
+            seeds.append(rom.seed)
+        if DP.SqrtRem in cc.supported or DP.RSqrtRem in cc.supported:
+            m.submodules.rsqrt_seed = rom = NRSeedROM(seed_table("rsqrt"),
+                                                      len(index))
+            comb += rom.index.eq(index)
+            seeds.append(rom.seed)
+        if len(seeds) == 1:
+            seed = seeds[0]
+        else:
+            is_div = self.i.operation == int(DP.UDivRem)
+            seed = Mux(is_div, *seeds)
+        comb += self.o.approx.eq(seed << (aw - SEED_BITS))
+
+        return m
+
+
+class NRDivPipeCoreCalculateStage(Elaboratable):
+    """ Calculate Stage of the Newton-Raphson core: one iteration, or (the
+        last one) the product.
+    """
+
+    def __init__(self, core_config, stage_index):
+        """ Create a ``NRDivPipeCoreCalculateStage`` instance. """
+        assert stage_index in range(core_config.n_stages)
+        self.core_config = core_config
+        self.stage_index = stage_index
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage. """
+        return NRDivPipeCoreInterstageData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage. """
+        return NRDivPipeCoreInterstageData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        setattr(m.submodules,
+                f"div_pipe_core_calculate_{self.stage_index}",
+                self)
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        i = self.i
+
+        # copy invariant inputs to outputs (for next stage)
+        comb += self.o.dividend.eq(i.dividend)
+        comb += self.o.divisor_radicand.eq(i.divisor_radicand)
+        comb += self.o.operation.eq(i.operation)
+
+        if self.stage_index < self.core_config.n_iterations:
+            self._iteration(m)
+        else:
+            self._product(m)
+
+        return m
+
+    def _iteration(self, m):
+        """ Y += Y * e """
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        aw = cc.approx_width
+        i = self.i
+
+        # the error bound before this iteration (an extra one, once the
+        # bound is reached, does no harm) gives the width of e
+        bounds = cc.error_bounds
+        ew = max(error_width(b[min(self.stage_index, len(b) - 1)], aw)
+                 for b in bounds.values())
+
+        # d * Y (or x * Y, approximately sqrt(x))
+        y = i.approx
+        dy = Signal(fw + 2 + len(y), reset_less=True)
+        comb += dy.eq(i.divisor_radicand[:fw+2] * y)
+
+        # e (aw fraction bits, e / 2 for sqrt and rsqrt)
+        errors = []
+        if "div" in bounds:
+            e = Signal((ew, True), reset_less=True)
+            comb += e.eq(((1 << (fw + aw)) - dy) >> fw)
+            errors.append(e)
+        if "rsqrt" in bounds:
+            h = Signal(aw + 3, reset_less=True)
+            comb += h.eq(dy >> fw)
+            xyy = Signal(len(h) + len(y), reset_less=True)
+            comb += xyy.eq(h * y)
+            e = Signal((ew, True), reset_less=True)
+            comb += e.eq(((1 << (2 * aw)) - xyy) >> (aw + 1))
+            errors.append(e)
+        if len(errors) == 1:
+            e = errors[0]
+        else:
+            e = Mux(i.operation == int(DP.UDivRem), *errors)
+
+        ye = Signal((len(y) + ew, True), reset_less=True)
+        comb += ye.eq(y * e)
+        comb += self.o.approx.eq(y + (ye >> aw))
+
+    def _product(self, m):
+        """ the result, to within one ulp, and its remainder """
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        aw = cc.approx_width
+        i = self.i
+        o = self.o
+        y = i.approx
+        dr = i.divisor_radicand[:fw+2]
+        pw = cc.product_width
+
+        # the result (fw fraction bits): a * Y, x * Y, or Y
+        q = o.quotient_root
+        product = Signal(2 * fw + 2 + len(y), reset_less=True)
+        with m.Switch(i.operation):
+            if DP.UDivRem in cc.supported:
+                with m.Case(int(DP.UDivRem)):
+                    comb += product.eq(i.dividend[:2*fw+1] * y)
+                    comb += q.eq(product >> (fw + aw))
+            if DP.SqrtRem in cc.supported:
+                with m.Case(int(DP.SqrtRem)):
+                    comb += product.eq(dr * y)
+                    comb += q.eq(product >> aw)
+            if DP.RSqrtRem in cc.supported:
+                with m.Case(int(DP.RSqrtRem)):
+                    comb += q.eq(y >> (aw - fw))
+
+        # q * d, q * q, or q * x (then times q again, for rsqrt)
+        qm = o.root_times_radicand
+        comb += qm.eq(q * Mux(i.operation == int(DP.SqrtRem), q, dr))
+
+        # the remainder, as in core.py (lhs - rhs), but signed
+        lhs = Signal(pw - 1, reset_less=True)
+        rhs = Signal(pw - 1, reset_less=True)
+        with m.Switch(i.operation):
+            if DP.UDivRem in cc.supported:
+                with m.Case(int(DP.UDivRem)):
+                    comb += lhs.eq(i.dividend << fw)
+                    comb += rhs.eq(qm << fw)
+            if DP.SqrtRem in cc.supported:
+                with m.Case(int(DP.SqrtRem)):
+                    comb += lhs.eq(dr << (2 * fw))
+                    comb += rhs.eq(qm << fw)
+            if DP.RSqrtRem in cc.supported:
+                with m.Case(int(DP.RSqrtRem)):
+                    comb += lhs.eq(1 << (3 * fw))
+                    comb += rhs.eq(q * qm)
+        comb += o.remainder.eq(lhs - rhs)
+
+
+class NRDivPipeCoreFinalStage(Elaboratable):
+    """ Final Stage of the Newton-Raphson core: the remainder-based
+        correction.
+    """
+
+    def __init__(self, core_config):
+        """ Create a ``NRDivPipeCoreFinalStage`` instance."""
+        self.core_config = core_config
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return NRDivPipeCoreInterstageData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeCoreOutputData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        m.submodules.div_pipe_core_final = self
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o  # return processed data (ignore i)
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        pw = cc.product_width
+        i = self.i
+        q = i.quotient_root
+        qm = i.root_times_radicand
+        dr = i.divisor_radicand[:fw+2]
+
+        # the differences to the remainders of q + 1 (up) and q - 1 (down)
+        up = Signal(pw - 1, reset_less=True)
+        down = Signal(pw - 1, reset_less=True)
+        with m.Switch(i.operation):
+            if DP.UDivRem in cc.supported:
+                with m.Case(int(DP.UDivRem)):
+                    comb += up.eq(dr << fw)
+                    comb += down.eq(dr << fw)
+            if DP.SqrtRem in cc.supported:
+                with m.Case(int(DP.SqrtRem)):
+                    comb += up.eq(((q << 1) + 1) << fw)
+                    comb += down.eq(((q << 1) - 1) << fw)
+            if DP.RSqrtRem in cc.supported:
+                with m.Case(int(DP.RSqrtRem)):
+                    comb += up.eq((qm << 1) + dr)
+                    comb += down.eq((qm << 1) - dr)
+        rem_up = Signal((pw, True), reset_less=True)
+        rem_down = Signal((pw, True), reset_less=True)
+        comb += rem_up.eq(i.remainder - up)
+        comb += rem_down.eq(i.remainder + down)
+
+        with m.If(i.remainder < 0):
+            comb += self.o.quotient_root.eq(q - 1)
+            comb += self.o.remainder.eq(rem_down)
+        with m.Elif(rem_up >= 0):
+            comb += self.o.quotient_root.eq(q + 1)
+            comb += self.o.remainder.eq(rem_up)
+        with m.Else():
+            comb += self.o.quotient_root.eq(q)
+            comb += self.o.remainder.eq(i.remainder)
+
+        return m
+
+
+def nr_div_sqrt_rsqrt(core_config, dividend, divisor_radicand, operation):
+    """ bit-accurate model of the Newton-Raphson core: (quotient_root,
+        remainder)
+    """
+    cc = core_config
+    fw = cc.fract_width
+    aw = cc.approx_width
+    kind = "div" if operation == DP.UDivRem else "rsqrt"
+    bounds = cc.error_bounds
+    index = seed_index(cc, divisor_radicand)
+    y = seed_table(kind)[index] << (aw - SEED_BITS)
+    for j in range(cc.n_iterations):
+        ew = max(error_width(b[min(j, len(b) - 1)], aw)
+                 for b in bounds.values())
+        if kind == "div":
+            e = ((1 << (fw + aw)) - divisor_radicand * y) >> fw
+        else:
+            h = (divisor_radicand * y) >> fw
+            e = ((1 << (2 * aw)) - h * y) >> (aw + 1)
+        assert -(1 << (ew - 1)) <= e < (1 << (ew - 1)), "e overflow"
+        y += (y * e) >> aw
+        assert 0 < y < (2 << aw)
+    d = divisor_radicand
+    if operation == DP.UDivRem:
+        q = (dividend * y) >> (fw + aw)
+        rem = (dividend << fw) - ((q * d) << fw)
+        up = down = d << fw
+    elif operation == DP.SqrtRem:
+        q = (d * y) >> aw
+        rem = (d << (2 * fw)) - ((q * q) << fw)
+        up, down = (2 * q + 1) << fw, (2 * q - 1) << fw
+    else:
+        q = y >> (aw - fw)
+        rem = (1 << (3 * fw)) - q * q * d
+        up, down = 2 * q * d + d, 2 * q * d - d
+    assert q < (4 << fw) and -(1 << (cc.product_width - 1)) <= rem
+    if rem < 0:
+        return q - 1, rem + down
+    if rem - up >= 0:
+        return q + 1, rem - up
+    return q, rem
@@ -0,0 +1,738 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# See Notices.txt for copyright information
+""" Radix-4 SRT core of the div/rem/sqrt pipeline.
+
+An alternative to the ``DivPipeCore*`` stages in ``core.py``, with the same
+input and output data (``DivPipeCoreInputData``, ``DivPipeCoreOutputData``)
+and the same setup / calculate / final stage interface, so that it can be
+dropped into the same pipelines.
+
+Where ``DivPipeCoreCalculateStage`` tries every one of the ``2**log2_radix``
+candidate digits (a ``bit_width * 3`` multiply-add and compare each), each
+``SRTDivPipeCoreCalculateStage`` here:
+
+* keeps the partial remainder in carry-save form (sum and carry), so that
+  the new partial remainder is one carry-save adder, with no carry
+  propagation;
+* picks the next quotient (or root) digit, in the redundant set
+  {-2, -1, 0, 1, 2}, from a 7-bit estimate of the partial remainder (the top
+  bits of sum and carry, added) and a few bits of the divisor (or partial
+  root), by comparison against a small table of selection constants;
+* builds the quotient with "on-the-fly" conversion (the quotient and the
+  quotient minus one ulp are both kept, and only ever shifted and
+  concatenated).
+
+The final stage does the carry-propagate add (two, side by side: with and
+without the correction of the last digit, which is needed when the
+remainder comes out negative).  The results (quotient /
+root, and remainder) are bit-identical to those of ``core.py``.
+
+Only ``UDivRem`` and ``SqrtRem`` are done, and the inputs must be normalised:
+
+* ``UDivRem``: ``divisor_radicand`` in [1.0, 2.0) and ``dividend`` less than
+  2.0 (as for floating-point mantissas);
+* ``SqrtRem``: ``divisor_radicand`` in [1.0, 4.0).
+
+The selection constants are derived (and checked) at elaboration time from
+the digit selection intervals, with exact arithmetic.  See M. D. Ercegovac
+and T. Lang, "Digital Arithmetic", chapters 5 and 6.
+
+Formulation (quotient digits q[j] in {-2..2}, ``rho = 2/3``):
+
+* division: ``w[j+1] = 4 * w[j] - q[j+1] * d``, with ``d`` in [1/2, 1) and
+  ``w[0]`` the dividend, scaled so that ``|w[0]| <= rho * d``;
+* square root: ``w[j+1] = 4 * w[j] - 2 * S[j] * q[j+1] - q[j+1]**2 *
+  4**-(j+1)``, with ``S[j]`` the partial root (``S[0] = 0``), and the
+  radicand scaled so that the root has exactly as many bits as the quotient
+  (``2 * n_stages``).
+"""
+
+from nmigen import Elaboratable, Module, Signal, Const, Mux, Cat
+from fractions import Fraction
+import functools
+import math
+
+from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreConfig,
+                                             DivPipeCoreInputData,
+                                             DivPipeCoreOutputData,
+                                             DivPipeCoreOperation)
+
+DP = DivPipeCoreOperation
+
+RHO = Fraction(2, 3)    # redundancy factor of the digit set {-2..2}
+EST_FRACT_BITS = 4      # fraction bits of the partial remainder estimate
+EST_BITS = EST_FRACT_BITS + 3
+DIV_INDEX_BITS = 4      # divisor bits (leading 1 included) used for selection
+SQRT_INDEX_BITS = 5     # partial root bits used for selection
+SQRT_SHARED_FROM = 4    # sqrt stages from here on share one table
+
+
+class SRTDivPipeCoreConfig(DivPipeCoreConfig):
+    """ Configuration for the radix-4 SRT core.
+
+    :attribute bit_width: base bit-width.
+    :attribute fract_width: base fract-width. Specifies location of base-2
+        radix point.
+    :attribute supported: the operations to be built: ``UDivRem`` and/or
+        ``SqrtRem`` (the default is both).
+    """
+
+    # the divisor and radicand must be normalised (see above)
+    normalised_inputs = True
+
+    def __init__(self, bit_width, fract_width, supported=None):
+        """ Create a ``SRTDivPipeCoreConfig`` instance. """
+        if supported is None:
+            supported = (DP.UDivRem, DP.SqrtRem)
+        super().__init__(bit_width, fract_width, 2, supported)
+        if DP.RSqrtRem in self.supported:
+            raise ValueError("the SRT core does not do RSqrtRem")
+        # the quotient (and root) has 2 * n_stages bits
+        assert self.fract_width + 1 <= self.bit_width
+
+    def __repr__(self):
+        """ Get repr. """
+        return f"SRTDivPipeCoreConfig({self.bit_width}, " \
+            + f"{self.fract_width}, supported={self.supported})"
+
+    @property
+    def n_stages(self):
+        """ Get the number of ``SRTDivPipeCoreCalculateStage`` needed. """
+        # the quotient needs fract_width + 2 fraction bits (the dividend is
+        # scaled down by 8 or 16, to fit the bound on w[0]), rounded up to
+        # a whole radix-4 digit.
+        return (self.fract_width + 3) // 2
+
+    @property
+    def quotient_width(self):
+        """ Get the width of the (on-the-fly) quotient / root. """
+        return self.n_stages * 2
+
+    @property
+    def remainder_shift(self):
+        """ Get the number of fraction bits of the partial remainder. """
+        return self.fract_width + 1 + self.quotient_width
+
+    @property
+    def remainder_width(self):
+        """ Get the width of the carry-save partial remainder. """
+        # |4 * w| < 4, two's complement
+        return self.remainder_shift + 3
+
+    @property
+    def sqrt_scale(self):
+        """ Get ``a``: the radicand is scaled by ``4**-a`` (1.0 to 4.0
+            becomes 4**-a to 4**(1-a)), so that the root has
+            ``quotient_width`` bits.
+        """
+        return self.quotient_width - self.fract_width
+
+
+# selection constants
+
+def _span(lo, hi, vmin, vmax):
+    """ the union, over v in [vmin, vmax], of the open intervals (lo(v),
+        hi(v)), lo and hi being linear in v ((slope, offset) pairs).  that
+        is (min lo, max hi) if lo < hi throughout (and a superset if not).
+    """
+    los = [lo[0] * v + lo[1] for v in (vmin, vmax)]
+    his = [hi[0] * v + hi[1] for v in (vmin, vmax)]
+    return min(los), max(his)
+
+
+def _interval(k, eps):
+    """ the selection interval of digit k: 4 * w must be in [L, U], where
+        ``L = (k - rho) * v + (k - rho)**2 * eps`` and ``U = (k + rho) * v +
+        (k + rho)**2 * eps``.  returns ((slope, offset) of L, (...) of U)
+    """
+    return ((k - RHO, (k - RHO) ** 2 * eps),
+            (k + RHO, (k + RHO) ** 2 * eps))
+
+
+def _thresholds(valid_digits):
+    """ turns the valid digits, for each estimate from lowest to highest,
+        into selection constants: the lowest estimate at which digit k
+        (-1, 0, 1, 2) or above is selected.  None if not monotonic.
+    """
+    lowest = -4 << EST_FRACT_BITS
+    top = 4 << EST_FRACT_BITS
+    digit = -2
+    thresholds = []
+    for est, valid in zip(range(lowest, top), valid_digits):
+        lo, hi = valid
+        digit = max(digit, lo)
+        if digit > hi:
+            return None
+        while len(thresholds) < digit + 2:
+            thresholds.append(est)
+    return tuple(thresholds + [top] * (4 - len(thresholds)))
+
+
+def _select(cells, eps_lo, eps_hi):
+    """ selection constants for each (index, vmin, vmax) in cells: v in
+        [vmin, vmax] is the divisor (or partial root), and eps (in [eps_lo,
+        eps_hi]) the weight of the square root's q**2 term.
+
+        digit k is valid for an estimate e (of 4 * w, which is in [e, e +
+        2**(1-EST_FRACT_BITS)): two truncated carry-save components) unless
+        some reachable 4 * w in that range is outside k's interval.
+    """
+    err = Fraction(2, 1 << EST_FRACT_BITS)
+    table = {}
+    for idx, vmin, vmax in cells:
+        # the intervals of -2 and 2 bound 4 * w
+        (l2a, l2b), _ = _interval(-2, eps_lo)
+        _, (u2a, u2b) = _interval(2, eps_hi)
+        # the estimate must not overflow
+        assert (u2a * vmax + u2b) < 4 and \
+               (l2a * vmax + l2b) - err >= -4, "estimate out of range"
+        # the estimates for which some reachable 4 * w is above U (those
+        # in (U - err, U2)), or below L (in (L-2 - err, L)), of digit k
+        fails = []
+        for k in range(-2, 3):
+            (la, lb), _ = _interval(k, eps_hi)
+            _, (ua, ub) = _interval(k, eps_lo)
+            spans = []
+            if k < 2:
+                spans.append(_span((ua, ub - err), (u2a, u2b), vmin, vmax))
+            if k > -2:
+                spans.append(_span((l2a, l2b - err), (la, lb), vmin, vmax))
+            fails.append(spans)
+        valid_digits = []
+        for est in range(-4 << EST_FRACT_BITS, 4 << EST_FRACT_BITS):
+            y = Fraction(est, 1 << EST_FRACT_BITS)
+            valid = [k for k, spans in zip(range(-2, 3), fails)
+                     if not any(lo < y < hi for lo, hi in spans)]
+            assert valid and valid == list(range(valid[0], valid[-1] + 1)), \
+                   f"no digit for estimate {y}, v in [{vmin}, {vmax}]"
+            valid_digits.append((valid[0], valid[-1]))
+        table[idx] = _thresholds(valid_digits)
+        assert table[idx] is not None, "selection not monotonic"
+    return table
+
+
+@functools.lru_cache()
+def div_table():
+    """ selection constants for division: {divisor index: thresholds},
+        the index being the top DIV_INDEX_BITS of d in [1/2, 1)
+    """
+    width = 1 << DIV_INDEX_BITS
+    cells = [(i, Fraction(i, width), Fraction(i + 1, width))
+             for i in range(width // 2, width)]
+    return _select(cells, Fraction(0), Fraction(0))
+
+
+def _sqrt_root_range(a):
+    """ the root of the scaled radicand is in [lo, hi) """
+    return Fraction(1, 1 << a), Fraction(2, 1 << a)
+
+
+@functools.lru_cache()
+def sqrt_first_table(a):
+    """ selection constants for the first root digit (S[0] is 0, and the
+        estimate is exact to one ulp, the carry being zero).  digit k is
+        valid if |s - k/4| <= rho/4 for every root s in the estimate's range.
+        only 1 and 2 are used, so that S[1] is never too small for the
+        tables of the later digits.
+    """
+    s_lo, s_hi = _sqrt_root_range(a)
+    ulp = Fraction(1, 1 << EST_FRACT_BITS)
+    valid_digits = []
+    for est in range(-4 << EST_FRACT_BITS, 4 << EST_FRACT_BITS):
+        # 4 * w[0] = s**2 * 2**a
+        lo2 = max(est * ulp / 2 ** a, s_lo ** 2)
+        hi2 = min((est * ulp + ulp) / 2 ** a, s_hi ** 2)
+        if lo2 >= hi2:
+            valid_digits.append((1, 2)) # unreachable
+            continue
+        valid = [k for k in (1, 2)
+                 if lo2 >= (Fraction(k, 4) - RHO / 4) ** 2 and
+                    hi2 <= (Fraction(k, 4) + RHO / 4) ** 2]
+        assert valid, "no first root digit for estimate %d" % est
+        valid_digits.append((valid[0], valid[-1]))
+    return {0: _thresholds(valid_digits)}
+
+
+def _sqrt_first_digits(a):
+    """ the first root digits that sqrt_first_table can select """
+    s_lo, s_hi = _sqrt_root_range(a)
+    table = sqrt_first_table(a)[0]
+    top = 4 << EST_FRACT_BITS
+    lo = select_digit(table, math.floor(s_lo ** 2 * 2 ** a * 16))
+    hi = select_digit(table, min(math.ceil(s_hi ** 2 * 2 ** a * 16), top - 1))
+    return range(lo, hi + 1)
+
+
+def sqrt_table(a, j):
+    """ selection constants for root digit j+1: {partial root index:
+        thresholds}, the index being floor(v * 2**SQRT_INDEX_BITS) where v
+        is S[j] * 2**(a-1) (so in [1/2, 1], give or take).  w is scaled by
+        2**(a-2), so that the intervals are those of division with v for d.
+    """
+    if j == 0:
+        return sqrt_first_table(a)
+    return _sqrt_table(a, min(j, SQRT_SHARED_FROM))
+
+
+@functools.lru_cache()
+def _sqrt_table(a, j):
+    scale = Fraction(2) ** (a - 1)
+    s_lo, s_hi = _sqrt_root_range(a)
+    shared = j == SQRT_SHARED_FROM
+    if shared:
+        # one (conservative) table for this and all later digits
+        eps_lo, eps_hi = Fraction(0), Fraction(1, 4 ** (j + 1)) * scale / 2
+    else:
+        eps_lo = eps_hi = Fraction(1, 4 ** (j + 1)) * scale / 2
+    ulp = Fraction(1, 4 ** j) * scale # S[j] is a multiple of 4**-j
+    if j == 1:
+        values = [Fraction(k, 4) * scale for k in _sqrt_first_digits(a)]
+    else:
+        # S[j] is within rho * 4**-j of the root
+        v_lo = (s_lo - RHO / 4 ** j) * scale
+        v_hi = (s_hi + RHO / 4 ** j) * scale
+        values = None
+    width = 1 << SQRT_INDEX_BITS
+    cells = []
+    if values is not None:
+        for v in values:
+            cells.append((math.floor(v * width), v, v))
+    else:
+        for idx in range(math.floor(v_lo * width),
+                         math.floor(v_hi * width) + 1):
+            lo = max(Fraction(idx, width), v_lo)
+            hi = min(Fraction(idx + 1, width), v_hi)
+            if not shared:
+                # only the multiples of the ulp in range
+                lo = math.ceil(lo / ulp) * ulp
+                hi = (math.ceil(hi / ulp) - 1) * ulp
+            if lo <= hi:
+                cells.append((idx, lo, hi))
+    for idx, vmin, vmax in cells:
+        # 4 * w = 4**(j+1) * (s - S) * (s + S) * ...: only monotonic in
+        # s - S (so that the intervals hold) if S is not too small
+        assert vmin >= (2 - RHO) * scale / 4 ** (j + 1)
+    return _select(cells, eps_lo, eps_hi)
+
+
+def select_digit(thresholds, estimate):
+    """ the digit that the thresholds select for estimate """
+    return sum(estimate >= th for th in thresholds) - 2
+
+
+class SRTDivPipeCoreInterstageData:
+    """ interstage data type for the SRT core.
+
+    :attribute core_config: ``SRTDivPipeCoreConfig`` instance describing the
+        configuration to be used.
+    :attribute divisor_radicand: divisor for div/rem and radicand for
+        sqrt. Signal with a bit-width of ``core_config.bit_width`` and a
+        fract-width of ``core_config.fract_width`` bits.
+    :attribute operation: the ``DivPipeCoreOperation`` to be computed.
+    :attribute quotient_root: the quotient or root digits so far (as an
+        integer).  Signal with a bit-width of ``core_config.quotient_width``.
+    :attribute quotient_root_m: ``quotient_root - 1`` (modulo
+        ``2**quotient_width``).
+    :attribute remainder_sum: carry-save partial remainder, sum part.
+        Signal with a bit-width of ``core_config.remainder_width`` and a
+        fract-width of ``core_config.remainder_shift``.
+    :attribute remainder_carry: carry-save partial remainder, carry part.
+    """
+
+    def __init__(self, core_config, reset_less=True):
+        """ Create a ``SRTDivPipeCoreInterstageData`` instance. """
+        self.core_config = core_config
+        bw = core_config.bit_width
+        qw = core_config.quotient_width
+        rw = core_config.remainder_width
+        self.divisor_radicand = Signal(bw, reset_less=reset_less)
+        self.operation = DP.create_signal(reset_less=reset_less)
+        self.quotient_root = Signal(qw, reset_less=reset_less)
+        self.quotient_root_m = Signal(qw, reset_less=reset_less)
+        self.remainder_sum = Signal(rw, reset_less=reset_less)
+        self.remainder_carry = Signal(rw, reset_less=reset_less)
+
+    def __iter__(self):
+        """ Get member signals. """
+        yield self.divisor_radicand
+        yield self.operation
+        yield self.quotient_root
+        yield self.quotient_root_m
+        yield self.remainder_sum
+        yield self.remainder_carry
+
+    def eq(self, rhs):
+        """ Assign member signals. """
+        return [self.divisor_radicand.eq(rhs.divisor_radicand),
+                self.operation.eq(rhs.operation),
+                self.quotient_root.eq(rhs.quotient_root),
+                self.quotient_root_m.eq(rhs.quotient_root_m),
+                self.remainder_sum.eq(rhs.remainder_sum),
+                self.remainder_carry.eq(rhs.remainder_carry)]
+
+
+class SRTDivPipeCoreSetupStage(Elaboratable):
+    """ Setup Stage of the SRT core. """
+
+    def __init__(self, core_config):
+        """ Create a ``SRTDivPipeCoreSetupStage`` instance."""
+        self.core_config = core_config
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return DivPipeCoreInputData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return SRTDivPipeCoreInterstageData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        m.submodules.div_pipe_core_setup = self
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o  # return processed data (ignore i)
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        fw = self.core_config.fract_width
+
+        comb += self.o.divisor_radicand.eq(self.i.divisor_radicand)
+        comb += self.o.operation.eq(self.i.operation)
+        comb += self.o.quotient_root.eq(0)
+        comb += self.o.quotient_root_m.eq(-1)
+        comb += self.o.remainder_carry.eq(0)
+
+        # w[0]: the dividend, or the (scaled) radicand
+        with m.Switch(self.i.operation):
+            with m.Case(int(DP.UDivRem)):
+                comb += self.o.remainder_sum.eq(self.i.dividend)
+            with m.Case(int(DP.SqrtRem)):
+                comb += self.o.remainder_sum.eq(
+                    self.i.divisor_radicand << (fw - 1))
+
+        return m
+
+
+class SRTQuotientDigitSelect(Elaboratable):
+    """ selects a quotient (or root) digit in {-2..2} by comparing the
+        partial remainder estimate with the selection constants of the
+        divisor (or partial root) index.
+
+        the digit comes out as sign and one-hot magnitude: ``neg``, ``one``
+        and ``two`` (all clear for zero).
+    """
+
+    def __init__(self, table, index_width):
+        self.table = table
+        self.estimate = Signal((EST_BITS, True), reset_less=True)
+        self.index = Signal(index_width, reset_less=True)
+        self.neg = Signal(reset_less=True)
+        self.one = Signal(reset_less=True)
+        self.two = Signal(reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        lowest = -1 << (EST_BITS - 1)
+        top = 1 << (EST_BITS - 1)
+        # ge[i]: estimate >= threshold of digit i-1 (so -2 + sum(ge))
+        ge = Signal(4, reset_less=True)
+        with m.Switch(self.index):
+            for idx, thresholds in sorted(self.table.items()):
+                with m.Case(idx):
+                    for i, th in enumerate(thresholds):
+                        if th <= lowest:
+                            comb += ge[i].eq(1)
+                        elif th < top:
+                            comb += ge[i].eq(self.estimate >= th)
+            with m.Default():
+                comb += ge.eq(0b0011) # unreachable: zero
+
+        comb += self.neg.eq(~ge[1])
+        comb += self.one.eq((ge[2] & ~ge[3]) | (ge[0] & ~ge[1]))
+        comb += self.two.eq(ge[3] | ~ge[0])
+
+        return m
+
+
+class SRTDivPipeCoreCalculateStage(Elaboratable):
+    """ Calculate Stage of the SRT core: one radix-4 digit. """
+
+    def __init__(self, core_config, stage_index):
+        """ Create a ``SRTDivPipeCoreCalculateStage`` instance. """
+        assert stage_index in range(core_config.n_stages)
+        self.core_config = core_config
+        self.stage_index = stage_index
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage. """
+        return SRTDivPipeCoreInterstageData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage. """
+        return SRTDivPipeCoreInterstageData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        setattr(m.submodules,
+                f"div_pipe_core_calculate_{self.stage_index}",
+                self)
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        cc = self.core_config
+        j = self.stage_index
+        fw = cc.fract_width
+        qw = cc.quotient_width
+        rs = cc.remainder_shift
+        rw = cc.remainder_width
+        i = self.i
+        is_div = Signal(reset_less=True)
+        comb += is_div.eq(i.operation == int(DP.UDivRem))
+
+        # copy invariant inputs to outputs (for next stage)
+        comb += self.o.divisor_radicand.eq(i.divisor_radicand)
+        comb += self.o.operation.eq(i.operation)
+
+        # estimate of 4 * w: the top bits of sum and carry, added
+        lsb = rs - EST_FRACT_BITS - 2
+        estimate = Signal((EST_BITS, True), reset_less=True)
+        comb += estimate.eq(i.remainder_sum[lsb:rs+1] +
+                            i.remainder_carry[lsb:rs+1])
+
+        # the digit (sign and one-hot magnitude), selected for each
+        # operation, along with its multiples of the divisor (or the sqrt
+        # terms), to be subtracted
+        neg = Signal(reset_less=True)
+        one = Signal(reset_less=True)
+        two = Signal(reset_less=True)
+        pos = Signal(reset_less=True)
+        digits = [] # (select, multiple for 1, multiple for 2)
+        if DP.UDivRem in cc.supported:
+            # index: the top bits of the divisor
+            index = Cat(Const(0, DIV_INDEX_BITS), i.divisor_radicand)
+            index = index[fw+1:]
+            sel = SRTQuotientDigitSelect(div_table(), len(index))
+            m.submodules.div_select = sel
+            comb += sel.index.eq(index)
+            comb += sel.estimate.eq(estimate)
+
+            # d * 2**remainder_shift
+            d = Cat(Const(0, qw), i.divisor_radicand)
+            digits.append((sel, d, Cat(Const(0, 1), d)))
+
+        if DP.SqrtRem in cc.supported:
+            # index: the top bits of the partial root
+            a = cc.sqrt_scale
+            shift = a - 1 + SQRT_INDEX_BITS - 2 * j
+            index = Cat(Const(0, max(shift, 0)), i.quotient_root)
+            index = index[max(-shift, 0):]
+            sel = SRTQuotientDigitSelect(sqrt_table(a, j), len(index))
+            m.submodules.sqrt_select = sel
+            comb += sel.index.eq(index)
+            comb += sel.estimate.eq(estimate)
+
+            # 2 * S * q + q**2 * 4**-(j+1) (scaled by 2**(a-2)), which for
+            # q > 0 is (8 * Q + 1) or (16 * Q + 4), and for q < 0 is minus
+            # (8 * QM + 7) or (16 * QM + 12), times 4**-(j+1)
+            shift = rs + a - 4 - 2 * j
+            assert shift >= 0
+            q = Signal(qw, reset_less=True)
+            comb += q.eq(Mux(neg, i.quotient_root_m, i.quotient_root))
+            one_low = Mux(neg, Const(7, 3), Const(1, 3))
+            two_low = Mux(neg, Const(12, 4), Const(4, 4))
+            digits.append((sel, Cat(one_low, q) << shift,
+                           Cat(two_low, q) << shift))
+
+        if len(digits) == 1:
+            (sel, mult_one, mult_two), = digits
+            comb += [neg.eq(sel.neg), one.eq(sel.one), two.eq(sel.two)]
+        else:
+            (dsel, dmult_one, dmult_two), (ssel, smult_one, smult_two) = digits
+            comb += [neg.eq(Mux(is_div, dsel.neg, ssel.neg)),
+                     one.eq(Mux(is_div, dsel.one, ssel.one)),
+                     two.eq(Mux(is_div, dsel.two, ssel.two))]
+            mult_one = Mux(is_div, dmult_one, smult_one)
+            mult_two = Mux(is_div, dmult_two, smult_two)
+        comb += pos.eq((one | two) & ~neg)
+
+        # subtracted by adding it inverted, with the +1 going into the
+        # carry's (free) LSB
+        mult = Signal(rw, reset_less=True)
+        comb += mult.eq(Mux(two, mult_two, Mux(one, mult_one, 0)))
+        addend = Signal(rw, reset_less=True)
+        comb += addend.eq(Mux(pos, ~mult, mult))
+
+        # w[j+1] = 4 * w[j] - ...: carry-save add
+        x = Signal(rw, reset_less=True)
+        y = Signal(rw, reset_less=True)
+        comb += x.eq(i.remainder_sum << 2)
+        comb += y.eq(i.remainder_carry << 2)
+        majority = (x & y) | (x & addend) | (y & addend)
+        comb += self.o.remainder_sum.eq(x ^ y ^ addend)
+        comb += self.o.remainder_carry.eq(Cat(pos, majority))
+
+        # on-the-fly conversion: Q = 4 * Q + q (or 4 * QM + 4 + q if q < 0),
+        # QM = 4 * Q + q - 1 (or 4 * QM + 3 + q if q <= 0)
+        q_digit = Mux(neg, Mux(two, 2, 3), Mux(two, 2, Mux(one, 1, 0)))
+        qm_digit = Mux(pos, Mux(two, 1, 0), Mux(two, 1, Mux(one, 2, 3)))
+        comb += self.o.quotient_root.eq(
+            Cat(q_digit[:2], Mux(neg, i.quotient_root_m, i.quotient_root)))
+        comb += self.o.quotient_root_m.eq(
+            Cat(qm_digit[:2], Mux(pos, i.quotient_root, i.quotient_root_m)))
+
+        return m
+
+
+class SRTDivPipeCoreFinalStage(Elaboratable):
+    """ Final Stage of the SRT core. """
+
+    def __init__(self, core_config):
+        """ Create a ``SRTDivPipeCoreFinalStage`` instance."""
+        self.core_config = core_config
+        self.i = self.ispec()
+        self.o = self.ospec()
+
+    def ispec(self):
+        """ Get the input spec for this pipeline stage."""
+        return SRTDivPipeCoreInterstageData(self.core_config)
+
+    def ospec(self):
+        """ Get the output spec for this pipeline stage."""
+        return DivPipeCoreOutputData(self.core_config)
+
+    def setup(self, m, i):
+        """ Pipeline stage setup. """
+        m.submodules.div_pipe_core_final = self
+        m.d.comb += self.i.eq(i)
+
+    def process(self, i):
+        """ Pipeline stage process. """
+        return self.o  # return processed data (ignore i)
+
+    def elaborate(self, platform):
+        """ Elaborate into ``Module``. """
+        m = Module()
+        comb = m.d.comb
+        cc = self.core_config
+        fw = cc.fract_width
+        qw = cc.quotient_width
+        rw = cc.remainder_width
+        i = self.i
+
+        # a negative remainder means the last digit was one too big:
+        # Q - 1, and the remainder gets back d (or 2 * Q - 1, for sqrt).
+        # the remainder, and the remainder plus that, are added up in
+        # parallel (the second with a carry-save add first), then selected
+        corr = Signal(rw, reset_less=True)
+        with m.Switch(i.operation):
+            if DP.UDivRem in cc.supported:
+                with m.Case(int(DP.UDivRem)):
+                    comb += corr.eq(i.divisor_radicand << qw)
+            if DP.SqrtRem in cc.supported:
+                with m.Case(int(DP.SqrtRem)):
+                    comb += corr.eq(Cat(Const(1, 1), i.quotient_root_m)
+                                    << (qw - 1))
+        x, y = i.remainder_sum, i.remainder_carry
+        rem = Signal((rw, True), reset_less=True)
+        rem_corr = Signal(rw, reset_less=True)
+        comb += rem.eq(x + y)
+        carry = (x & y) | (x & corr) | (y & corr)
+        comb += rem_corr.eq((x ^ y ^ corr) + Cat(Const(0, 1), carry))
+
+        neg = Signal(reset_less=True)
+        fixed = Signal(rw, reset_less=True)
+        comb += neg.eq(rem[-1])
+        comb += fixed.eq(Mux(neg, rem_corr, rem))
+        comb += self.o.quotient_root.eq(Mux(neg, i.quotient_root_m,
+                                                 i.quotient_root))
+
+        # rescale to the remainder of core.py
+        with m.Switch(i.operation):
+            with m.Case(int(DP.UDivRem)):
+                comb += self.o.remainder.eq((fixed >> qw) << fw)
+            with m.Case(int(DP.SqrtRem)):
+                comb += self.o.remainder.eq((fixed >> (qw - 1)) << fw)
+
+        return m
+
+
+def srt_div_sqrt(core_config, dividend, divisor_radicand, operation):
+    """ bit-accurate model of the SRT core: (quotient_root, remainder) """
+    cc = core_config
+    fw = cc.fract_width
+    qw = cc.quotient_width
+    rs = cc.remainder_shift
+    rw = cc.remainder_width
+    a = cc.sqrt_scale
+    mask = (1 << rw) - 1
+    qmask = (1 << qw) - 1
+    is_div = operation == DP.UDivRem
+    if is_div:
+        s = dividend
+    else:
+        s = divisor_radicand << (fw - 1)
+    c = 0
+    q, qm = 0, qmask
+    for j in range(cc.n_stages):
+        lsb = rs - EST_FRACT_BITS - 2
+        est = ((s >> lsb) + (c >> lsb)) & ((1 << EST_BITS) - 1)
+        if est >= 1 << (EST_BITS - 1):
+            est -= 1 << EST_BITS
+        if is_div:
+            index = (divisor_radicand << DIV_INDEX_BITS) >> (fw + 1)
+            table = div_table()
+        else:
+            shift = a - 1 + SQRT_INDEX_BITS - 2 * j
+            index = q << shift if shift >= 0 else q >> -shift
+            table = sqrt_table(a, j)
+        digit = select_digit(table[index], est) if index in table else 0
+        if is_div:
+            mult = abs(digit) * (divisor_radicand << qw)
+        elif digit > 0:
+            mult = ((8 * q + 1) if digit == 1 else (16 * q + 4)) \
+                   << (rs + a - 4 - 2 * j)
+        elif digit < 0:
+            mult = ((8 * qm + 7) if digit == -1 else (16 * qm + 12)) \
+                   << (rs + a - 4 - 2 * j)
+        else:
+            mult = 0
+        mult &= mask
+        if digit > 0:
+            addend, cin = ~mult & mask, 1
+        else:
+            addend, cin = mult, 0
+        x, y = (s << 2) & mask, (c << 2) & mask
+        s = x ^ y ^ addend
+        c = (((x & y) | (x & addend) | (y & addend)) << 1 | cin) & mask
+        q, qm = (((4 * q + digit) if digit >= 0 else (4 * qm + 4 + digit)),
+                 ((4 * q + digit - 1) if digit > 0 else (4 * qm + 3 + digit)))
+        q, qm = q & qmask, qm & qmask
+    rem = (s + c) & mask
+    if rem >> (rw - 1):
+        rem -= 1 << rw
+        q = qm
+        if is_div:
+            rem += divisor_radicand << qw
+        else:
+            rem += (2 * qm + 1) << (qw - 1)
+    if is_div:
+        return q, (rem >> qw) << fw
+    return q, (rem >> (qw - 1)) << fw
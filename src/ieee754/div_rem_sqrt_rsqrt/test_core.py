@@ -5,6 +5,7 @@
 from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreConfig,
                     DivPipeCoreSetupStage,
                     DivPipeCoreCalculateStage, DivPipeCoreFinalStage,
+                    DivPipeCoreIterativeStage,
                     DivPipeCoreOperation, DivPipeCoreInputData,
                     DivPipeCoreInterstageData, DivPipeCoreOutputData)
 from ieee754.div_rem_sqrt_rsqrt.algorithm import (FixedUDivRemSqrtRSqrt,
@@ -368,6 +369,22 @@ class TestDivPipeCore(unittest.TestCase):
                                              supported=supported),
                            sync=False)
 
+    def test_bit_width_8_fract_width_4_radix_4_sqrt_only(self):
+        supported = (DivPipeCoreOperation.SqrtRem,)
+        self.handle_config(DivPipeCoreConfig(bit_width=8,
+                                             fract_width=4,
+                                             log2_radix=2,
+                                             supported=supported))
+
+    def test_bit_width_8_fract_width_4_radix_4_comb_div_sqrt_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,
+                     DivPipeCoreOperation.SqrtRem)
+        self.handle_config(DivPipeCoreConfig(bit_width=8,
+                                             fract_width=4,
+                                             log2_radix=2,
+                                             supported=supported),
+                           sync=False)
+
     @unittest.skip("really slow")
     def test_bit_width_32_fract_width_24_radix_8_comb(self):
         self.handle_config(DivPipeCoreConfig(bit_width=32,
@@ -397,5 +414,171 @@ class TestDivPipeCore(unittest.TestCase):
     # FIXME: add more test_* functions
 
 
+class TestDivPipeCoreSupported(unittest.TestCase):
+    """ reduced ``supported`` configurations against the full unit """
+
+    def handle_config(self, core_config, test_cases=None):
+        full_config = DivPipeCoreConfig(core_config.bit_width,
+                                        core_config.fract_width,
+                                        core_config.log2_radix)
+        self.assertLess(core_config.compare_len, full_config.compare_len)
+        if test_cases is None:
+            test_cases = get_test_cases(core_config)
+        test_cases = list(test_cases)
+        m = Module()
+        m.submodules.full = full = DivPipeCoreTestPipeline(full_config,
+                                                           sync=False)
+        m.submodules.reduced = reduced = DivPipeCoreTestPipeline(core_config,
+                                                                 sync=False)
+        sim = Simulator(m)
+
+        def process():
+            for test_case in test_cases:
+                for dut in full, reduced:
+                    yield dut.i.dividend.eq(test_case.dividend)
+                    yield dut.i.divisor_radicand.eq(test_case.divisor_radicand)
+                    yield dut.i.operation.eq(int(test_case.core_op))
+                yield Delay(1e-6)
+                for dut in full, reduced:
+                    quotient_root = (yield dut.o.quotient_root)
+                    remainder = (yield dut.o.remainder)
+                    self.assertEqual(quotient_root, test_case.quotient_root,
+                                     str(test_case))
+                    self.assertEqual(remainder, test_case.remainder,
+                                     str(test_case))
+        sim.add_process(process)
+        sim.run()
+
+    def test_widths(self):
+        full = DivPipeCoreConfig(64, 54, 3)
+        div = DivPipeCoreConfig(64, 54, 3, (DivPipeCoreOperation.UDivRem,))
+        sqrt = DivPipeCoreConfig(64, 54, 3, (DivPipeCoreOperation.SqrtRem,))
+        self.assertEqual(full.compare_len, 64 * 3)
+        self.assertEqual(div.compare_len, 64 * 2 + 54)
+        # the root has only 59 bits: 20 radix-8 stages rather than 22
+        self.assertEqual(sqrt.quotient_width, 59)
+        self.assertEqual(sqrt.n_stages, 20)
+        self.assertEqual(full.n_stages, 22)
+        self.assertEqual(sqrt.compare_len, 59 * 2 + 54)
+        self.assertEqual(div.root_times_radicand_width, 0)
+        self.assertEqual(div.divisor_width, 64)
+        self.assertEqual(sqrt.divisor_width, 0)
+        self.assertEqual(len(DivPipeCoreOutputData(div).remainder), 182)
+
+    def test_bit_width_8_fract_width_4_radix_4_div_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,)
+        self.handle_config(DivPipeCoreConfig(8, 4, 2, supported))
+
+    def test_bit_width_8_fract_width_4_radix_4_sqrt_only(self):
+        supported = (DivPipeCoreOperation.SqrtRem,)
+        self.handle_config(DivPipeCoreConfig(8, 4, 2, supported))
+
+    def test_bit_width_8_fract_width_7_radix_2_div_sqrt_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,
+                     DivPipeCoreOperation.SqrtRem)
+        self.handle_config(DivPipeCoreConfig(8, 7, 1, supported))
+
+    def test_bit_width_16_fract_width_12_radix_8_div_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,)
+        cc = DivPipeCoreConfig(16, 12, 3, supported)
+        dividends = [*partitioned_ints(28)]
+        self.handle_config(cc, get_test_cases(cc, dividends=dividends))
+
+    def test_bit_width_16_fract_width_12_radix_8_sqrt_only(self):
+        supported = (DivPipeCoreOperation.SqrtRem,)
+        self.handle_config(DivPipeCoreConfig(16, 12, 3, supported))
+
+
+class DivPipeCoreIterativeTestPipeline(Elaboratable):
+    """ the iterative stage, unrolled: n_stages of them, and one more
+        (which must do nothing)
+    """
+
+    def __init__(self, core_config):
+        self.core_config = core_config
+        self.setup_stage = DivPipeCoreSetupStage(core_config)
+        self.calculate_stages = [
+            DivPipeCoreIterativeStage(core_config, instance)
+            for instance in range(core_config.n_stages + 1)]
+        self.final_stage = DivPipeCoreFinalStage(core_config)
+        self.interstage_signals = [
+            DivPipeCoreInterstageData(core_config, reset_less=True)
+            for i in range(core_config.n_stages + 2)]
+        self.i = DivPipeCoreInputData(core_config, reset_less=True)
+        self.o = DivPipeCoreOutputData(core_config, reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        stages = [self.setup_stage, *self.calculate_stages, self.final_stage]
+        stage_inputs = [self.i, *self.interstage_signals]
+        stage_outputs = [*self.interstage_signals, self.o]
+        for stage, input, output in zip(stages, stage_inputs, stage_outputs):
+            stage.setup(m, input)
+            m.d.comb += output.eq(stage.process(input))
+        shift = self.core_config.quotient_width
+        for stage in self.calculate_stages:
+            m.d.comb += stage.shift_i.eq(shift)
+            shift = stage.shift_o
+        return m
+
+
+class TestDivPipeCoreIterative(unittest.TestCase):
+    def handle_config(self, core_config, test_cases=None):
+        if test_cases is None:
+            test_cases = get_test_cases(core_config)
+        test_cases = list(test_cases)
+        dut = DivPipeCoreIterativeTestPipeline(core_config)
+        sim = Simulator(dut)
+
+        def process():
+            for test_case in test_cases:
+                yield dut.i.dividend.eq(test_case.dividend)
+                yield dut.i.divisor_radicand.eq(test_case.divisor_radicand)
+                yield dut.i.operation.eq(int(test_case.core_op))
+                yield Delay(1e-6)
+                quotient_root = (yield dut.o.quotient_root)
+                remainder = (yield dut.o.remainder)
+                self.assertEqual(quotient_root, test_case.quotient_root,
+                                 str(test_case))
+                self.assertEqual(remainder, test_case.remainder,
+                                 str(test_case))
+                last = dut.calculate_stages[-1]
+                self.assertEqual((yield last.shift_o), 0)
+                # with a zero remainder, only the stages down to the
+                # lowest set bit of quotient_root do anything
+                active = 0
+                for stage in dut.calculate_stages:
+                    active += bool((yield stage.shift_i))
+                expected = core_config.n_stages
+                nonzero = (test_case.divisor_radicand or
+                           test_case.core_op == DivPipeCoreOperation.SqrtRem)
+                if test_case.remainder == 0 and nonzero:
+                    qw = core_config.quotient_width
+                    q = test_case.quotient_root
+                    low = (q & -q).bit_length() - 1 if q else qw
+                    expected = max(1, -(-(qw - low) //
+                                        core_config.log2_radix))
+                self.assertEqual(active, expected, str(test_case))
+        sim.add_process(process)
+        sim.run()
+
+    def test_bit_width_8_fract_width_4_radix_2(self):
+        self.handle_config(DivPipeCoreConfig(8, 4, 1))
+
+    def test_bit_width_8_fract_width_4_radix_8(self):
+        # 8 bits, radix 8: the last stage has only 2 bits
+        self.handle_config(DivPipeCoreConfig(8, 4, 3))
+
+    def test_bit_width_8_fract_width_4_radix_8_sqrt_only(self):
+        supported = (DivPipeCoreOperation.SqrtRem,)
+        self.handle_config(DivPipeCoreConfig(8, 4, 3, supported))
+
+    def test_bit_width_16_fract_width_12_radix_8_div_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,)
+        cc = DivPipeCoreConfig(16, 12, 3, supported)
+        dividends = [*partitioned_ints(28)]
+        self.handle_config(cc, get_test_cases(cc, dividends=dividends))
+
+
 if __name__ == '__main__':
     unittest.main()
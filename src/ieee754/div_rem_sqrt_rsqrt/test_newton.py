@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# See Notices.txt for copyright information
+
+from ieee754.div_rem_sqrt_rsqrt.newton import (NRDivPipeCoreConfig,
+                    NRDivPipeCoreSetupStage, NRDivPipeCoreCalculateStage,
+                    NRDivPipeCoreFinalStage, NRDivPipeCoreInterstageData,
+                    seed_table, seed_error_bound, nr_div_sqrt_rsqrt,
+                    SEED_INDEX_BITS)
+from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreOperation,
+                    DivPipeCoreInputData, DivPipeCoreOutputData)
+from ieee754.div_rem_sqrt_rsqrt.algorithm import Operation
+from ieee754.div_rem_sqrt_rsqrt.test_core import (generate_test_case,
+                                                  shifted_ints)
+import unittest
+import random
+from fractions import Fraction
+from nmigen import Module, Elaboratable
+from nmigen.back.pysim import Simulator, Delay
+
+DP = DivPipeCoreOperation
+
+
+def get_test_cases(core_config, all_ints=False):
+    """ test cases with normalised divisors and radicands, from the
+        restoring algorithm
+    """
+    fw = core_config.fract_width
+    if all_ints:
+        ints = range
+    else:
+        def ints(lo, hi):
+            return [n for n in shifted_ints(hi.bit_length(), 4)
+                    if lo <= n < hi]
+    supported = core_config.supported
+    if DP.UDivRem in supported:
+        for dividend in ints(0, 2 << (2 * fw)):
+            for divisor in ints(1 << fw, 2 << fw):
+                yield from generate_test_case(core_config, dividend,
+                                              divisor, Operation.UDivRem)
+    for op, alg_op in ((DP.SqrtRem, Operation.SqrtRem),
+                       (DP.RSqrtRem, Operation.RSqrtRem)):
+        if op in supported:
+            for radicand in ints(1 << fw, 4 << fw):
+                yield from generate_test_case(core_config, 0, radicand,
+                                              alg_op)
+
+
+def random_test_cases(core_config, count, seed=1):
+    fw = core_config.fract_width
+    rand = random.Random(seed)
+    for _ in range(count):
+        divisor = rand.randrange(1 << fw, 2 << fw)
+        dividend = rand.randrange(0, 2 << (2 * fw))
+        yield from generate_test_case(core_config, dividend, divisor,
+                                      Operation.UDivRem)
+        radicand = rand.randrange(1 << fw, 4 << fw)
+        yield from generate_test_case(core_config, 0, radicand,
+                                      Operation.SqrtRem)
+        yield from generate_test_case(core_config, 0, radicand,
+                                      Operation.RSqrtRem)
+
+
+class NRDivPipeCoreTestPipeline(Elaboratable):
+    def __init__(self, core_config):
+        self.setup_stage = NRDivPipeCoreSetupStage(core_config)
+        self.calculate_stages = [
+            NRDivPipeCoreCalculateStage(core_config, stage_index)
+            for stage_index in range(core_config.n_stages)]
+        self.final_stage = NRDivPipeCoreFinalStage(core_config)
+        self.interstage_signals = [
+            NRDivPipeCoreInterstageData(core_config, reset_less=True)
+            for i in range(core_config.n_stages + 1)]
+        self.i = DivPipeCoreInputData(core_config, reset_less=True)
+        self.o = DivPipeCoreOutputData(core_config, reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        stages = [self.setup_stage, *self.calculate_stages, self.final_stage]
+        stage_inputs = [self.i, *self.interstage_signals]
+        stage_outputs = [*self.interstage_signals, self.o]
+        for stage, input, output in zip(stages, stage_inputs, stage_outputs):
+            stage.setup(m, input)
+            m.d.comb += output.eq(stage.process(input))
+        return m
+
+
+class TestNRSeeds(unittest.TestCase):
+    def test_seeds(self):
+        width = 1 << SEED_INDEX_BITS
+        self.assertEqual(sorted(seed_table("div")),
+                         list(range(width, 2 * width)))
+        self.assertEqual(sorted(seed_table("rsqrt")),
+                         list(range(width, 4 * width)))
+        # good to SEED_INDEX_BITS + 1 bits (give or take the rounding)
+        for kind in ("div", "rsqrt"):
+            self.assertLess(seed_error_bound(kind),
+                            Fraction(5, 4 << SEED_INDEX_BITS))
+
+
+class TestNRConfig(unittest.TestCase):
+    def test_config(self):
+        # the number of correct bits doubles with each iteration
+        self.assertEqual(NRDivPipeCoreConfig(16, 12).n_iterations, 1)
+        self.assertEqual(NRDivPipeCoreConfig(32, 25).n_iterations, 2)
+        self.assertEqual(NRDivPipeCoreConfig(64, 54).n_iterations, 3)
+        self.assertEqual(NRDivPipeCoreConfig(64, 54).n_stages, 4)
+        cc = NRDivPipeCoreConfig(64, 54, (DP.UDivRem,))
+        self.assertEqual(list(cc.error_bounds), ["div"])
+        self.assertEqual(cc.supported, frozenset((DP.UDivRem,)))
+
+
+class TestNRModel(unittest.TestCase):
+    """ the python model against the restoring algorithm """
+
+    def handle_cases(self, core_config, test_cases):
+        for test_case in test_cases:
+            result = nr_div_sqrt_rsqrt(core_config,
+                                       test_case.dividend,
+                                       test_case.divisor_radicand,
+                                       test_case.core_op)
+            self.assertEqual(result, (test_case.quotient_root,
+                                      test_case.remainder), str(test_case))
+
+    def test_exhaustive(self):
+        for fw in range(1, 7):
+            cc = NRDivPipeCoreConfig(8, fw)
+            self.handle_cases(cc, get_test_cases(cc, all_ints=True))
+
+    def test_random(self):
+        for bw, fw in ((16, 12), (32, 25), (64, 54)):
+            cc = NRDivPipeCoreConfig(bw, fw)
+            self.handle_cases(cc, random_test_cases(cc, 500))
+
+
+class TestNRDivPipeCore(unittest.TestCase):
+    def handle_config(self, core_config, test_cases=None):
+        if test_cases is None:
+            test_cases = get_test_cases(core_config)
+        test_cases = list(test_cases)
+        dut = NRDivPipeCoreTestPipeline(core_config)
+        sim = Simulator(dut)
+
+        def process():
+            for test_case in test_cases:
+                yield dut.i.dividend.eq(test_case.dividend)
+                yield dut.i.divisor_radicand.eq(test_case.divisor_radicand)
+                yield dut.i.operation.eq(int(test_case.core_op))
+                yield Delay(1e-6)
+                quotient_root = (yield dut.o.quotient_root)
+                remainder = (yield dut.o.remainder)
+                self.assertEqual(quotient_root, test_case.quotient_root,
+                                 str(test_case))
+                self.assertEqual(remainder, test_case.remainder,
+                                 str(test_case))
+        sim.add_process(process)
+        sim.run()
+
+    def test_bit_width_8_fract_width_4(self):
+        self.handle_config(NRDivPipeCoreConfig(8, 4))
+
+    def test_bit_width_16_fract_width_12(self):
+        self.handle_config(NRDivPipeCoreConfig(16, 12))
+
+    def test_bit_width_16_fract_width_12_div_only(self):
+        supported = (DP.UDivRem,)
+        self.handle_config(NRDivPipeCoreConfig(16, 12, supported))
+
+    def test_bit_width_16_fract_width_12_rsqrt_only(self):
+        supported = (DP.RSqrtRem,)
+        self.handle_config(NRDivPipeCoreConfig(16, 12, supported))
+
+    def test_bit_width_64_fract_width_54(self):
+        cc = NRDivPipeCoreConfig(64, 54)
+        self.handle_config(cc, random_test_cases(cc, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# See Notices.txt for copyright information
+
+from ieee754.div_rem_sqrt_rsqrt.srt import (SRTDivPipeCoreConfig,
+                    SRTDivPipeCoreSetupStage, SRTDivPipeCoreCalculateStage,
+                    SRTDivPipeCoreFinalStage, SRTDivPipeCoreInterstageData,
+                    div_table, sqrt_table, select_digit, srt_div_sqrt,
+                    SQRT_SHARED_FROM)
+from ieee754.div_rem_sqrt_rsqrt.core import (DivPipeCoreOperation,
+                    DivPipeCoreInputData, DivPipeCoreOutputData)
+from ieee754.div_rem_sqrt_rsqrt.algorithm import Operation
+from ieee754.div_rem_sqrt_rsqrt.test_core import (generate_test_case,
+                                                  shifted_ints)
+import unittest
+import random
+from nmigen import Module, Elaboratable
+from nmigen.back.pysim import Simulator, Delay
+
+
+def get_test_cases(core_config, all_ints=False):
+    """ test cases with normalised divisors and radicands, from the
+        restoring algorithm
+    """
+    fw = core_config.fract_width
+    if all_ints:
+        ints = range
+    else:
+        def ints(lo, hi):
+            return [n for n in shifted_ints(hi.bit_length(), 4)
+                    if lo <= n < hi]
+    for alg_op in (Operation.SqrtRem, Operation.UDivRem):
+        if alg_op is Operation.UDivRem:
+            if DivPipeCoreOperation.UDivRem not in core_config.supported:
+                continue
+            for dividend in ints(0, 2 << (2 * fw)):
+                for divisor in ints(1 << fw, 2 << fw):
+                    yield from generate_test_case(core_config, dividend,
+                                                  divisor, alg_op)
+        else:
+            if DivPipeCoreOperation.SqrtRem not in core_config.supported:
+                continue
+            for radicand in ints(1 << fw, 4 << fw):
+                yield from generate_test_case(core_config, 0,
+                                              radicand, alg_op)
+
+
+def random_test_cases(core_config, count, seed=1):
+    fw = core_config.fract_width
+    rand = random.Random(seed)
+    for _ in range(count):
+        divisor = rand.randrange(1 << fw, 2 << fw)
+        dividend = rand.randrange(0, 2 << (2 * fw))
+        yield from generate_test_case(core_config, dividend, divisor,
+                                      Operation.UDivRem)
+        radicand = rand.randrange(1 << fw, 4 << fw)
+        yield from generate_test_case(core_config, 0, radicand,
+                                      Operation.SqrtRem)
+
+
+class SRTDivPipeCoreTestPipeline(Elaboratable):
+    def __init__(self, core_config):
+        self.setup_stage = SRTDivPipeCoreSetupStage(core_config)
+        self.calculate_stages = [
+            SRTDivPipeCoreCalculateStage(core_config, stage_index)
+            for stage_index in range(core_config.n_stages)]
+        self.final_stage = SRTDivPipeCoreFinalStage(core_config)
+        self.interstage_signals = [
+            SRTDivPipeCoreInterstageData(core_config, reset_less=True)
+            for i in range(core_config.n_stages + 1)]
+        self.i = DivPipeCoreInputData(core_config, reset_less=True)
+        self.o = DivPipeCoreOutputData(core_config, reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        stages = [self.setup_stage, *self.calculate_stages, self.final_stage]
+        stage_inputs = [self.i, *self.interstage_signals]
+        stage_outputs = [*self.interstage_signals, self.o]
+        for stage, input, output in zip(stages, stage_inputs, stage_outputs):
+            stage.setup(m, input)
+            m.d.comb += output.eq(stage.process(input))
+        return m
+
+
+class TestSRTTables(unittest.TestCase):
+    def check_table(self, table):
+        for thresholds in table.values():
+            self.assertEqual(len(thresholds), 4)
+            self.assertEqual(list(thresholds), sorted(thresholds))
+
+    def test_div(self):
+        table = div_table()
+        self.assertEqual(sorted(table), list(range(8, 16)))
+        self.check_table(table)
+        # d = 1/2: the published constants (Ercegovac and Lang, table 5.4)
+        self.assertEqual(table[8], (-13, -4, 4, 12))
+        self.assertEqual(select_digit(table[8], 0), 0)
+        self.assertEqual(select_digit(table[8], 12), 2)
+        self.assertEqual(select_digit(table[8], -14), -2)
+
+    def test_sqrt(self):
+        for a in (2, 3):
+            for j in range(SQRT_SHARED_FROM + 2):
+                self.check_table(sqrt_table(a, j))
+            self.assertIs(sqrt_table(a, SQRT_SHARED_FROM + 1),
+                          sqrt_table(a, SQRT_SHARED_FROM))
+            # the first root digit is never 0
+            first = sqrt_table(a, 0)[0]
+            self.assertGreaterEqual(select_digit(first, -64), 1)
+
+
+class TestSRTConfig(unittest.TestCase):
+    def test_config(self):
+        cc = SRTDivPipeCoreConfig(32, 25)
+        self.assertEqual(cc.n_stages, 14)
+        self.assertEqual(cc.quotient_width, 28)
+        self.assertEqual(cc.sqrt_scale, 3)
+        self.assertEqual(SRTDivPipeCoreConfig(32, 24).sqrt_scale, 2)
+        self.assertEqual(cc.supported, frozenset((DivPipeCoreOperation.UDivRem,
+                                        DivPipeCoreOperation.SqrtRem)))
+        with self.assertRaises(ValueError):
+            SRTDivPipeCoreConfig(32, 25, (DivPipeCoreOperation.RSqrtRem,))
+
+
+class TestSRTModel(unittest.TestCase):
+    """ the python model against the restoring algorithm """
+
+    def handle_cases(self, core_config, test_cases):
+        for test_case in test_cases:
+            result = srt_div_sqrt(core_config,
+                                  test_case.dividend,
+                                  test_case.divisor_radicand,
+                                  test_case.core_op)
+            self.assertEqual(result, (test_case.quotient_root,
+                                      test_case.remainder), str(test_case))
+
+    def test_exhaustive(self):
+        for fw in range(1, 6):
+            cc = SRTDivPipeCoreConfig(8, fw)
+            self.handle_cases(cc, get_test_cases(cc, all_ints=True))
+
+    def test_random(self):
+        for bw, fw in ((32, 24), (32, 25), (64, 54), (64, 55)):
+            cc = SRTDivPipeCoreConfig(bw, fw)
+            self.handle_cases(cc, random_test_cases(cc, 500))
+
+
+class TestSRTDivPipeCore(unittest.TestCase):
+    def handle_config(self, core_config, test_cases=None):
+        if test_cases is None:
+            test_cases = get_test_cases(core_config)
+        test_cases = list(test_cases)
+        dut = SRTDivPipeCoreTestPipeline(core_config)
+        sim = Simulator(dut)
+
+        def process():
+            for test_case in test_cases:
+                yield dut.i.dividend.eq(test_case.dividend)
+                yield dut.i.divisor_radicand.eq(test_case.divisor_radicand)
+                yield dut.i.operation.eq(int(test_case.core_op))
+                yield Delay(1e-6)
+                quotient_root = (yield dut.o.quotient_root)
+                remainder = (yield dut.o.remainder)
+                self.assertEqual(quotient_root, test_case.quotient_root,
+                                 str(test_case))
+                self.assertEqual(remainder, test_case.remainder,
+                                 str(test_case))
+        sim.add_process(process)
+        sim.run()
+
+    def test_bit_width_8_fract_width_4(self):
+        self.handle_config(SRTDivPipeCoreConfig(8, 4))
+
+    def test_bit_width_8_fract_width_5(self):
+        self.handle_config(SRTDivPipeCoreConfig(8, 5))
+
+    def test_bit_width_8_fract_width_4_div_only(self):
+        supported = (DivPipeCoreOperation.UDivRem,)
+        self.handle_config(SRTDivPipeCoreConfig(8, 4, supported))
+
+    def test_bit_width_8_fract_width_5_sqrt_only(self):
+        supported = (DivPipeCoreOperation.SqrtRem,)
+        self.handle_config(SRTDivPipeCoreConfig(8, 5, supported))
+
+    def test_bit_width_32_fract_width_25(self):
+        cc = SRTDivPipeCoreConfig(32, 25)
+        self.handle_config(cc, random_test_cases(cc, 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from ieee754.fpcommon.test.fpmux import runfp
 from ieee754.fpcommon.test.case_gen import run_pipe_fp
 from ieee754.fpcommon.test import unit_test_half
 from ieee754.fpcommon.fpbase import FPFormat
+from ieee754.fpcommon.test.golden import fclass as np_fclass
 
 import unittest
 
@@ -53,6 +54,7 @@ def fclass(wid, x):
 
 def fclass_16(x):
     return fclass(16, x)
+fclass_16.np_op = np_fclass # batch reference (see golden.py)
 
 
 def fclass_32(x):
@@ -84,7 +86,7 @@ class TestFClassPipeCoverage(unittest.TestCase):
     def test_pipe_class_f16(self):
         dut = FPClassMuxInOut(16, 16, 4, op_wid=1)
         run_pipe_fp(dut, 16, "fclass16", unit_test_half, Float16, None,
-                    fclass_16, 100, single_op=True)
+                    fclass_16, 100, single_op=True, exhaustive=True)
 
     def test_pipe_class_f32(self):
         dut = FPClassMuxInOut(32, 32, 4, op_wid=1)
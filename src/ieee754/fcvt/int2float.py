@@ -118,18 +118,18 @@ class FPCVTIntToFloatMod(PipeModBase):
             comb += self.o.of.sticky.eq(msb.m_out[:1].bool())
             comb += self.o.of.m0.eq(msb.m_out[3])
 
-        a_nonzero = Signal(reset_less=True)
-        comb += a_nonzero.eq(~a.bool())
+        a_zero = Signal(reset_less=True)
+        comb += a_zero.eq(~a.bool())
 
         # prepare zero
         z_zero = FPNumBaseRecord(z1.width, False, name="z_zero")
         comb += z_zero.zero(0)
 
         # special cases?
-        comb += self.o.out_do_z.eq(a_nonzero)
+        comb += self.o.out_do_z.eq(a_zero)
 
         # detect zero
-        comb += self.o.oz.eq(Mux(a_nonzero, z1.v, z_zero.v))
+        comb += self.o.oz.eq(Mux(a_zero, z_zero.v, z1.v))
 
         # copy the context (muxid, operator)
         comb += self.o.ctx.eq(self.i.ctx)
@@ -3,6 +3,9 @@
 
 from ieee754.fcvt.pipeline import (FPCVTF2IntMuxInOut,)
 from ieee754.fpcommon.test.fpmux import (runfp, create_random)
+from ieee754.fpcommon.test.case_gen import run_pipe_fp
+from ieee754.fpcommon.test import unit_test_half
+from ieee754.fpcommon.test.golden import f2int_op
 from ieee754.fcvt.test.rangelimited import create_int
 
 import sfpy
@@ -46,6 +49,7 @@ def fcvt_f16_ui32(x):
 
 def fcvt_f16_ui16(x):
     return sfpy.float.f16_to_ui32(x) & 0xffff
+fcvt_f16_ui16.np_op = f2int_op(16, False) # batch reference (see golden.py)
 
 def fcvt_f16_i16(x):
     x = sfpy.float.f16_to_i32(x)
@@ -54,6 +58,7 @@ def fcvt_f16_i16(x):
     if x <= -0x8000:
         return 0x8000
     return x & 0xffff
+fcvt_f16_i16.np_op = f2int_op(16, True) # batch reference (see golden.py)
 
 def fcvt_f64_i16(x):
     x = sfpy.float.f64_to_i32(x)
@@ -129,8 +134,8 @@ def test_int_pipe_f32_i32():
 
 def test_int_pipe_f16_i16():
     dut = FPCVTF2IntMuxInOut(16, 16, 4, op_wid=1)
-    runfp(dut, 16, "test_fcvt_f2int_pipe_f16_i16", Float16, fcvt_f16_i16,
-                True, n_vals=100, opcode=0x1)
+    run_pipe_fp(dut, 16, "f2int_f16_i16", unit_test_half, Float16, None,
+                fcvt_f16_i16, 100, True, opcode=0x1, exhaustive=True)
 
 ######################
 # fp to unsigned int 
@@ -140,8 +145,8 @@ def test_int_pipe_f16_ui16():
     # XXX softfloat-3 doesn't have ui16_to_xxx so use ui32 instead.
     # should be fine.
     dut = FPCVTF2IntMuxInOut(16, 16, 4, op_wid=1)
-    runfp(dut, 16, "test_fcvt_f2int_pipe_f16_ui16", Float16, fcvt_f16_ui16,
-                True, n_vals=100)
+    run_pipe_fp(dut, 16, "f2int_f16_ui16", unit_test_half, Float16, None,
+                fcvt_f16_ui16, 100, True, exhaustive=True)
 
 def test_int_pipe_ui16_f64():
     dut = FPCVTIntMuxInOut(16, 64, 4, op_wid=1)
@@ -8,7 +8,7 @@
 from ieee754.fcvt.pipeline import (FPCVTIntMuxInOut,)
 from ieee754.fpcommon.test.case_gen import run_pipe_fp
 from ieee754.fpcommon.test import unit_test_half
-from ieee754.fcvt.test.up_fcvt_data_16_32 import regressions
+from ieee754.fpcommon.test.golden import int2f_op
 
 import sfpy
 from sfpy import Float64, Float32, Float16
@@ -24,11 +24,12 @@ def fcvt_64(x):
 
 def fcvt_32(x):
     return sfpy.float.ui32_to_f32(x)
+fcvt_32.np_op = int2f_op(32, False) # batch reference (see golden.py)
 
 def test_int_pipe_fp16_32():
-    dut = FPCVTIntMuxInOut(16, 32, 4)
+    dut = FPCVTIntMuxInOut(16, 32, 4, op_wid=1)
     run_pipe_fp(dut, 16, "int_16_32", unit_test_half, to_uint16,
-                regressions, fcvt_32, 100, True)
+                None, fcvt_32, 100, True, exhaustive=True)
 
 if __name__ == '__main__':
     for i in range(200):
@@ -1,4 +0,0 @@
-def regressions():
-    yield 0x110,
-    yield 0x7e83,
-    yield 0xaf47,
@@ -12,6 +12,7 @@ from nmutil.pipemodbase import PipeModBase
 from ieee754.fpcommon.denorm import FPSCData
 from ieee754.fpcommon.getop import FPPipeContext
 from ieee754.fpadd.datastruct import FPAddStage0Data
+from ieee754.fpadd.lza import FPAddLZA
 
 
 class FPAddStage0Mod(PipeModBase):
@@ -56,6 +57,15 @@ class FPAddStage0Mod(PipeModBase):
         comb += self.o.z.s.eq(Mux(sm, a.s, b.s))              # sign swap
         comb += self.o.tot.eq(Mux(seq, op1 + op2, op1 - op2)) # mantissa +/-
 
+        # leading-zero anticipation, in parallel with the add.  only
+        # subtraction can cancel leading bits: for add the MSB is known.
+        if self.pspec.lza:
+            m.submodules.lza = lza = FPAddLZA(len(a.m))
+            comb += [lza.op1.eq(op1),
+                     lza.op2.eq(op2),
+                     self.o.lzc.eq(Mux(seq, 0, lza.lzc)),
+                    ]
+
         # pass-through context
         comb += self.o.oz.eq(self.i.oz)
         comb += self.o.out_do_z.eq(self.i.out_do_z)
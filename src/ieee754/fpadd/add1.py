@@ -60,6 +60,11 @@ class FPAddStage1Mod(PipeModBase):
             self.o.of.sticky.eq(Mux(msb, to[1] | tot[0], to[1]))
         ]
 
+        # pass through leading-zero anticipation: not shifted, the count
+        # is the same for tot and for (s/r/g/m) when the MSB is not set
+        if self.pspec.lza:
+            comb += self.o.lzc.eq(self.i.lzc)
+
         comb += self.o.out_do_z.eq(self.i.out_do_z)
         comb += self.o.oz.eq(self.i.oz)
         comb += self.o.ctx.eq(self.i.ctx)
@@ -20,7 +20,15 @@ class FPAddStage0Data:
         self.tot = Signal(self.z.m_width + 4, reset_less=True) # 4 extra bits
         self.ctx = FPPipeContext(pspec)
         self.muxid = self.ctx.muxid
+        # leading-zero anticipator count (see fpadd/lza.py)
+        self.lza = pspec.lza
+        if self.lza:
+            lzc_width = (self.z.m_width + 3).bit_length() # +3: g/r/s
+            self.lzc = Signal(lzc_width, reset_less=True)
 
     def eq(self, i):
-        return [self.z.eq(i.z), self.out_do_z.eq(i.out_do_z), self.oz.eq(i.oz),
+        ret = [self.z.eq(i.z), self.out_do_z.eq(i.out_do_z), self.oz.eq(i.oz),
                 self.tot.eq(i.tot), self.ctx.eq(i.ctx)]
+        if self.lza:
+            ret.append(self.lzc.eq(i.lzc))
+        return ret
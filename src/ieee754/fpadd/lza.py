@@ -0,0 +1,65 @@
+"""IEEE754 Floating Point Adder: Leading-Zero Anticipator (LZA)
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+predicts the number of leading zeros of (op1 - op2), where op1 >= op2,
+directly from the two operands, in parallel with the subtraction itself.
+post-normalisation can then start the shift as soon as the sum is ready,
+rather than having to wait for count-leading-zeros on the sum.
+
+the prediction is either exact or *one short*: the normalisation
+must check the MSB after shifting and do a final 1-bit correction
+(see FPMSBHighLZA).
+
+how it works: take each digit w_i = op1_i - op2_i (one of -1, 0, 1).
+the (positive) result looks like 0...0 1 -1 -1 ... -1 x ... where the
+"1 -1 -1 ... -1" run telescopes to a single 1 at the *end* of the run.
+the indicator string:
+
+    f_i = (w_i != 0) & (w_(i-1) != -1)
+
+has its leading one exactly at that position q.  the digit below q is
+0 or +1, so the actual leading one of the result is at q or q-1.
+"""
+
+from nmigen import Module, Signal, Cat, Elaboratable
+from ieee754.fpcommon.clz import CLZ
+
+
+class FPAddLZA(Elaboratable):
+    """ leading-zero anticipator for op1 - op2 (op1 >= op2, unsigned)
+
+        * op1, op2: the (aligned, swapped) mantissas, width m_width
+        * lzc: predicted count of leading zeros of (op1 - op2),
+               either exact or one less than the actual count.
+    """
+
+    def __init__(self, m_width):
+        self.m_width = m_width
+        self.op1 = Signal(m_width, reset_less=True)
+        self.op2 = Signal(m_width, reset_less=True)
+        self.lzc = Signal(m_width.bit_length(), reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        mwid = self.m_width
+        m.submodules.clz = clz = CLZ(mwid)
+
+        # digit w_i is non-zero / is -1
+        nz = Signal(mwid, reset_less=True)
+        neg = Signal(mwid, reset_less=True)
+        f = Signal(mwid, reset_less=True)
+        comb += [nz.eq(self.op1 ^ self.op2),
+                 neg.eq(~self.op1 & self.op2),
+                 # indicator string: w_(-1) is taken as zero
+                 f.eq(nz & ~Cat(0, neg[:-1])),
+                ]
+
+        # count leading zeros of the indicator
+        comb += [clz.sig_in.eq(f),
+                 self.lzc.eq(clz.lz),
+                ]
+
+        return m
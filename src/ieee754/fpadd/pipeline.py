@@ -30,37 +30,113 @@ normpack  - FPNormToPack           ispec FPPostCalcData
                             CorrectionsMod,
                             PackMod
 
-This pipeline has a 3 clock latency, and, with the separation into
-separate "modules", it is quite clear how to create longer-latency
-pipelines (if needed) - just create a new, longer top-level (FPADDBasePipe
-alternative) and construct shorter pipe stages using the building blocks,
-RoundMod, FPAddStage0Mod etc.
+addalign can instead be FPAddDualPath (set PipelineSpec.dual_path):
+
+addalign  - FPAddDualPath          ispec FPSCData
+--------                           ospec FPPostCalcData
+
+                StageChain: FPAddDualPathMod (near and far paths in
+                            parallel: far is a full align, add and a
+                            1-bit normalise, near is a 1-bit align,
+                            subtract and full normalise)
+
+and normpack then has FPNorm1ModBit (1-bit shifts only) instead of the
+full Norm1ModSingle.
+
+setting PipelineSpec.early_out lets NaN / Inf / zero results (out_do_z)
+leave after scnorm, through a bypass stage: see fpcommon/bypass.py.
+
+setting PipelineSpec.lza adds a leading-zero anticipator (FPAddLZA) to
+FPAddStage0Mod.  the predicted count travels with the data and
+Norm1ModSingle uses it (FPMSBHighLZA) instead of counting leading zeros
+on the mantissa sum.
+
+This pipeline has a 3 clock latency by default.  the number of stages may
+instead be set with PipelineSpec.stage_splits: the same building blocks
+(listed below, in order) are regrouped into one registered PipeModChain
+per group, split at the given indices.  for example [2, 5] is the default
+3-stage grouping, [2] puts everything after scnorm into a single stage,
+and [1, 2, 4, 5, 7] gives a 6-stage pipeline.
+
+    0 FPAddSpecialCasesMod      4 FPAddStage1Mod       7 FPCorrectionsMod
+    1 FPAddDeNormMod            5 FPNorm1ModSingle     8 FPPackMod
+    2 FPAddAlignSingleMod       6 FPRoundMod
+    3 FPAddStage0Mod
+
+with dual_path it is instead:
+
+    0 FPAddSpecialCasesMod      3 FPNorm1ModBit        6 FPPackMod
+    1 FPAddDeNormMod            4 FPRoundMod
+    2 FPAddDualPathMod          5 FPCorrectionsMod
+
+so the default grouping there is [2, 3].  with compound_round, the
+rounding and corrections are the one FPCompoundRoundMod, so FPPackMod
+is one less (7, or 5 with dual_path).
 
 """
 
 from nmutil.singlepipe import ControlBase
 from nmutil.concurrentunit import ReservationStations, num_bits
 
-from ieee754.fpcommon.normtopack import FPNormToPack
-from ieee754.fpadd.specialcases import FPAddSpecialCasesDeNorm
+from ieee754.fpcommon.normtopack import FPNormToPack, normtopack_mods
+from ieee754.fpcommon.denorm import FPAddDeNormMod
+from ieee754.fpadd.specialcases import (FPAddSpecialCasesDeNorm,
+                                        FPAddSpecialCasesMod)
 from ieee754.fpadd.addstages import FPAddAlignSingleAdd
+from ieee754.fpadd.align import FPAddAlignSingleMod
+from ieee754.fpadd.add0 import FPAddStage0Mod
+from ieee754.fpadd.add1 import FPAddStage1Mod
+from ieee754.fpadd.dualpath import FPAddDualPath, FPAddDualPathMod
 from ieee754.pipeline import PipelineSpec
+from ieee754.fpcommon.modchain import split_pipe_mods
+from ieee754.fpcommon.bypass import connect_early_out
+
+
+def get_add_mods(pspec):
+    """ the (flat) list of FPADD modules, for regrouping by stage_splits
+    """
+    mods = [FPAddSpecialCasesMod(pspec),
+            FPAddDeNormMod(pspec, True)]
+    if pspec.dual_path:
+        mods.append(FPAddDualPathMod(pspec))
+    else:
+        mods += [FPAddAlignSingleMod(pspec),
+                 FPAddStage0Mod(pspec),
+                 FPAddStage1Mod(pspec)]
+    mods += normtopack_mods(pspec)
+    return mods
 
 
 class FPADDBasePipe(ControlBase):
     def __init__(self, pspec):
         ControlBase.__init__(self)
+        if pspec.stage_splits is not None:
+            self.pipechain = split_pipe_mods(pspec, get_add_mods(pspec))
+            self._eqs = connect_early_out(self, pspec, self.pipechain)
+            return
+
+        self.pipechain = None
         self.pipe1 = FPAddSpecialCasesDeNorm(pspec)
-        self.pipe2 = FPAddAlignSingleAdd(pspec)
+        if pspec.dual_path:
+            self.pipe2 = FPAddDualPath(pspec)
+        else:
+            self.pipe2 = FPAddAlignSingleAdd(pspec)
         self.pipe3 = FPNormToPack(pspec)
 
-        self._eqs = self.connect([self.pipe1, self.pipe2, self.pipe3])
+        pipechain = [self.pipe1, self.pipe2, self.pipe3]
+        self._eqs = connect_early_out(self, pspec, pipechain)
 
     def elaborate(self, platform):
         m = ControlBase.elaborate(self, platform)
-        m.submodules.scnorm = self.pipe1
-        m.submodules.addalign = self.pipe2
-        m.submodules.normpack = self.pipe3
+        if self.early_out is not None:
+            self.early_out.elaborate(m)
+        if self.pipechain is not None:
+            for i, p in enumerate(self.pipechain):
+                setattr(m.submodules, "stage%d" % i, p)
+        else:
+            m.submodules.scnorm = self.pipe1
+            m.submodules.addalign = self.pipe2
+            m.submodules.normpack = self.pipe3
         m.d.comb += self._eqs
         return m
 
@@ -73,11 +149,26 @@ class FPADDMuxInOut(ReservationStations):
         * fan-out on outputs (an array of FPPackData: z,mid)
 
         Fan-in and Fan-out are combinatorial.
+
+        :dual_path: - use the near/far dual-path adder (FPAddDualPath)
+                      instead of the single-path FPAddAlignSingleAdd
+        :lza:       - use leading-zero anticipation for normalisation
+        :stage_splits: - None for the default 3 stages, or a list of
+                      split points (see get_add_mods) giving the stages
+        :compound_round: - round with FPCompoundRoundMod (see normtopack)
+        :early_out: - special-case results bypass the pipeline (see bypass)
     """
 
-    def __init__(self, width, num_rows, op_wid=None):
+    def __init__(self, width, num_rows, op_wid=None, dual_path=False,
+                       lza=False, stage_splits=None, compound_round=False,
+                       early_out=False):
         self.id_wid = num_bits(num_rows)
         self.op_wid = op_wid
         self.pspec = PipelineSpec(width, self.id_wid, op_wid)
+        self.pspec.dual_path = dual_path
+        self.pspec.lza = lza
+        self.pspec.stage_splits = stage_splits
+        self.pspec.compound_round = compound_round
+        self.pspec.early_out = early_out
         self.alu = FPADDBasePipe(self.pspec)
         ReservationStations.__init__(self, num_rows)
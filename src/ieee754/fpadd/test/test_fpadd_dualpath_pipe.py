@@ -0,0 +1,43 @@
+""" test of FPADDMuxInOut with the near/far dual-path adder
+"""
+
+from ieee754.fpadd.pipeline import (FPADDMuxInOut,)
+from ieee754.fpcommon.test.case_gen import run_pipe_fp
+from ieee754.fpcommon.test import unit_test_half
+from ieee754.fpcommon.test import unit_test_single
+from ieee754.fpcommon.test import unit_test_double
+from ieee754.fpadd.test.add_data16 import regressions as regressions16
+from ieee754.fpadd.test.add_data32 import regressions as regressions32
+from ieee754.fpadd.test.add_data64 import regressions as regressions64
+
+from sfpy import Float64, Float32, Float16
+from operator import add
+
+
+def test_pipe_dualpath_fp16():
+    dut = FPADDMuxInOut(16, 4, dual_path=True)
+    run_pipe_fp(dut, 16, "add_dualpath", unit_test_half, Float16,
+                   regressions16, add, 10)
+
+def test_pipe_dualpath_fp32():
+    dut = FPADDMuxInOut(32, 4, dual_path=True)
+    run_pipe_fp(dut, 32, "add_dualpath", unit_test_single, Float32,
+                   regressions32, add, 10)
+
+def test_pipe_dualpath_fp64():
+    dut = FPADDMuxInOut(64, 4, dual_path=True)
+    run_pipe_fp(dut, 64, "add_dualpath", unit_test_double, Float64,
+                   regressions64, add, 10)
+
+def test_pipe_dualpath_1stage_fp32():
+    # dual-path add and FPNorm1ModBit in the one stage
+    dut = FPADDMuxInOut(32, 4, dual_path=True, stage_splits=[2])
+    run_pipe_fp(dut, 32, "add_dualpath_1stage", unit_test_single, Float32,
+                   regressions32, add, 10)
+
+
+if __name__ == '__main__':
+    test_pipe_dualpath_fp16()
+    test_pipe_dualpath_fp32()
+    test_pipe_dualpath_fp64()
+    test_pipe_dualpath_1stage_fp32()
@@ -0,0 +1,47 @@
+""" test of FPADDMuxInOut with the special-case bypass (early_out)
+"""
+
+from ieee754.fpadd.pipeline import (FPADDMuxInOut,)
+from ieee754.fpcommon.test.case_gen import run_pipe_fp
+from ieee754.fpcommon.test import unit_test_half
+from ieee754.fpcommon.test import unit_test_single
+from ieee754.fpadd.test.add_data16 import regressions as regressions16
+from ieee754.fpadd.test.add_data32 import regressions as regressions32
+
+from sfpy import Float32, Float16
+from operator import add
+
+
+def test_pipe_early_out_fp16():
+    dut = FPADDMuxInOut(16, 4, early_out=True)
+    run_pipe_fp(dut, 16, "add_early_out", unit_test_half, Float16,
+                   regressions16, add, 10)
+
+def test_pipe_early_out_5stage_fp32():
+    dut = FPADDMuxInOut(32, 4, early_out=True, stage_splits=[2, 3, 5, 7])
+    run_pipe_fp(dut, 32, "add_early_out_5stage", unit_test_single, Float32,
+                   regressions32, add, 10)
+
+def run_early_out_split(name, stage_splits, dual_path=False):
+    # the bypass is taken after the first stage, however far it goes
+    dut = FPADDMuxInOut(16, 4, early_out=True, dual_path=dual_path,
+                        stage_splits=stage_splits)
+    run_pipe_fp(dut, 16, name, unit_test_half, Float16,
+                   regressions16, add, 10)
+
+def test_pipe_early_out_split_add0_fp16():
+    run_early_out_split("add_early_out_split4", [4])
+
+def test_pipe_early_out_split_add1_fp16():
+    run_early_out_split("add_early_out_split5", [5])
+
+def test_pipe_early_out_split_dual_path_fp16():
+    run_early_out_split("add_early_out_dual_split3", [3], dual_path=True)
+
+
+if __name__ == '__main__':
+    test_pipe_early_out_fp16()
+    test_pipe_early_out_5stage_fp32()
+    test_pipe_early_out_split_add0_fp16()
+    test_pipe_early_out_split_add1_fp16()
+    test_pipe_early_out_split_dual_path_fp16()
@@ -0,0 +1,246 @@
+"""IEEE754 Floating Point: early-completion bypass for special-case results
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+the special-cases modules (FPAddSpecialCasesMod, FPMulSpecialCasesMod,
+FPDIVSpecialCasesMod) already have the final answer for NaN / Inf / zero
+by the end of the first pipe stage: oz, with out_do_z set.  normally that
+still goes through every other stage (doing nothing).  with
+PipelineSpec.early_out, out_do_z results instead leave the pipeline just
+after the first stage and come back in at the end:
+
+                   +--> [stage 2 ... stage N] --+
+    [scnorm] --> split                        merge --> (fan-out, muxid)
+                   +--> [bypass]  -------------+
+
+* split  - FPBypassSplit, a 2-way split routing on out_do_z.  the
+           result does not go into stage 2, so that slot is free.
+* bypass - FPBypass, converting the first stage's output (oz) to
+           FPPackData, into a queue (registered: one clock, when empty)
+* merge  - FPBypassMerge, a 2-way priority merge.  the main pipeline
+           output has priority, so it is never held up by the bypass.
+
+the bypass results therefore wait, in the queue, while the main pipeline
+has results.  that is also why the bypass is not a pspec.pipekls pipe:
+FPDIV's MaskCancellable pipes cannot be stalled (they do not keep the
+mask of a result they are holding, so it is lost), and nor can the split
+be, as the first stage is one of those too.  so the queue keeps the mask
+with each result, and is deep enough never to fill: taking at most one
+operation per clock, no more results can be waiting in it than there are
+stages in the main pipeline (one more, for its own register).
+
+the first stage's output is usually FPSCData, but with stage_splits it
+may end further on (FPAddStage0Data, FPPostCalcData...).  every one of
+those carries out_do_z and oz through, so the split and the bypass just
+take whatever the first stage's ospec is.
+
+the muxid travels in the context as usual: results come out of order,
+but the ReservationStations fan-out routes on muxid anyway.
+"""
+
+from nmigen import Module, Signal, Cat, Mux
+
+from nmutil.pipemodbase import PipeModBase
+from nmutil.singlepipe import ControlBase
+from nmutil.multipipe import MultiInControlBase, MultiOutControlBase
+from nmutil.queue import Queue
+from ieee754.fpcommon.packdata import FPPackData
+
+
+class FPBypassMod(PipeModBase):
+    """ packs the special-case result: z is just oz
+    """
+
+    def __init__(self, pspec, front):
+        self.front = front
+        super().__init__(pspec, "bypass")
+
+    def ispec(self):
+        return self.front.ospec()
+
+    def ospec(self):
+        return FPPackData(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        comb += self.o.z.eq(self.i.oz)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
+
+
+class FPBypass(ControlBase):
+    """ FPBypassMod, then a queue of depth results (with their masks)
+
+        the queue is never full (see above) when depth is the number of
+        main pipeline stages plus one.
+    """
+
+    def __init__(self, pspec, front, depth):
+        self.depth = depth
+        maskwid = getattr(pspec, "maskwid", 0)
+        super().__init__(FPBypassMod(pspec, front), maskwid=maskwid)
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        comb = m.d.comb
+
+        p, n = self.p, self.n
+        data = Cat(*self.process(p.data_i)) # FPPackData is flat
+        m.submodules.queue = queue = Queue(len(data) + p.maskwid,
+                                           self.depth, fwft=False)
+
+        comb += [p._ready_o.eq(queue.w_rdy),
+                 n.valid_o.eq(queue.r_rdy),
+                 queue.r_en.eq(n.ready_i_test),
+                 Cat(*n.data_o).eq(queue.r_data[:len(data)]),
+                ]
+        if p.maskwid:
+            # only the uncancelled mask bits go in (as in MaskCancellable)
+            mask = Signal(p.maskwid, reset_less=True)
+            comb += [mask.eq(p.mask_i & ~p.stop_i),
+                     queue.w_en.eq(p.valid_i_test & mask.bool()),
+                     queue.w_data.eq(Cat(data, mask)),
+                     n.mask_o.eq(queue.r_data[len(data):]),
+                     n.stop_o.eq(p.stop_i),
+                    ]
+        else:
+            comb += [queue.w_en.eq(p.valid_i_test),
+                     queue.w_data.eq(data),
+                    ]
+
+        return m
+
+
+class FPBypassSplit(MultiOutControlBase):
+    """ out_do_z == 0 goes to n[0] (the pipeline), 1 to n[1] (the bypass)
+
+        (CombMuxOutPipe would do, except that its ArrayProxy output
+         only works on "flat" data, like FPPackData, and FPSCData isn't.
+         it's also only a 2-way split, so this is much simpler)
+    """
+
+    def __init__(self, pspec, front):
+        self.maskwid = maskwid = getattr(pspec, "maskwid", 0)
+        super().__init__(n_len=2, maskwid=maskwid, routemask=True)
+        self.p.data_i = front.ospec()
+        for n in self.n:
+            n.data_o = front.ospec()
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        comb = m.d.comb
+
+        p = self.p
+        n0, n1 = self.n
+        sel = p.data_i.out_do_z
+        comb += [n0.valid_o.eq(p.valid_i & ~sel),
+                 n1.valid_o.eq(p.valid_i & sel),
+                 p.ready_o.eq(Mux(sel, n1.ready_i, n0.ready_i)),
+                ]
+        for n in self.n:
+            comb += n.data_o.eq(p.data_i)
+            if self.maskwid:
+                comb += n.stop_o.eq(p.stop_i)
+                comb += n.mask_o.eq(Mux(n.valid_o, p.mask_i, 0))
+
+        return m
+
+
+class FPBypassMerge(MultiInControlBase):
+    """ p[0] is the pipeline output (priority), p[1] the bypass
+
+        p[1] only gets through when p[0] is not valid, so the pipeline
+        output never has to wait.
+    """
+
+    def __init__(self, pspec):
+        self.maskwid = maskwid = getattr(pspec, "maskwid", 0)
+        super().__init__(p_len=2, maskwid=maskwid, routemask=True)
+        for p in self.p:
+            p.data_i = FPPackData(pspec)
+        self.n.data_o = FPPackData(pspec)
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        comb = m.d.comb
+
+        n = self.n
+        p0, p1 = self.p
+        comb += [n.valid_o.eq(p0.valid_i | p1.valid_i),
+                 p0.ready_o.eq(n.ready_i),
+                 p1.ready_o.eq(n.ready_i & ~p0.valid_i),
+                ]
+        with m.If(p0.valid_i):
+            comb += n.data_o.eq(p0.data_i)
+            if self.maskwid:
+                comb += [n.mask_o.eq(p0.mask_i), n.stop_o.eq(p0.stop_i)]
+        with m.Else():
+            comb += n.data_o.eq(p1.data_i)
+            if self.maskwid:
+                comb += [n.mask_o.eq(p1.mask_i), n.stop_o.eq(p1.stop_i)]
+
+        return m
+
+
+class FPEarlyOut:
+    """ the split, bypass and merge around a pipechain, for a ControlBase
+
+        use connect() instead of ControlBase.connect(), and add the
+        submodules with elaborate(m).  front is the first pipe (the
+        special-cases), whose output is split.
+    """
+
+    def __init__(self, pspec, front, depth):
+        self.split = FPBypassSplit(pspec, front)
+        self.bypass = FPBypass(pspec, front, depth)
+        self.merge = FPBypassMerge(pspec)
+
+    def connect(self, cbase, pipechain, head=None):
+        """ same job as ControlBase.connect, with the bypass in there too.
+            head (if given) goes in front of pipechain[0], and the split.
+        """
+        front, rest = pipechain[0], pipechain[1:]
+        split, bypass, merge = self.split, self.bypass, self.merge
+
+        eqs = front.connect_to_next(split)
+        eqs += split.connect_to_next(rest[0], 0)
+        for pipe1, pipe2 in zip(rest, rest[1:]):
+            eqs += pipe1.connect_to_next(pipe2)
+        eqs += rest[-1].n.connect_to_next(merge.p[0])
+
+        eqs += split.connect_to_next(bypass, 1)
+        eqs += bypass.n.connect_to_next(merge.p[1])
+
+        if head is not None:
+            eqs += head.connect_to_next(front)
+            front = head
+        cbase.set_specs(front, rest[-1])
+        cbase._new_data("chain")
+        eqs += front._connect_in(cbase)
+        eqs += merge.n._connect_out(cbase.n)
+        return eqs
+
+    def elaborate(self, m):
+        m.submodules.bypass_split = self.split
+        m.submodules.bypass = self.bypass
+        m.submodules.bypass_merge = self.merge
+
+
+def connect_early_out(cbase, pspec, pipechain, head=None):
+    """ ControlBase.connect, or (with pspec.early_out) FPEarlyOut.connect.
+        sets cbase.early_out, for the elaborate.  head (optional) is
+        connected in front of everything, the bypass split included.
+    """
+    if not pspec.early_out:
+        cbase.early_out = None
+        if head is not None:
+            pipechain = [head] + pipechain
+        return cbase.connect(pipechain)
+    if len(pipechain) < 2:
+        raise ValueError("early_out needs at least two pipe stages")
+    # (as many results as the rest of the pipechain, plus its register)
+    cbase.early_out = FPEarlyOut(pspec, pipechain[0], len(pipechain))
+    return cbase.early_out.connect(cbase, pipechain, head)
@@ -0,0 +1,57 @@
+""" count-leading-zeros (and trailing-zeros) with an all-zeros output
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+counting leading zeros by reversing the bits and handing them to
+nmigen's PriorityEncoder produces a long linear if-elif chain, which
+synthesises very poorly for the 53+ bit mantissas of FP64 (and 64-bit
+integers in int2float).  nmutil's CLZ (already used by cordic) is a
+tree instead, so that is what is used here: this module only adds what
+the FP normalisers need on top of it, an all-zeros output (zero) and a
+trailing-zeros version (CTZ).
+"""
+
+from nmigen import Module, Signal, Elaboratable
+from nmutil.clz import CLZ as _CLZ
+
+
+class CLZ(_CLZ):
+    """ count leading zeros (nmutil.clz.CLZ), plus zero
+
+        * sig_in: input (width bits)
+        * lz: count of leading zeros (from the MSB).  width if all zero
+        * zero: set if the input is all zeros
+    """
+
+    def __init__(self, width):
+        super().__init__(width)
+        self.zero = Signal(reset_less=True)
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        m.d.comb += self.zero.eq(~self.sig_in.bool())
+        return m
+
+
+class CTZ(Elaboratable):
+    """ count trailing zeros (CLZ on the reversed input)
+
+        * sig_in: input (width bits)
+        * lz: count of trailing zeros (from the LSB).  width if all zero
+        * zero: set if the input is all zeros
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.sig_in = Signal(width, reset_less=True)
+        self.lz = Signal(width.bit_length(), reset_less=True)
+        self.zero = Signal(reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        m.submodules.clz = clz = CLZ(self.width)
+        m.d.comb += [clz.sig_in.eq(self.sig_in[::-1]),
+                     self.lz.eq(clz.lz),
+                     self.zero.eq(clz.zero),
+                    ]
+        return m
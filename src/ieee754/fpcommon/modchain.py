@@ -0,0 +1,36 @@
+"""regrouping of PipeModBase modules into pipe stages
+
+see PipelineSpec.stage_splits.  this is not in ieee754.pipeline because
+nmutil.pipemodbase itself imports from there.
+"""
+
+from nmutil.pipemodbase import PipeModBaseChain
+
+
+class PipeModChain(PipeModBaseChain):
+    """ a pipe stage made from an explicit list of PipeModBase modules
+    """
+
+    def __init__(self, pspec, chain):
+        self.mod_chain = chain
+        super().__init__(pspec)
+
+    def get_chain(self):
+        return self.mod_chain
+
+
+def split_pipe_mods(pspec, mods):
+    """ regroups a flat list of PipeModBase modules into PipeModChains,
+        one (registered) pipe stage per group, splitting the list at each
+        of pspec.stage_splits.  e.g. [2, 5] on 9 modules gives three
+        stages: mods[0:2], mods[2:5] and mods[5:9].
+    """
+    splits = list(pspec.stage_splits)
+    assert splits == sorted(set(splits)), \
+            "stage_splits %s must be in increasing order" % repr(splits)
+    assert all(0 < s < len(mods) for s in splits), \
+            "stage_splits %s out of range (%d modules)" % \
+            (repr(splits), len(mods))
+    starts = [0] + splits
+    ends = splits + [len(mods)]
+    return [PipeModChain(pspec, mods[s:e]) for (s, e) in zip(starts, ends)]
@@ -2,7 +2,7 @@
 """
 
 from nmigen import Module, Signal, Mux, Elaboratable
-from nmigen.lib.coding import PriorityEncoder
+from ieee754.fpcommon.clz import CLZ
 
 
 class FPMSBHigh(Elaboratable):
@@ -37,35 +37,37 @@ class FPMSBHigh(Elaboratable):
         m = Module()
 
         mwid = self.m_width
-        pe = PriorityEncoder(mwid)
-        m.submodules.pe = pe
+        m.submodules.clz = clzt = CLZ(mwid)
 
-        # *sigh* not entirely obvious: count leading zeros (clz)
-        # with a PriorityEncoder.  to find from the MSB
-        # we reverse the order of the bits.  it would be better if PE
-        # took a "reverse" argument.
+        # count leading zeros (log-depth tree).  an all-zero input is
+        # not shifted at all (same as the bit-reversed PriorityEncoder
+        # that this replaced)
+        lz = Signal(len(clzt.lz), reset_less=True)
+        m.d.comb += lz.eq(Mux(clzt.zero, 0, clzt.lz))
 
         clz = Signal((len(self.e_out), True), reset_less=True)
         # GRRR utterly irritating https://github.com/nmigen/nmigen/issues/302
-        uclz = Signal(len(self.e_out), reset_less=True)
+        # (lz-wide: it is never more.  e_out-wide, the shifts below are
+        # 2^e_width bits: 65536 and more, for int2float's wide exponent)
+        uclz = Signal(len(lz), reset_less=True)
         temp = Signal(mwid, reset_less=True)
         if self.loprop:
             temp_r = Signal(mwid, reset_less=True)
             with m.If(self.m_in[0]):
                 # propagate low bit: do an ASL basically, except
                 # i can't work out how to do it in nmigen sigh
-                m.d.comb += temp_r.eq((self.m_in[0] << clz) - 1)
+                m.d.comb += temp_r.eq((self.m_in[0] << uclz) - 1)
 
         # limclz sets a limit (set by the exponent) on how far M can be shifted
         # this can be used to ensure that near-zero numbers don't then have
         # to be shifted *back* (e < -126 in the case of FP32 for example)
         if self.limclz is not False:
-            limclz = Mux(self.limclz > pe.o, pe.o, self.limclz)
+            limclz = Mux(self.limclz > lz, lz, self.limclz)
         else:
-            limclz = pe.o
+            limclz = lz
 
         m.d.comb += [
-            pe.i.eq(self.m_in[::-1]),     # inverted
+            clzt.sig_in.eq(self.m_in),
             clz.eq(limclz),          # count zeros from MSB down
             uclz.eq(limclz),         # *sigh*...
             temp.eq((self.m_in << uclz)),  # shift mantissa UP
@@ -77,3 +79,49 @@ class FPMSBHigh(Elaboratable):
             m.d.comb += self.m_out.eq(temp),
 
         return m
+
+
+class FPMSBHighLZA(Elaboratable):
+    """ makes the top mantissa bit hi, using a *predicted* shift amount
+
+        same as FPMSBHigh except that instead of counting leading zeros
+        on m_in (which has to wait for m_in to be computed) the count
+        comes from a leading-zero anticipator (see fpadd/lza.py), computed
+        in parallel with the mantissa add.  the anticipated count is
+        either exact or one short, so after shifting, if the MSB is still
+        zero a 1-bit correction shift is done.
+
+        * lzc: the predicted count of leading zeros (unsigned)
+        * limclz: limits the amount of shifting (always enabled here)
+    """
+    def __init__(self, m_width, e_width, lzc_width):
+        self.m_width = m_width
+        self.e_width = e_width
+        self.limclz = Signal((e_width, True), reset_less=True)
+        self.lzc = Signal(lzc_width, reset_less=True)
+
+        self.m_in = Signal(m_width, reset_less=True)
+        self.e_in = Signal((e_width, True), reset_less=True)
+        self.m_out = Signal(m_width, reset_less=True)
+        self.e_out = Signal((e_width, True), reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        # GRRR utterly irritating https://github.com/nmigen/nmigen/issues/302
+        shift = Signal(len(self.lzc), reset_less=True) # (as in FPMSBHigh)
+        temp = Signal(self.m_width, reset_less=True)
+        corr = Signal(reset_less=True)
+
+        comb += [
+            # predicted shift, limited (by the exponent) as in FPMSBHigh
+            shift.eq(Mux(self.limclz > self.lzc, self.lzc, self.limclz)),
+            temp.eq(self.m_in << shift),          # shift mantissa UP
+            # prediction one short (and allowed to go further)?  correct it
+            corr.eq((~temp[-1]) & (self.limclz > shift)),
+            self.m_out.eq(Mux(corr, temp << 1, temp)),
+            self.e_out.eq(self.e_in - shift - corr), # DECREASE exponent
+        ]
+
+        return m
@@ -2,15 +2,38 @@
 
 Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
 
+setting PipelineSpec.compound_round replaces RoundMod and CorrectionsMod
+with the single FPCompoundRoundMod, which takes the mantissa increment
+off the exponent / corrections path.
+
+with PipelineSpec.dual_path (FPADD), the input is already normalised, so
+Norm1ModSingle (a CLZ and two barrel shifters) is replaced by the 1-bit
+FPNorm1ModBit.
+
 """
 
 from nmutil.pipemodbase import PipeModBaseChain
-from ieee754.fpcommon.postnormalise import FPNorm1ModSingle
-from ieee754.fpcommon.roundz import FPRoundMod
+from ieee754.fpcommon.postnormalise import FPNorm1ModSingle, FPNorm1ModBit
+from ieee754.fpcommon.roundz import FPRoundMod, FPCompoundRoundMod
 from ieee754.fpcommon.corrections import FPCorrectionsMod
 from ieee754.fpcommon.pack import FPPackMod
 
 
+def normtopack_mods(pspec, e_extra=False):
+    """ Normalisation, Rounding Corrections, Pack modules, in order
+    """
+    if pspec.dual_path:
+        nmod = FPNorm1ModBit(pspec, e_extra=e_extra)
+    else:
+        nmod = FPNorm1ModSingle(pspec, e_extra=e_extra)
+    pmod = FPPackMod(pspec)
+    if pspec.compound_round:
+        return [nmod, FPCompoundRoundMod(pspec), pmod]
+    rmod = FPRoundMod(pspec)
+    cmod = FPCorrectionsMod(pspec)
+    return [nmod, rmod, cmod, pmod]
+
+
 class FPNormToPack(PipeModBaseChain):
 
     def __init__(self, pspec, e_extra=False):
@@ -21,9 +44,4 @@ class FPNormToPack(PipeModBaseChain):
         """ gets chain of modules
         """
         # Normalisation, Rounding Corrections, Pack - in a chain
-        nmod = FPNorm1ModSingle(self.pspec, e_extra=self.e_extra)
-        rmod = FPRoundMod(self.pspec)
-        cmod = FPCorrectionsMod(self.pspec)
-        pmod = FPPackMod(self.pspec)
-
-        return [nmod, rmod, cmod, pmod]
+        return normtopack_mods(self.pspec, self.e_extra)
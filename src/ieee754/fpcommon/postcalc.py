@@ -17,6 +17,11 @@ class FPPostCalcData:
         self.of = Overflow()
         self.ctx = FPPipeContext(pspec)
         self.muxid = self.ctx.muxid
+        # optional leading-zero anticipator count (FPADD, see fpadd/lza.py)
+        self.lza = pspec.lza
+        if self.lza:
+            lzc_width = (self.z.m_width + 3).bit_length() # +3: g/r/s
+            self.lzc = Signal(lzc_width, reset_less=True)
 
     def __iter__(self):
         yield from self.z
@@ -24,7 +29,12 @@ class FPPostCalcData:
         yield self.oz
         yield from self.of
         yield from self.ctx
+        if self.lza:
+            yield self.lzc
 
     def eq(self, i):
-        return [self.z.eq(i.z), self.out_do_z.eq(i.out_do_z), self.oz.eq(i.oz),
+        ret = [self.z.eq(i.z), self.out_do_z.eq(i.out_do_z), self.oz.eq(i.oz),
                 self.of.eq(i.of), self.ctx.eq(i.ctx)]
+        if self.lza:
+            ret.append(self.lzc.eq(i.lzc))
+        return ret
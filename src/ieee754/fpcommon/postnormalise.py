@@ -11,7 +11,7 @@ from ieee754.fpcommon.fpbase import (Overflow, OverflowMod,
                                      FPNumBase, FPNumBaseRecord)
 from ieee754.fpcommon.fpbase import FPState
 from ieee754.fpcommon.getop import FPPipeContext
-from ieee754.fpcommon.msbhigh import FPMSBHigh
+from ieee754.fpcommon.msbhigh import FPMSBHigh, FPMSBHighLZA
 from ieee754.fpcommon.exphigh import FPEXPHigh
 from ieee754.fpcommon.postcalc import FPPostCalcData
 
@@ -63,7 +63,13 @@ class FPNorm1ModSingle(PipeModBase):
         msr = FPEXPHigh(mwid+2, espec[0])
         m.submodules.norm_exp = msr
 
-        msb = FPMSBHigh(mwid+1, espec[0], True)
+        # leading-zero count is either predicted (and arrives with the
+        # data) or has to be counted here, from the mantissa
+        if self.pspec.lza:
+            msb = FPMSBHighLZA(mwid+1, espec[0], len(self.i.lzc))
+            m.d.comb += msb.lzc.eq(self.i.lzc)
+        else:
+            msb = FPMSBHigh(mwid+1, espec[0], True)
         m.submodules.norm_msb = msb
 
         m.d.comb += i.eq(self.i)
@@ -132,6 +138,71 @@ class FPNorm1ModSingle(PipeModBase):
         return m
 
 
+class FPNorm1ModBit(PipeModBase):
+    """ FPNorm1ModSingle for an (almost) normalised input: 1-bit shifts only
+
+        for the dual-path adder (FPAddDualPathMod), which has already done
+        the full normalisation (near path) or the 1-bit one (far path).
+        all that can be left is the MSB being zero at e=-126 (a denormal
+        result, left as it is) or e=-127 (shifted down one, to -126):
+        no CLZ and no barrel shifters, just 1-bit muxes.
+    """
+
+    def __init__(self, pspec, e_extra=False):
+        self.e_extra = e_extra
+        super().__init__(pspec, "normalise_1")
+
+    def ispec(self):
+        return FPPostCalcData(self.pspec, e_extra=self.e_extra)
+
+    def ospec(self):
+        return FPNorm1Data(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        m.submodules.norm1_out_overflow = of = OverflowMod("norm1of_")
+
+        i = self.i
+        m.submodules.norm1_insel_z = insel_z = FPNumBase(i.z)
+
+        # initialise out from in (overridden below)
+        comb += self.o.z.eq(insel_z)
+        comb += Overflow.eq(of, i.of)
+
+        # normalisation increase/decrease conditions
+        decrease = Signal(reset_less=True)
+        increase = Signal(reset_less=True)
+        comb += decrease.eq(insel_z.m_msbzero & insel_z.exp_gt_n126)
+        comb += increase.eq(insel_z.exp_lt_n126)
+
+        # decrease exponent: 1-bit shift up (leave sticky)
+        with m.If(decrease):
+            comb += [self.o.z.m.eq(Cat(i.of.guard, insel_z.m[:-1])),
+                     of.m0.eq(i.of.guard),
+                     of.guard.eq(i.of.round_bit),
+                     of.round_bit.eq(i.of.sticky),
+                     self.o.z.e.eq(insel_z.e - 1),
+                    ]
+        # increase exponent: 1-bit shift down
+        with m.Elif(increase):
+            comb += [self.o.z.m.eq(insel_z.m[1:]),
+                     of.m0.eq(insel_z.m[1]),
+                     of.guard.eq(insel_z.m[0]),
+                     of.round_bit.eq(i.of.guard),
+                     of.sticky.eq(i.of.round_bit | i.of.sticky),
+                     self.o.z.e.eq(insel_z.e + 1),
+                    ]
+
+        comb += self.o.roundz.eq(of.roundz_out)
+        comb += self.o.ctx.eq(self.i.ctx)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.oz.eq(self.i.oz)
+
+        return m
+
+
 class FPNorm1ModMulti:
 
     def __init__(self, pspec, single_cycle=True):
@@ -52,3 +52,65 @@ class FPRoundMod(PipeModBase):
         comb += self.o.z.e.eq(Mux(msb1s & self.i.roundz, ie + 1, ie)) # exp up
 
         return m
+
+
+class FPCompoundRoundMod(PipeModBase):
+    """ rounding and corrections (FPRoundMod + FPCorrectionsMod) in one.
+
+        FPRoundMod puts the mantissa increment (im+1) in front of the
+        exponent increment and FPCorrectionsMod's denormalised test, which
+        then needs the top bit of the *rounded* mantissa.  here both
+        results, rounded and not rounded, are created in parallel (as in a
+        compound adder: m and m+1), the carry-out and the new top bit being
+        worked out directly from m rather than from the output of m+1.
+        roundz then just selects one or the other.
+    """
+
+    def __init__(self, pspec):
+        super().__init__(pspec, "roundz_compound")
+
+    def ispec(self):
+        return FPNorm1Data(self.pspec)
+
+    def ospec(self):
+        return FPRoundData(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        comb += self.o.eq(self.i)  # copies muxid, z, out_do_z
+        z = self.i.z
+        im, ie = z.m, z.e
+        N126, N127 = z.fp.N126, z.fp.N127
+
+        # the two exponent compares needed by the corrections
+        e_n126 = Signal(reset_less=True)
+        e_n127 = Signal(reset_less=True)
+        comb += [e_n126.eq(ie == N126),
+                 e_n127.eq(ie == N127)]
+
+        # not rounded: denormalised if the mantissa top bit is zero
+        e0 = Signal((len(ie), True), reset_less=True)
+        comb += e0.eq(Mux(e_n126 & ~im[-1], N127, ie))
+
+        # rounded: m+1.  the top bit of m+1 flips if all the bits below
+        # it are 1s, and the carry-out (m all 1s) sets the exponent up.
+        # on carry-out the mantissa is zero, so it is denormalised if
+        # e+1 == N126 i.e. e == N127
+        low1s = Signal(reset_less=True)
+        msb1s = Signal(reset_less=True)
+        m1_top = Signal(reset_less=True)
+        comb += [low1s.eq(im[:-1].all()),
+                 msb1s.eq(low1s & im[-1]),
+                 m1_top.eq(im[-1] ^ low1s)]
+        denorm1 = Signal(reset_less=True)
+        e1 = Signal((len(ie), True), reset_less=True)
+        comb += denorm1.eq(Mux(msb1s, e_n127, e_n126 & ~m1_top))
+        comb += e1.eq(Mux(denorm1, N127, Mux(msb1s, ie + 1, ie)))
+
+        # select
+        comb += self.o.z.m.eq(Mux(self.i.roundz, im+1, im))  # mantissa up
+        comb += self.o.z.e.eq(Mux(self.i.roundz, e1, e0))
+
+        return m
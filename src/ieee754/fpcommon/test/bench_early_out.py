@@ -0,0 +1,147 @@
+""" average latency of the FPADD / FPMUL / FPDIV pipelines, with and
+    without the special-case bypass (PipelineSpec.early_out)
+
+    the ALU pipeline (no ReservationStations) gets a trace in which a
+    given fraction of the operations have a NaN, Inf or zero operand,
+    i.e. are decided by the special-cases (out_do_z).  the muxid is used
+    as a tag, to match the (out-of-order) results with when they went in.
+
+    run as:
+
+        python3 bench_early_out.py [add|mul|div] [n_vals]
+"""
+
+import sys
+from random import Random
+
+from nmigen import Module
+from nmigen.back.pysim import Simulator, Settle, Passive
+
+from ieee754.fpadd.pipeline import FPADDMuxInOut
+from ieee754.fpmul.pipeline import FPMULMuxInOut
+from ieee754.fpdiv.pipeline import FPDIVMuxInOut
+from ieee754.fpcommon.fpbase import FPFormat
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
+
+
+def special_operand(rng, fmt):
+    """ a (signed) zero, Inf or quiet NaN
+    """
+    sign = rng.randint(0, 1) << (fmt.width - 1)
+    e_max = ((1 << fmt.e_width) - 1) << fmt.fraction_width
+    qnan = 1 << (fmt.fraction_width - 1)
+    return sign | rng.choice([0, e_max, e_max | qnan])
+
+
+def create_trace(rng, fmt, n_vals, special_frac):
+    """ operand pairs, special_frac of them with a special operand
+    """
+    vals = []
+    for i in range(n_vals):
+        a = rng.getrandbits(fmt.width)
+        b = rng.getrandbits(fmt.width)
+        if rng.random() < special_frac:
+            if rng.randint(0, 1):
+                a = special_operand(rng, fmt)
+            else:
+                b = special_operand(rng, fmt)
+        vals.append((a, b))
+    return vals
+
+
+def measure_latency(alu, vals, opcode=None, n_tags=16):
+    """ sends vals through alu back-to-back (at most n_tags in flight),
+        returns the latency, in cycles, of each result
+    """
+    m = Module()
+    m.submodules.alu = alu
+    sim = Simulator(m)
+    sim.add_clock(1e-6)
+
+    cycle = [0]
+    sent = {}       # tag -> cycle the operation went in
+    latency = []
+    p, n = alu.p, alu.n
+    has_mask = hasattr(p, "mask_i")
+
+    def clock():
+        yield Passive()
+        while True:
+            yield
+            cycle[0] += 1
+
+    def send():
+        for i, (a, b) in enumerate(vals):
+            tag = i % n_tags
+            while tag in sent:
+                yield
+            yield p.data_i.a.eq(a)
+            yield p.data_i.b.eq(b)
+            yield p.data_i.ctx.muxid.eq(tag)
+            if opcode is not None:
+                yield p.data_i.ctx.op.eq(opcode)
+            yield p.valid_i.eq(1)
+            if has_mask:
+                yield p.mask_i.eq(1 << tag)
+            yield Settle()
+            while not (yield p.ready_o):
+                yield
+                yield Settle()
+            sent[tag] = cycle[0]
+            yield
+            yield p.valid_i.eq(0)
+            if has_mask:
+                yield p.mask_i.eq(0)
+
+    def recv():
+        yield n.ready_i.eq(1)
+        while len(latency) < len(vals):
+            yield Settle()
+            if (yield n.valid_o):
+                tag = yield n.data_o.ctx.muxid
+                latency.append(cycle[0] - sent.pop(tag))
+            yield
+
+    sim.add_sync_process(clock)
+    sim.add_sync_process(send)
+    sim.add_sync_process(recv)
+    sim.run()
+    return latency
+
+
+def create_alu(unit, width, n_tags, early_out):
+    """ the ALU of the unit's MuxInOut: n_tags rows gives a muxid
+        wide enough for the tags
+    """
+    if unit == "div":
+        return FPDIVMuxInOut(width, n_tags, early_out=early_out).alu
+    kls = {"add": FPADDMuxInOut, "mul": FPMULMuxInOut}[unit]
+    return kls(width, n_tags, early_out=early_out).alu
+
+
+def bench(unit, width=32, n_vals=200, fracs=(0.0, 0.25, 0.5, 0.75),
+          n_tags=16, seed=0):
+    fmt = FPFormat.standard(width)
+    opcode = None
+    if unit == "div":
+        opcode = int(DivPipeCoreOperation.UDivRem)
+    for frac in fracs:
+        vals = create_trace(Random(seed), fmt, n_vals, frac)
+        res = []
+        for early_out in (False, True):
+            alu = create_alu(unit, width, n_tags, early_out)
+            latency = measure_latency(alu, vals, opcode, n_tags)
+            res.append(sum(latency) / len(latency))
+        print("%s%d special %3d%%: latency %5.2f, early_out %5.2f" % \
+                    (unit, width, frac * 100, res[0], res[1]))
+
+
+if __name__ == '__main__':
+    units = ["add", "mul", "div"]
+    if len(sys.argv) > 1:
+        units = [sys.argv[1]]
+    n_vals = 200
+    if len(sys.argv) > 2:
+        n_vals = int(sys.argv[2])
+    for unit in units:
+        bench(unit, n_vals=n_vals)
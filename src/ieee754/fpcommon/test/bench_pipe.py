@@ -0,0 +1,399 @@
+""" throughput / latency benchmark of the FP pipelines, under load
+
+    the ALU pipeline of a unit's MuxInOut (FPADD, FPMUL, FPDIV, the FPCVT
+    variants) or a cordic pipe is driven the way its ReservationStations
+    would: num_rows rows, each holding (at most) one operation, tagged by
+    its row number (ctx.muxid).  every cycle:
+
+    * a new operation arrives with probability "load" (so load is the
+      offered ops/cycle), into the lowest free row.  if all rows are busy
+      it is refused (and counted).
+    * the lowest-numbered waiting row is sent in (as PriorityCombMuxInPipe)
+    * n.ready_i is dropped with probability "stall" (random backpressure)
+    * a fraction "cancel" of the operations get cancelled, with p.stop_i,
+      at a random point in the pipe (MaskCancellable pipes, i.e. FPDIV,
+      only).  the result already sitting in the output register can not
+      be.
+
+    the pipes are in-order, which is how results are checked off: when a
+    result comes out, any (uncancelled) operation sent in before it that
+    has not is counted as "lost" (as are all of them, if nothing comes
+    out for "drain" cycles), and a cancelled row is only reused once
+    its operation has been seen to be gone ("dropped" counts cancelled
+    operations that came out anyway).  FPDIV with more than one lane
+    (PipelineSpec.lanes) is not in-order: only "drain" applies there.
+
+    the operands come from a trace: "random" bits, or "exact" (the exact
+    divides of everyday code: small integer ratios and power-of-two
+    divisors, or perfect squares and powers of four, as floats), which
+    the iterative FPDIV finishes early.  so, for its average latency:
+
+        python3 bench_pipe.py div_iter 64 1.0 0 0 200 exact
+
+    the report is JSON (sim_out/bench_<unit><width>.json by default):
+    ops/cycle, cycles/op, latency (arrival to result, and issue to result)
+    mean / percentiles / histogram, and a histogram of the number of busy
+    rows (RS occupancy) per cycle.  the traffic is seeded, and the commit
+    is recorded, so that reports from two commits can be compared:
+
+        python3 bench_pipe.py compare old.json new.json
+
+    run as:
+
+        python3 bench_pipe.py unit [width] [load] [stall] [cancel] [n_ops]
+                                   [trace]
+
+    where unit is one of add, mul, div, sqrt, rsqrt, fcvt_up, fcvt_down,
+    f2int, int2f, cordic, or div_nr, sqrt_nr, rsqrt_nr (FPDIV with the
+    Newton-Raphson core), div_iter, sqrt_iter, rsqrt_iter (FPDIV with the
+    iterative core, one calculate stage) or div_lanes, sqrt_lanes,
+    rsqrt_lanes (the same, with num_rows lanes).
+"""
+
+import os
+import sys
+import json
+import subprocess
+from random import Random
+
+from nmigen import Module
+from nmigen.back.pysim import Simulator, Settle
+
+from ieee754.fpadd.pipeline import FPADDMuxInOut
+from ieee754.fpmul.pipeline import FPMULMuxInOut
+from ieee754.fpdiv.pipeline import FPDIVMuxInOut
+from ieee754.fcvt.pipeline import (FPCVTUpMuxInOut, FPCVTDownMuxInOut,
+                                   FPCVTF2IntMuxInOut, FPCVTIntMuxInOut)
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
+from ieee754.fpcommon.test.golden import FLOAT_TYPES, UINT_TYPES
+
+
+UNITS = ["add", "mul", "div", "sqrt", "rsqrt", "fcvt_up", "fcvt_down",
+         "f2int", "int2f", "cordic", "div_nr", "sqrt_nr", "rsqrt_nr",
+         "div_iter", "sqrt_iter", "rsqrt_iter", "div_lanes", "sqrt_lanes",
+         "rsqrt_lanes"]
+
+DIV_OPS = {"div": DivPipeCoreOperation.UDivRem,
+           "sqrt": DivPipeCoreOperation.SqrtRem,
+           "rsqrt": DivPipeCoreOperation.RSqrtRem}
+
+
+def create_unit(unit, width, num_rows, out_width=None):
+    """ the pipeline to benchmark: returns (alu, opcode, n_operands)
+    """
+    if unit in ("add", "mul"):
+        kls = {"add": FPADDMuxInOut, "mul": FPMULMuxInOut}[unit]
+        return kls(width, num_rows).alu, None, 2
+    op, _, core = unit.partition("_")
+    if op in DIV_OPS and core in ("", "nr", "iter", "lanes"):
+        n_operands = 2 if op == "div" else 1
+        dut = FPDIVMuxInOut(width, num_rows, newton=core == "nr",
+                            iterative=int(core in ("iter", "lanes")),
+                            lanes=num_rows if core == "lanes" else 1)
+        return dut.alu, int(DIV_OPS[op]), n_operands
+    if unit == "cordic":
+        # imported here: the cordic stages need bigfloat
+        from ieee754.cordic.fp_pipeline import FPCordicBasePipe
+        from ieee754.cordic.fp_pipe_data import FPCordicPipeSpec
+        pspec = FPCordicPipeSpec(width=width, rounds_per_stage=4,
+                                 num_rows=num_rows)
+        return FPCordicBasePipe(pspec), None, 1
+    if unit == "fcvt_up":
+        dut = FPCVTUpMuxInOut(width, out_width or width*2, num_rows)
+        return dut.alu, None, 1
+    if unit == "fcvt_down":
+        dut = FPCVTDownMuxInOut(width, out_width or width//2, num_rows)
+        return dut.alu, None, 1
+    if unit == "f2int":
+        dut = FPCVTF2IntMuxInOut(width, out_width or width, num_rows,
+                                 op_wid=1)
+        return dut.alu, 1, 1
+    if unit == "int2f":
+        dut = FPCVTIntMuxInOut(width, out_width or width, num_rows,
+                               op_wid=1)
+        return dut.alu, 1, 1
+    raise ValueError("unknown unit %s (one of %s)" % (unit, UNITS))
+
+
+def float_bits(width, x):
+    """ x as a float of the given width (raw bits)
+    """
+    return int(FLOAT_TYPES[width](x).view(UINT_TYPES[width]))
+
+
+def random_operands(rng, width, n_operands):
+    return [rng.getrandbits(width) for _ in range(n_operands)]
+
+
+def exact_operands(rng, width, n_operands):
+    if n_operands == 2:
+        if rng.random() < 0.5:
+            divisor = rng.randint(1, 45)
+            vals = (rng.randint(1, 45) * divisor, divisor)
+        else:
+            vals = (rng.randint(1, 2047), 2 ** rng.randint(0, 10))
+    elif rng.random() < 0.5:
+        vals = (rng.randint(1, 45) ** 2,)
+    else:
+        vals = (4.0 ** rng.randint(-5, 5),)
+    return [float_bits(width, v) for v in vals]
+
+
+# name: (rng, width, n_operands) -> operands (raw bits)
+TRACES = {"random": random_operands, "exact": exact_operands}
+
+
+def percentile(svals, pct):
+    """ nearest-rank percentile of a sorted list
+    """
+    if not svals:
+        return None
+    idx = max(0, -(-len(svals) * pct // 100) - 1)
+    return svals[idx]
+
+
+def summarise(vals):
+    svals = sorted(vals)
+    hist = {}
+    for v in svals:
+        hist[str(v)] = hist.get(str(v), 0) + 1
+    res = {"mean": sum(svals) / len(svals) if svals else None,
+           "min": svals[0] if svals else None,
+           "max": svals[-1] if svals else None,
+           "hist": hist}
+    for pct in (50, 90, 99):
+        res["p%d" % pct] = percentile(svals, pct)
+    return res
+
+
+def git_commit():
+    """ the commit (and whether the tree has changes) being benchmarked
+    """
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                         cwd=cwd, stderr=subprocess.DEVNULL)
+        status = subprocess.check_output(["git", "status", "--porcelain",
+                                          "-uno"], cwd=cwd,
+                                         stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit.decode().strip(), bool(status.strip())
+
+
+def run_bench(alu, width, num_rows, opcode=None, n_operands=2,
+              n_ops=200, load=1.0, stall=0.0, cancel=0.0, seed=0,
+              max_cycles=None, drain=200, trace="random"):
+    """ drives alu (see above) until n_ops operations have completed or
+        been cancelled, returns the statistics (a dict)
+    """
+    rng = Random(seed)
+    if max_cycles is None:
+        max_cycles = 1000 + n_ops * 100
+    p, n = alu.p, alu.n
+    has_mask = hasattr(p, "mask_i")
+    if not has_mask:
+        cancel = 0.0 # only MaskCancellable pipes can be cancelled
+    operands = [getattr(p.data_i, name) for name in "ab"[:n_operands]]
+    get_operands = TRACES[trace]
+    # FPDIV with more than one (iterative) lane finishes out of order
+    in_order = getattr(getattr(alu, "pspec", None), "lanes", 1) == 1
+
+    m = Module()
+    m.submodules.alu = alu
+    sim = Simulator(m)
+    sim.add_clock(1e-6)
+
+    stats = {"cycles": 0, "arrived": 0, "refused": 0, "completed": 0,
+             "cancelled": 0, "dropped": 0, "lost": 0}
+    latency = []        # arrival -> result
+    pipe_latency = []   # issue -> result
+    occupancy = {}      # number of busy rows -> cycles
+
+    def process():
+        pending = {}    # row -> arrival cycle
+        inflight = {}   # row -> (arrival cycle, issue cycle, issue number)
+        doomed = set()  # rows in flight that are to be cancelled
+        draining = {}   # cancelled row -> issue number
+        n_issued = 0
+        cycle = 0
+        idle = 0
+        while stats["completed"] + stats["cancelled"] + \
+              stats["lost"] < n_ops:
+            assert cycle < max_cycles, "bench stuck after %d cycles, " \
+                    "in flight: %s" % (cycle, sorted(inflight))
+            if idle >= drain:
+                # nothing more is coming out
+                stats["lost"] += len(inflight)
+                inflight.clear()
+                doomed.clear()
+                draining.clear()
+                idle = 0
+
+            # new arrival, into the lowest free row
+            if stats["arrived"] < n_ops and rng.random() < load:
+                free = [row for row in range(num_rows)
+                        if row not in pending and row not in inflight
+                        and row not in draining]
+                if free:
+                    pending[free[0]] = cycle
+                    stats["arrived"] += 1
+                else:
+                    stats["refused"] += 1
+
+            ready = int(rng.random() >= stall)
+            yield n.ready_i.eq(ready)
+
+            issue = min(pending) if pending else None
+            if issue is not None:
+                vals = get_operands(rng, width, n_operands)
+                for operand, val in zip(operands, vals):
+                    yield operand.eq(val)
+                yield p.data_i.ctx.muxid.eq(issue)
+                if opcode is not None:
+                    yield p.data_i.ctx.op.eq(opcode)
+            yield p.valid_i.eq(issue is not None)
+            if has_mask:
+                yield p.mask_i.eq(0 if issue is None else 1 << issue)
+            yield Settle()
+
+            # cancellation: at a random point in the pipe, but not once
+            # the result is in the output register
+            victim = None
+            if doomed and rng.random() < 0.5:
+                at_out = None
+                if (yield n.valid_o):
+                    at_out = yield n.data_o.ctx.muxid
+                rows = [row for row in sorted(doomed) if row != at_out]
+                if rows:
+                    victim = rng.choice(rows)
+            if has_mask:
+                yield p.stop_i.eq(0 if victim is None else 1 << victim)
+                yield Settle()
+
+            # handshakes, taking effect on this clock edge
+            if issue is not None and (yield p.ready_o):
+                inflight[issue] = (pending.pop(issue), cycle, n_issued)
+                n_issued += 1
+                if rng.random() < cancel:
+                    doomed.add(issue)
+            if inflight or draining:
+                idle += 1
+            if ready and (yield n.valid_o):
+                idle = 0
+                row = yield n.data_o.ctx.muxid
+                if row in draining:
+                    # a cancelled operation that was not masked out
+                    del draining[row]
+                    stats["dropped"] += 1
+                else:
+                    assert row in inflight, "result for idle row %d" % row
+                    arrival, issued, num = inflight.pop(row)
+                    doomed.discard(row)
+                    latency.append(cycle - arrival)
+                    pipe_latency.append(cycle - issued)
+                    stats["completed"] += 1
+                    # the pipes are in-order: anything sent in before
+                    # this result is not coming out any more
+                    if in_order:
+                        for r, (a, i, earlier) in list(inflight.items()):
+                            if earlier < num:
+                                del inflight[r]
+                                doomed.discard(r)
+                                stats["lost"] += 1
+                        for r, earlier in list(draining.items()):
+                            if earlier < num:
+                                del draining[r]
+            if victim is not None:
+                draining[victim] = inflight.pop(victim)[2]
+                doomed.discard(victim)
+                stats["cancelled"] += 1
+
+            busy = len(pending) + len(inflight) + len(draining)
+            occupancy[busy] = occupancy.get(busy, 0) + 1
+            yield
+            cycle += 1
+        stats["cycles"] = cycle
+
+    sim.add_sync_process(process)
+    sim.run()
+
+    cycles = stats["cycles"]
+    done = stats["completed"]
+    res = {"config": {"width": width, "num_rows": num_rows,
+                      "opcode": opcode, "n_ops": n_ops, "load": load,
+                      "stall": stall, "cancel": cancel, "seed": seed,
+                      "trace": trace}}
+    res.update(stats)
+    res["ops_per_cycle"] = done / cycles if cycles else 0.0
+    res["cycles_per_op"] = cycles / done if done else None
+    res["latency"] = summarise(latency)
+    res["pipe_latency"] = summarise(pipe_latency)
+    res["occupancy"] = {"mean": sum(k * v for (k, v) in occupancy.items())
+                                / max(1, cycles),
+                        "hist": {str(k): occupancy[k]
+                                 for k in sorted(occupancy)}}
+    return res
+
+
+def bench(unit, width=32, num_rows=4, out_width=None, fname=None,
+          **kwargs):
+    """ benchmarks one unit, writes (and returns) the JSON report
+    """
+    alu, opcode, n_operands = create_unit(unit, width, num_rows, out_width)
+    res = {"unit": unit}
+    res["commit"], res["dirty"] = git_commit()
+    res.update(run_bench(alu, width, num_rows, opcode, n_operands,
+                         **kwargs))
+    res["config"]["out_width"] = out_width
+    if fname is None:
+        os.makedirs("sim_out", exist_ok=True)
+        fname = os.path.join("sim_out", "bench_%s%d.json" % (unit, width))
+    with open(fname, "w") as f:
+        json.dump(res, f, indent=1)
+    lat = res["latency"]
+    print("%s%d: %.3f ops/cycle, latency mean %s p99 %s max %s, "
+          "occupancy %.2f" % (unit, width, res["ops_per_cycle"],
+                              lat["mean"], lat["p99"], lat["max"],
+                              res["occupancy"]["mean"]))
+    return res
+
+
+COMPARE_KEYS = [("ops_per_cycle",), ("cycles_per_op",),
+                ("latency", "mean"), ("latency", "p99"),
+                ("latency", "max"), ("pipe_latency", "mean"),
+                ("occupancy", "mean")]
+
+
+def compare(old, new):
+    """ the changes in the headline numbers between two reports, as a
+        list of (name, old, new).  the configs have to match.
+    """
+    assert old["config"] == new["config"], "different configurations: " \
+                            "%s vs %s" % (old["config"], new["config"])
+    res = []
+    for keys in COMPARE_KEYS:
+        o, nw = old, new
+        for key in keys:
+            o, nw = o[key], nw[key]
+        res.append((".".join(keys), o, nw))
+    return res
+
+
+if __name__ == '__main__':
+    if sys.argv[1] == "compare":
+        with open(sys.argv[2]) as f:
+            old = json.load(f)
+        with open(sys.argv[3]) as f:
+            new = json.load(f)
+        print("%s -> %s" % (old["commit"], new["commit"]))
+        for name, o, nw in compare(old, new):
+            print("%-20s %10s %10s" % (name, o, nw))
+        sys.exit(0)
+    unit = sys.argv[1]
+    args = [32, 1.0, 0.0, 0.0, 200, "random"]
+    for i, arg in enumerate(sys.argv[2:]):
+        args[i] = type(args[i])(arg)
+    width, load, stall, cancel, n_ops, trace = args
+    bench(unit, width, load=load, stall=stall, cancel=cancel, n_ops=n_ops,
+          trace=trace)
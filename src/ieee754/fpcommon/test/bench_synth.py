@@ -0,0 +1,267 @@
+""" area / logic depth benchmark: yosys synth, stat and ltp of each unit
+
+    each top-level unit (the ALU pipeline of its MuxInOut: the
+    ReservationStations fan-in / fan-out is a few muxes per row, and the
+    same for every unit) is elaborated at each of its widths, flattened
+    by nmigen, and run through yosys:
+
+        synth -top top [-lut K]; stat -json; ltp -noff
+
+    giving the cell count (by type), the number of flip-flops, and the
+    logic depth (the longest path between flip-flops / ports, in cells).
+    the table is written as JSON to sim_out/bench_synth.json, and, if
+    there is one, diffed against the baseline (sim_out/
+    bench_synth_baseline.json, or $IEEE754FPU_SYNTH_BASELINE).
+
+    run as:
+
+        python3 bench_synth.py run [unit[:width] ...]
+        python3 bench_synth.py baseline     (the last run becomes it)
+        python3 bench_synth.py diff old.json new.json
+
+    where unit is one of UNITS (all of them, by default).  the yosys run
+    is $YOSYS, "yosys" or "yowasp-yosys" (the one that nmigen has built
+    in can not synth).  $IEEE754FPU_SYNTH_LUT=K maps to K-input LUTs,
+    rather than to (yosys internal) gates.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import subprocess
+
+from nmigen.hdl.ir import Fragment
+from nmigen.back import rtlil
+
+from ieee754.fpadd.pipeline import FPADDMuxInOut
+from ieee754.fpmul.pipeline import FPMULMuxInOut
+from ieee754.fpdiv.pipeline import FPDIVMuxInOut
+from ieee754.fcvt.pipeline import (FPCVTUpMuxInOut, FPCVTDownMuxInOut,
+                                   FPCVTF2IntMuxInOut, FPCVTIntMuxInOut)
+from ieee754.fclass.pipeline import FPClassMuxInOut
+from ieee754.fpcmp.pipeline import FPCMPMuxInOut
+from ieee754.fpmax.pipeline import FPMAXMuxInOut
+from ieee754.fsgnj.pipeline import FSGNJMuxInOut
+from ieee754.part_mul_add.multiply import Mul8_16_32_64
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation as DP
+from ieee754.fpcommon.test.cxxrtl_sim import flatten
+from ieee754.fpcommon.test.bench_pipe import git_commit
+
+
+NUM_ROWS = 4
+FP_WIDTHS = (16, 32, 64)
+
+RESULT = os.path.join("sim_out", "bench_synth.json")
+BASELINE = os.path.join("sim_out", "bench_synth_baseline.json")
+
+# the numbers that are compared with the baseline
+DIFF_KEYS = ("cells", "ff", "depth")
+
+
+def alu_unit(kls, **kwargs):
+    """ a unit (see UNITS) which is the ALU of MuxInOut kls(*width)
+    """
+    def create(*width):
+        alu = kls(*width, NUM_ROWS, **kwargs).alu
+        return alu, alu.ports()
+    return create
+
+
+def cordic_unit(width):
+    # imported here: the cordic stages need bigfloat
+    from ieee754.cordic.fp_pipeline import FPCordicBasePipe
+    from ieee754.cordic.fp_pipe_data import FPCordicPipeSpec
+    pspec = FPCordicPipeSpec(width=width, rounds_per_stage=4,
+                             num_rows=NUM_ROWS)
+    dut = FPCordicBasePipe(pspec)
+    return dut, dut.ports()
+
+
+def mul_unit(width):
+    dut = Mul8_16_32_64()
+    return dut, [dut.a, dut.b, dut.intermediate_output, dut.output,
+                 *dut.part_ops, *dut.part_pts.values()]
+
+
+# name: (create(*width) -> (elaboratable, ports), widths)
+UNITS = {
+    "fpadd": (alu_unit(FPADDMuxInOut), FP_WIDTHS),
+    "fpadd_dual": (alu_unit(FPADDMuxInOut, dual_path=True), FP_WIDTHS),
+    "fpmul": (alu_unit(FPMULMuxInOut), FP_WIDTHS),
+    "fpdiv": (alu_unit(FPDIVMuxInOut), FP_WIDTHS),
+    "fpdiv_div": (alu_unit(FPDIVMuxInOut, supported=[DP.UDivRem]),
+                  FP_WIDTHS),
+    "fpdiv_sqrt": (alu_unit(FPDIVMuxInOut, supported=[DP.SqrtRem]),
+                   FP_WIDTHS),
+    "fpdiv_rsqrt": (alu_unit(FPDIVMuxInOut, supported=[DP.RSqrtRem]),
+                    FP_WIDTHS),
+    "fpdiv_srt": (alu_unit(FPDIVMuxInOut, srt=True), FP_WIDTHS),
+    "fpdiv_srt_div": (alu_unit(FPDIVMuxInOut, srt=True,
+                               supported=[DP.UDivRem]), FP_WIDTHS),
+    "fpdiv_srt_sqrt": (alu_unit(FPDIVMuxInOut, srt=True,
+                                supported=[DP.SqrtRem]), FP_WIDTHS),
+    "fpdiv_nr": (alu_unit(FPDIVMuxInOut, newton=True), FP_WIDTHS),
+    "fpdiv_nr_div": (alu_unit(FPDIVMuxInOut, newton=True,
+                              supported=[DP.UDivRem]), FP_WIDTHS),
+    "fpdiv_iter": (alu_unit(FPDIVMuxInOut, iterative=1), FP_WIDTHS),
+    "fpdiv_iter3": (alu_unit(FPDIVMuxInOut, iterative=3), FP_WIDTHS),
+    "fpdiv_iter_div": (alu_unit(FPDIVMuxInOut, iterative=1,
+                                supported=[DP.UDivRem]), FP_WIDTHS),
+    "fpdiv_lanes": (alu_unit(FPDIVMuxInOut, iterative=1, lanes=2),
+                    FP_WIDTHS),
+    "fcvt_up": (alu_unit(FPCVTUpMuxInOut), ((16, 32), (16, 64), (32, 64))),
+    "fcvt_down": (alu_unit(FPCVTDownMuxInOut),
+                  ((32, 16), (64, 16), (64, 32))),
+    "fcvt_f2int": (alu_unit(FPCVTF2IntMuxInOut, op_wid=1),
+                   ((16, 16), (32, 32), (64, 32), (64, 64))),
+    "fcvt_int2f": (alu_unit(FPCVTIntMuxInOut, op_wid=1),
+                   ((16, 32), (32, 32), (32, 64))),
+    "fclass": (alu_unit(FPClassMuxInOut, op_wid=1),
+               ((16, 16), (32, 32), (64, 64))),
+    "fpcmp": (alu_unit(FPCMPMuxInOut), FP_WIDTHS),
+    "fpmax": (alu_unit(FPMAXMuxInOut), FP_WIDTHS),
+    "fsgnj": (alu_unit(FSGNJMuxInOut), FP_WIDTHS),
+    "cordic": (cordic_unit, (32,)),
+    "mul8_16_32_64": (mul_unit, (64,)),
+}
+
+
+def width_name(width):
+    if isinstance(width, tuple):
+        return "_".join(map(str, width))
+    return str(width)
+
+
+def find_yosys():
+    """ a yosys that has synth (nmigen's built-in one does not)
+    """
+    yosys = os.environ.get("YOSYS")
+    if yosys:
+        return yosys
+    for yosys in ("yosys", "yowasp-yosys"):
+        if shutil.which(yosys):
+            return yosys
+    raise FileNotFoundError("no yosys found (set $YOSYS)")
+
+
+def synth(dut, ports, workdir, lut=None):
+    """ synthesises dut in workdir, returns its stat / ltp figures
+    """
+    os.makedirs(workdir, exist_ok=True)
+    fragment = Fragment.get(dut, None)
+    flatten(fragment)
+    text = rtlil.convert_fragment(fragment.prepare(ports=ports), "top")[0]
+    with open(os.path.join(workdir, "top.il"), "w") as f:
+        f.write(text)
+    cmd = "synth -top top"
+    if lut:
+        cmd += " -lut %d" % lut
+    # (relative file names: a WebAssembly yosys only sees its cwd)
+    script = ["read_rtlil top.il", cmd,
+              "tee -q -o stat.json stat -json",
+              "tee -q -o ltp.txt ltp -noff"]
+    subprocess.run([find_yosys(), "-q", "-p", "; ".join(script)],
+                   cwd=workdir, check=True, stdout=subprocess.DEVNULL)
+
+    with open(os.path.join(workdir, "stat.json")) as f:
+        stat = json.load(f)
+    with open(os.path.join(workdir, "ltp.txt")) as f:
+        depth = re.search(r"length=(\d+)", f.read())
+    top = stat["modules"]["\\top"]
+    by_type = top["num_cells_by_type"]
+    return {"cells": top["num_cells"],
+            "ff": sum(n for (kls, n) in by_type.items() if "FF" in kls),
+            "depth": int(depth.group(1)) if depth else 0,
+            "cells_by_type": by_type,
+            "yosys": stat.get("creator")}
+
+
+def run(selection=None, lut=None):
+    """ synthesises the selected units (all of them, by default):
+        selection is a list of "unit" or "unit:width" (e.g. fcvt_up:16_32)
+    """
+    results = []
+    for name, (create, widths) in UNITS.items():
+        for width in widths:
+            if not isinstance(width, tuple):
+                width = (width,)
+            wname = width_name(width)
+            if selection and name not in selection and \
+               "%s:%s" % (name, wname) not in selection:
+                continue
+            res = {"unit": name, "width": wname}
+            start = time.time()
+            try:
+                dut, ports = create(*width)
+                workdir = os.path.join("sim_out", "synth",
+                                       "%s_%s" % (name, wname))
+                res.update(synth(dut, ports, workdir, lut))
+            except Exception as e:
+                res["error"] = "%s: %s" % (type(e).__name__,
+                                           str(e).strip()[:200])
+            res["seconds"] = round(time.time() - start, 1)
+            results.append(res)
+    commit, dirty = git_commit()
+    return {"commit": commit, "dirty": dirty, "lut": lut,
+            "results": results}
+
+
+def diff(old, new):
+    """ the rows of new (unit, width, key, old, new) that differ from
+        old, for each of DIFF_KEYS: the units in only one of them, or
+        with an error, have None for the missing figures
+    """
+    prev = {(r["unit"], r["width"]): r for r in old["results"]}
+    rows = []
+    for res in new["results"]:
+        o = prev.get((res["unit"], res["width"]), {})
+        for key in DIFF_KEYS:
+            if o.get(key) != res.get(key):
+                rows.append((res["unit"], res["width"], key,
+                             o.get(key), res.get(key)))
+    return rows
+
+
+def print_table(table):
+    for res in table["results"]:
+        if "error" in res:
+            print("%-14s %-6s %s" % (res["unit"], res["width"],
+                                     res["error"]))
+        else:
+            print("%-14s %-6s cells %7d  ff %6d  depth %4d" % \
+                  (res["unit"], res["width"], res["cells"], res["ff"],
+                   res["depth"]))
+
+
+def print_diff(rows):
+    for unit, width, key, o, n in rows:
+        change = ""
+        if o and n is not None:
+            change = "%+.1f%%" % ((n - o) * 100.0 / o)
+        print("%-14s %-6s %-6s %8s -> %8s %s" % (unit, width, key, o, n,
+                                                  change))
+
+
+if __name__ == '__main__':
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "run"
+    baseline = os.environ.get("IEEE754FPU_SYNTH_BASELINE", BASELINE)
+    if cmd == "baseline":
+        shutil.copyfile(RESULT, baseline)
+    elif cmd == "diff":
+        with open(sys.argv[2]) as f:
+            old = json.load(f)
+        with open(sys.argv[3]) as f:
+            print_diff(diff(old, json.load(f)))
+    else:
+        lut = os.environ.get("IEEE754FPU_SYNTH_LUT")
+        table = run(sys.argv[2:], lut and int(lut))
+        with open(RESULT, "w") as f:
+            json.dump(table, f, indent=1)
+        print_table(table)
+        if os.path.exists(baseline):
+            with open(baseline) as f:
+                print("changes from %s:" % baseline)
+                print_diff(diff(json.load(f), table))
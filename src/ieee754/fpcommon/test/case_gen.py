@@ -13,16 +13,23 @@ allows testing of:
 
 inversion of permutations also done, where appropriate (A,B and B,A)
 
-single-operand version also supported
+single-operand version also supported, and for those up to 16 bits (FP16
+sqrt, fclass, fcvt...) an exhaustive mode: every encoding, streamed through
 
 """
 
-from ieee754.fpcommon.test.fpmux import runfp, repeat, pipe_cornercases_repeat
+from ieee754.fpcommon.test.fpmux import (runfp, repeat, create_random,
+                                          get_sim)
+from ieee754.fpcommon.test.shards import run_shards
+from ieee754.fpcommon.test import cxxrtl_sim
 
 from random import randint
 from random import seed
 
+import os
 import sys
+import unittest
+import numpy as np
 
 def corner_cases(mod):
     return [mod.zero(1), mod.zero(0),
@@ -120,8 +127,12 @@ def get_corner_rand(mod, fixed_num, maxcount, width, single_op=False):
 
 
 class PipeFPCase:
+    """ runs batches of test values through a pipeline.  with n_workers
+        greater than 1, the batches are instead queued up, for
+        run_shards() to run in parallel (see shards.py)
+    """
     def __init__(self, dut, name, mod, fmod, width, fpfn, count,
-                 single_op, opcode):
+                 single_op, opcode, n_workers=1, stream=False, sim=None):
         self.dut = dut
         self.name = name
         self.mod = mod
@@ -131,41 +142,115 @@ class PipeFPCase:
         self.count = count
         self.single_op = single_op
         self.opcode = opcode
+        self.n_workers = n_workers
+        self.stream = stream
+        self.sim = sim
+        self.jobs = []
+
+    def runfp(self, tname, vals):
+        """ runs one batch of test values (or queues it up, if sharding)
+        """
+        if self.n_workers > 1:
+            self.jobs.append((tname, vals))
+        else:
+            self.runfp_now(tname, vals)
 
     def run(self, name, fn):
         name = "%s_%s" % (self.name, name)
-        pipe_cornercases_repeat(self.dut, name, self.mod, self.fmod,
-                                self.width, fn, corner_cases, self.fpfn,
-                                self.count, self.single_op,
-                                opcode=self.opcode)
+        for i, fixed_num in enumerate(corner_cases(self.mod)):
+            vals = fn(self.mod, fixed_num, self.count, self.width,
+                      self.single_op)
+            vals = repeat(self.dut.num_rows, vals)
+            fmt = "test_pipe_fp%d_%s_cornercases_%d"
+            self.runfp(fmt % (self.width, name, i), vals)
+
+    def run_vals(self, name, vals):
+        """ runs a batch of test values through: a list, or a NumPy
+            array, with one row (or one value, single_op) per test
+        """
+        vals = repeat(self.dut.num_rows, vals)
+        tname = "test_fp%s_pipe_fp%d_%s" % (self.name, self.width, name)
+        self.runfp(tname, vals)
 
     def run_cornercases(self):
-        ccs = get_corner_cases(self.mod, self.single_op)
-        vals = repeat(self.dut.num_rows, ccs)
-        tname = "test_fp%s_pipe_fp%d_cornercases" % (self.name, self.width)
-        runfp(self.dut, self.width, tname, self.fmod, self.fpfn, vals=vals,
-              single_op=self.single_op,
-                                opcode=self.opcode)
+        self.run_vals("cornercases",
+                      get_corner_cases(self.mod, self.single_op))
 
     def run_regressions(self, regressions_fn):
-        vals = repeat(self.dut.num_rows, regressions_fn())
-        #print ("regressions", self.single_op, vals)
-        tname = "test_fp%s_pipe_fp%d_regressions" % (self.name, self.width)
-        runfp(self.dut, self.width, tname, self.fmod, self.fpfn, vals=vals,
-              single_op=self.single_op,
-                                opcode=self.opcode)
+        self.run_vals("regressions", regressions_fn())
 
     def run_random(self):
         tname = "test_fp%s_pipe_fp%d_rand" % (self.name, self.width)
-        runfp(self.dut, self.width, tname, self.fmod, self.fpfn,
+        self.runfp(tname, create_random(self.dut.num_rows, self.width,
+                                        self.single_op))
+
+    def run_exhaustive(self, n_batches=16):
+        """ runs every encoding (single_op, up to 16 bits), in n_batches
+            batches (streamed through, if self.stream)
+        """
+        assert self.single_op and self.width <= 16
+        vals = np.arange(1 << self.width, dtype=np.uint64)
+        for i, batch in enumerate(np.array_split(vals, n_batches)):
+            self.run_vals("exhaustive_%d" % i, batch)
+
+    def run_shards(self, seed):
+        """ runs the queued-up batches, n_workers processes.  returns the
+            (merged) report
+        """
+        jobs, self.jobs = self.jobs, []
+        tname = "test_fp%s_pipe_fp%d" % (self.name, self.width)
+        return run_shards(tname, jobs, self.n_workers, self.runfp_now, seed)
+
+    def runfp_now(self, tname, vals):
+        runfp(self.dut, self.width, tname, self.fmod, self.fpfn, vals=vals,
               single_op=self.single_op,
-                                opcode=self.opcode)
+                                opcode=self.opcode,
+              sim=self.sim, stream=self.stream)
+
+
+def get_n_workers():
+    """ IEEE754FPU_TEST_WORKERS sets the default number of processes
+        run_pipe_fp uses, e.g. on CI.  default 1: everything in-process
+    """
+    return int(os.environ.get("IEEE754FPU_TEST_WORKERS", "1"))
 
 
 def run_pipe_fp(dut, width, name, mod, fmod, regressions, fpfn, count,
                 single_op=False,
-                opcode=None):
-    pc = PipeFPCase(dut, name, mod, fmod, width, fpfn, count, single_op, opcode)
+                opcode=None, n_workers=None, test_seed=None,
+                exhaustive=False):
+    """ runs the full set of test cases.  with n_workers > 1 they are
+        sharded over that many processes: test_seed (random if None)
+        seeds the test values and each shard, for reproducing failures.
+
+        exhaustive (single_op, 16-bit) instead runs every encoding,
+        streamed through at full throughput.  this is compiled
+        (cxxrtl_sim.py), unless IEEE754FPU_SIM says otherwise: the test
+        is skipped (unittest.SkipTest, with the reason) where that
+        cannot be built.  IEEE754FPU_SIM=pysim runs it anyway, slowly.
+    """
+    if n_workers is None:
+        n_workers = get_n_workers()
+    if n_workers > 1:
+        if test_seed is None:
+            test_seed = randint(0, (1<<32)-1)
+        seed(test_seed)
+    if exhaustive:
+        sim = get_sim("cxxrtl")
+        if sim == "cxxrtl":
+            reason = cxxrtl_sim.unavailable()
+            if reason is not None:
+                raise unittest.SkipTest("exhaustive %s needs cxxrtl: %s "
+                                        "(IEEE754FPU_SIM=pysim to run it "
+                                        "anyway)" % (name, reason))
+        pc = PipeFPCase(dut, name, mod, fmod, width, fpfn, count, single_op,
+                        opcode, n_workers, stream=True, sim=sim)
+        pc.run_exhaustive()
+        if n_workers > 1:
+            return pc.run_shards(test_seed)
+        return
+    pc = PipeFPCase(dut, name, mod, fmod, width, fpfn, count, single_op,
+                    opcode, n_workers)
     if regressions:
         pc.run_regressions(regressions)
     pc.run_cornercases()
@@ -176,4 +261,5 @@ def run_pipe_fp(dut, width, name, mod, fmod, regressions, fpfn, count,
     pc.run("nearlyinf", get_nearly_inf)
     pc.run("corner_rand", get_corner_rand)
     pc.run_random()
-
+    if n_workers > 1:
+        return pc.run_shards(test_seed)
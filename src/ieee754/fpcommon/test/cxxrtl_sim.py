@@ -0,0 +1,405 @@
+"""compiled (CXXRTL) simulation of the FP unit tests
+
+runfp drives the DUT through nmigen's python simulator, one generator
+yield per signal per clock: only hundreds of operations per second on
+e.g. FPMULMuxInOut(64, 4).  runfp_cxxrtl instead has yosys (write_cxxrtl)
+turn the DUT into C++, compiles that (with a small generic driver, below)
+into a shared library, and hands the whole batch of operands to it in
+one ctypes call.  the driver runs the same protocol as MuxInOut, cycle
+by cycle, for every row (muxid) at once:
+
+* one operation in flight per row: valid_i (and mask_i) are held, with
+  the operands, op and muxid, until ready_o, then dropped until the
+  result comes back, then there is a random gap (0-3 cycles, from the
+  seed) before the next operation
+* or, with stream=True, back-to-back: valid_i stays high (and the next
+  operation goes in on the cycle after ready_o) until they have all
+  gone in, with as many in flight as the pipeline will take
+* ready_i is held high, and each valid_o result's z and muxid is stored
+
+the results (and the muxid they came back with) are then checked against
+MuxInOut's expected values, all at once, with the same error message as
+runfp.  cancellation is not supported, and there is no VCD: re-run a
+failure with runfp (IEEE754FPU_SIM=pysim) to trace it.
+
+runfp(..., sim="cxxrtl"), or IEEE754FPU_SIM=cxxrtl, runs it instead.
+the compiled library is kept in sim_out/cxxrtl_cache/<key>.so, with the
+same key as rtlil_cache (the DUT configuration and the source).  yosys'
+CXXRTL headers are found from $IEEE754FPU_CXXRTL_INCLUDE, the yosys
+toolchain that nmigen uses, or yosys-config, in that order; $CXX (g++ by
+default) and $IEEE754FPU_CXXRTL_CFLAGS (-O1 by default) set the compiler.
+unavailable() says why (if) none of that can be found.
+"""
+
+import os
+import hashlib
+import ctypes
+import importlib
+import shutil
+import subprocess
+from random import randint
+
+import numpy as np
+from nmigen import Module, Signal, Elaboratable
+from nmigen.hdl.ir import Fragment
+from nmigen.back import rtlil
+
+from ieee754.fpcommon.test.golden import as_operands
+from ieee754.fpcommon.test.rtlil_cache import config_key
+
+
+CACHE_DIR = os.path.join("sim_out", "cxxrtl_cache")
+
+# the signals of each row (in this order), given to the driver by name
+ROLES = ("valid_i", "ready_o", "a", "b", "c", "op", "muxid_i", "mask_i",
+         "valid_o", "ready_i", "muxid_o", "z")
+
+DRIVER = r"""
+#include <stdint.h>
+#include <string.h>
+
+enum { VALID_I, READY_O, A, B, C, OP, MUXID_I, MASK_I,
+       VALID_O, READY_I, MUXID_O, Z, N_ROLES };
+
+static uint64_t get(cxxrtl_object *o)
+{
+    if (o->outline)
+        cxxrtl_outline_eval(o->outline);
+    uint64_t v = o->curr[0];
+    if (o->width > 32)
+        v |= (uint64_t)o->curr[1] << 32;
+    return v;
+}
+
+static void set(cxxrtl_object *o, uint64_t v)
+{
+    if (o == NULL)
+        return;
+    if (o->width < 64)
+        v &= ((uint64_t)1 << o->width) - 1;
+    o->next[0] = (uint32_t)v;
+    if (o->width > 32)
+        o->next[1] = (uint32_t)(v >> 32);
+}
+
+/* runs the MuxInOut protocol on n_rows rows of n_vals operations each,
+   with up to max_in_flight operations (per row) in the pipeline.
+   names: n_rows * N_ROLES debug names (NULL if unused).  ops: n_rows *
+   n_vals * 3 operands; gaps: the cycles to wait after each operation
+   (once there is room for the next).  writes back each row's results
+   (z, muxid) in the order received, and their number.  returns the
+   cycles taken, -1 if max_cycles ran out, or -2 - the index in names
+   of a signal that was not found.
+*/
+extern "C"
+long fpmux_run(const char *clk_name, const char *rst_name,
+               int n_rows, const char **names, int n_vals,
+               const uint64_t *ops, int64_t opcode, const uint8_t *gaps,
+               int max_in_flight,
+               uint64_t *out_z, uint64_t *out_muxid, int32_t *n_out,
+               long max_cycles)
+{
+    cxxrtl_handle top = cxxrtl_create(cxxrtl_design_create());
+    cxxrtl_object *clk = cxxrtl_get(top, clk_name);
+    cxxrtl_object *rst = rst_name ? cxxrtl_get(top, rst_name) : NULL;
+    cxxrtl_object **sig = new cxxrtl_object *[n_rows * N_ROLES];
+    int *idx = new int[n_rows];
+    int *gap = new int[n_rows];
+    int *sending = new int[n_rows];
+    long cycle = -1;
+
+    if (clk == NULL) {
+        cycle = -2 - n_rows * N_ROLES;
+        goto done;
+    }
+    for (int i = 0; i < n_rows * N_ROLES; i++) {
+        sig[i] = NULL;
+        if (names[i] == NULL)
+            continue;
+        sig[i] = cxxrtl_get(top, names[i]);
+        if (sig[i] == NULL) {
+            cycle = -2 - i;
+            goto done;
+        }
+    }
+    for (int r = 0; r < n_rows; r++) {
+        idx[r] = 0;
+        gap[r] = 0;
+        n_out[r] = 0;
+    }
+    set(rst, 0);
+    set(clk, 0);
+    cxxrtl_step(top);
+
+    for (cycle = 0; cycle < max_cycles; cycle++) {
+        int busy = 0;
+        /* inputs for this cycle */
+        for (int r = 0; r < n_rows; r++) {
+            cxxrtl_object **s = &sig[r * N_ROLES];
+            int room = idx[r] - n_out[r] < max_in_flight;
+            sending[r] = idx[r] < n_vals && room && gap[r] == 0;
+            set(s[VALID_I], sending[r]);
+            set(s[MASK_I], sending[r]);
+            set(s[READY_I], 1);
+            if (sending[r]) {
+                const uint64_t *op = &ops[(r * n_vals + idx[r]) * 3];
+                set(s[A], op[0]);
+                set(s[B], op[1]);
+                set(s[C], op[2]);
+                set(s[MUXID_I], r);
+                if (opcode >= 0)
+                    set(s[OP], opcode);
+            } else if (room && gap[r] > 0)
+                gap[r]--;
+        }
+        cxxrtl_step(top);
+        /* handshakes, at this clock edge */
+        for (int r = 0; r < n_rows; r++) {
+            cxxrtl_object **s = &sig[r * N_ROLES];
+            if (sending[r] && get(s[READY_O])) {
+                gap[r] = gaps[r * n_vals + idx[r]];
+                idx[r]++;
+            }
+            if (get(s[VALID_O]) && n_out[r] < n_vals) {
+                out_z[r * n_vals + n_out[r]] = get(s[Z]);
+                out_muxid[r * n_vals + n_out[r]] = get(s[MUXID_O]);
+                n_out[r]++;
+            }
+            busy |= n_out[r] < n_vals;
+        }
+        set(clk, 1);
+        cxxrtl_step(top);
+        set(clk, 0);
+        cxxrtl_step(top);
+        if (!busy)
+            break;
+    }
+    if (cycle == max_cycles)
+        cycle = -1;
+
+done:
+    delete[] sig;
+    delete[] idx;
+    delete[] gap;
+    delete[] sending;
+    cxxrtl_destroy(top);
+    return cycle;
+}
+"""
+
+
+def find_yosys():
+    """ the yosys toolchain that nmigen uses (0.10 or later: read_rtlil)
+    """
+    for modname in ("nmigen._toolchain.yosys", "amaranth._toolchain.yosys"):
+        try:
+            mod = importlib.import_module(modname)
+        except ImportError:
+            continue
+        return mod.find_yosys(lambda ver: ver >= (0, 10))
+    raise ImportError("no nmigen yosys toolchain")
+
+
+def find_include_dir():
+    """ the directory with yosys' backends/cxxrtl headers
+    """
+    include = os.environ.get("IEEE754FPU_CXXRTL_INCLUDE")
+    if include:
+        return include
+    try:
+        return os.path.join(str(find_yosys().data_dir()), "include")
+    except Exception:
+        pass
+    datdir = subprocess.check_output(["yosys-config", "--datdir"])
+    return os.path.join(datdir.decode().strip(), "include")
+
+
+def unavailable():
+    """ why runfp_cxxrtl cannot run here (no compiler, no yosys or no
+        CXXRTL headers), or None if it can
+    """
+    cxx = os.environ.get("CXX", "g++")
+    if shutil.which(cxx) is None:
+        return "no C++ compiler (%s): set $CXX" % cxx
+    try:
+        include = find_include_dir()
+    except Exception as e:
+        return "no yosys CXXRTL headers (%s)" % e
+    if not os.path.isdir(include):
+        return "no yosys CXXRTL headers in %s" % include
+    return None
+
+
+def flatten(fragment):
+    """ marks all of fragment's submodules to be flattened (by nmigen)
+    """
+    for subfrag, name in fragment.subfragments:
+        subfrag.flatten = True
+        flatten(subfrag)
+
+
+def convert(fragment):
+    """ the CXXRTL C++ source of fragment.
+
+        the fragment is flattened by nmigen, into one RTLIL module:
+        newer yosys refuses (in hierarchy and flatten) some of the
+        submodule port connections that nmigen writes out, which is also
+        why nmigen.back.cxxrtl is not used.
+    """
+    flatten(fragment)
+    text = rtlil.convert_fragment(fragment.prepare(), "top")[0]
+    script = "read_rtlil <<rtlil\n%s\nrtlil\nwrite_cxxrtl" % text
+    return find_yosys().run(["-q", "-"], script)
+
+
+def get_roles(dut, muxid):
+    """ the signals (by role, see ROLES) of row muxid of dut
+    """
+    p, n = dut.p[muxid], dut.n[muxid]
+    roles = {"valid_i": p.valid_i, "ready_o": p.ready_o,
+             "a": p.data_i.a, "muxid_i": p.data_i.muxid,
+             "valid_o": n.valid_o, "ready_i": n.ready_i,
+             "muxid_o": n.data_o.muxid, "z": n.data_o.z}
+    for role in ("b", "c"):
+        if hasattr(p.data_i, role):
+            roles[role] = getattr(p.data_i, role)
+    if hasattr(p.data_i, "ctx"):
+        roles["op"] = p.data_i.ctx.op
+    if hasattr(p, "mask_i"):
+        roles["mask_i"] = p.mask_i
+    # (zero-width signals, e.g. an unused op, are not ports)
+    return {role: sig for (role, sig) in roles.items() if len(sig)}
+
+
+class CXXRTLTop(Elaboratable):
+    """ dut, with each of its rows' signals (see get_roles) brought out to
+        a top-level port named r<muxid>_<role>, for the driver
+    """
+    outputs = ("ready_o", "valid_o", "muxid_o", "z")
+
+    def __init__(self, dut, n_rows):
+        self.dut = dut
+        self.rows = [get_roles(dut, muxid) for muxid in range(n_rows)]
+        self.ports = {}
+        for muxid, roles in enumerate(self.rows):
+            for role, sig in roles.items():
+                name = "r%d_%s" % (muxid, role)
+                self.ports[name] = Signal(len(sig), name=name)
+
+    def elaborate(self, platform):
+        m = Module()
+        m.submodules.dut = self.dut
+        for muxid, roles in enumerate(self.rows):
+            for role, sig in roles.items():
+                port = self.ports["r%d_%s" % (muxid, role)]
+                if role in self.outputs:
+                    m.d.comb += port.eq(sig)
+                else:
+                    m.d.comb += sig.eq(port)
+        return m
+
+
+def build(dut, n_rows):
+    """ the compiled library for dut (as CXXRTLTop(dut, n_rows))
+    """
+    key = "%s %d %s" % (config_key(dut), n_rows, DRIVER)
+    key = hashlib.sha256(key.encode()).hexdigest()
+    lib = os.path.join(CACHE_DIR, key + ".so")
+    if not os.path.exists(lib):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        top = CXXRTLTop(dut, n_rows)
+        src = convert(Fragment.get(top, None))
+        tmp = "%s.%d" % (lib, os.getpid())
+        with open(tmp + ".cc", "w") as f:
+            f.write(src)
+            f.write(DRIVER)
+        include = find_include_dir()
+        cmd = [os.environ.get("CXX", "g++"), "-std=c++14", "-shared", "-fPIC",
+               "-DCXXRTL_INCLUDE_CAPI_IMPL",
+               "-I", include,
+               "-I", os.path.join(include, "backends", "cxxrtl", "runtime")]
+        cmd += os.environ.get("IEEE754FPU_CXXRTL_CFLAGS", "-O1").split()
+        cmd += ["-o", tmp, tmp + ".cc"]
+        subprocess.check_call(cmd)
+        os.remove(tmp + ".cc")
+        # write-then-rename: other (sharded) test processes may be reading
+        os.replace(tmp, lib)
+    return ctypes.CDLL(os.path.abspath(lib))
+
+
+def runfp_cxxrtl(dut, width, name, fpkls, fpop, single_op=False, n_vals=10,
+                 vals=None, opcode=None, feedback_width=None, n_ops=2,
+                 sim_seed=None, max_cycles=None, stream=False):
+    """ runs vals (random if None) through dut, compiled with CXXRTL,
+        checking against fpop: see runfp.  returns the cycles taken.
+    """
+    from ieee754.fpcommon.test.fpmux import MuxInOut, create_random # (cycle)
+    if sim_seed is None:
+        sim_seed = randint(0, (1<<32)-1)
+    if vals is None:
+        vals = create_random(dut.num_rows, width, single_op, n_vals, n_ops)
+    vals = as_operands(vals)
+    test = MuxInOut(dut, width, fpkls, fpop, vals, single_op, opcode=opcode)
+
+    n_rows = dut.num_rows if feedback_width is None else feedback_width
+    tlen = test.tlen
+    lib = build(dut, n_rows)
+
+    names = (ctypes.c_char_p * (n_rows * len(ROLES)))()
+    for muxid in range(n_rows):
+        roles = get_roles(dut, muxid)
+        for i, role in enumerate(ROLES):
+            if role in roles:
+                names[muxid * len(ROLES) + i] = \
+                                    ("r%d_%s" % (muxid, role)).encode()
+
+    ops = np.zeros((n_rows, tlen, 3), dtype=np.uint64)
+    for muxid in range(n_rows):
+        for i in range(tlen):
+            op = test.di[muxid][i]
+            ops[muxid, i, :len(op)] = op
+    if stream:
+        gaps = np.zeros((n_rows, tlen), dtype=np.uint8)
+        max_in_flight = tlen
+    else:
+        gaps = np.random.RandomState(sim_seed % (1<<32)).randint(0, 4,
+                                        size=(n_rows, tlen)).astype(np.uint8)
+        max_in_flight = 1
+    out_z = np.zeros((n_rows, tlen), dtype=np.uint64)
+    out_muxid = np.zeros((n_rows, tlen), dtype=np.uint64)
+    n_out = np.zeros(n_rows, dtype=np.int32)
+    if max_cycles is None:
+        max_cycles = 1000 * (tlen + 1)
+
+    ptr = lambda a, t: a.ctypes.data_as(ctypes.POINTER(t))
+    lib.fpmux_run.restype = ctypes.c_long
+    cycles = lib.fpmux_run(b"clk", b"rst", n_rows, names, tlen,
+                           ptr(ops, ctypes.c_uint64),
+                           ctypes.c_int64(-1 if opcode is None else opcode),
+                           ptr(gaps, ctypes.c_uint8), max_in_flight,
+                           ptr(out_z, ctypes.c_uint64),
+                           ptr(out_muxid, ctypes.c_uint64),
+                           ptr(n_out, ctypes.c_int32),
+                           ctypes.c_long(max_cycles))
+    assert cycles >= -1, "%s: signal %s not found" % \
+            (name, names[-2 - cycles] if -2 - cycles < len(names) else "clk")
+
+    # (everything at once: only the first mismatch is reported)
+    prefix = "%s (seed %d, cxxrtl)" % (name, sim_seed)
+    expected = np.array([[test.do[muxid][i] for i in range(tlen)]
+                         for muxid in range(n_rows)], dtype=np.uint64)
+    received = np.arange(tlen)[None, :] < n_out[:, None]
+    bad = received & ((out_muxid != np.arange(n_rows)[:, None]) |
+                      (out_z != expected))
+    for muxid, i in zip(*np.nonzero(bad)):
+        out_muxid_i = int(out_muxid[muxid, i])
+        out_z_i = int(out_z[muxid, i])
+        assert muxid == out_muxid_i, "%s: out_muxid %d not correct %d" % \
+                                     (prefix, out_muxid_i, muxid)
+        assert test.do[muxid][i] == out_z_i, \
+            "%s: muxid %d vector %d: %s got %s expected %s" % \
+                (prefix, muxid, i, list(map(hex, test.di[muxid][i])),
+                 hex(out_z_i), hex(test.do[muxid][i]))
+    assert cycles >= 0, "%s: timed out after %d cycles, results %s of %d" % \
+            (prefix, max_cycles, list(n_out), tlen)
+    return cycles
@@ -6,15 +6,18 @@
 """
 
 import os
-from random import randint
+from random import randint, seed
+from ieee754.fpcommon.test.golden import as_operands, expected_bits
+from ieee754.fpcommon.test.rtlil_cache import write_rtlil
+from ieee754.fpcommon.test.cxxrtl_sim import runfp_cxxrtl
 from nmigen.compat.sim import run_simulation
-from nmigen.cli import verilog, rtlil
 
 
 class MuxInOut:
     def __init__(self, dut, width, fpkls, fpop, vals, single_op, opcode,
-                       cancel=False, feedback_width=None):
+                       cancel=False, feedback_width=None, stream=False):
         self.cancel = cancel # allow (test) cancellation
+        self.stream = stream # send back-to-back, not waiting for results
         self.dut = dut
         self.fpkls = fpkls
         self.fpop = fpop
@@ -29,6 +32,10 @@ class MuxInOut:
             feedback_width = dut.num_rows
         self.feedback_width = feedback_width
         self.out_offs = dut.num_rows - feedback_width
+        # expected results: all in one go (NumPy) where possible, else sfpy
+        ops = as_operands(vals)
+        expected = expected_bits(fpop, width, ops[:self.tlen*feedback_width])
+        idx = 0
         for muxid in range(feedback_width):
             muxid_in = muxid
             muxid_out = muxid
@@ -37,37 +44,33 @@ class MuxInOut:
             self.sent[muxid_in] = []
 
             for i in range(self.tlen):
+                op = ops[idx]
                 if self.single_op:
-                    #print ("vals", vals)
-                    op1 = vals.pop(0)
-                    if isinstance(op1, tuple):
-                        assert len(op1) == 1
-                        op1 = op1[0]
-                    res = self.fpop(self.fpkls(op1))
-                    self.di[muxid_in][i] = (op1, )
+                    assert len(op) == 1
+                self.di[muxid_in][i] = op
+                if expected is not None:
+                    self.do[muxid_out][i] = expected[idx]
                 else:
-                    (op1, op2, ) = vals.pop(0)
-                    #print ("test", hex(op1), hex(op2))
-                    res = self.fpop(self.fpkls(op1), self.fpkls(op2))
-                    self.di[muxid_in][i] = (op1, op2)
-                if hasattr(res, "bits"):
-                    self.do[muxid_out][i] = res.bits
-                else:
-                    self.do[muxid_out][i] = res # for FP to INT
+                    res = self.fpop(*map(self.fpkls, op))
+                    if hasattr(res, "bits"):
+                        self.do[muxid_out][i] = res.bits
+                    else:
+                        self.do[muxid_out][i] = res # for FP to INT
+                idx += 1
 
     def send(self, muxid):
         rs = self.dut.p[muxid]
         for i in range(self.tlen):
-            if self.single_op:
-                op1, = self.di[muxid][i]
-            else:
-                op1, op2 = self.di[muxid][i]
+            ops = self.di[muxid][i]
+            op1 = ops[0]
             yield rs.valid_i.eq(1)
             yield rs.data_i.a.eq(op1)
             if self.opcode is not None:
                 yield rs.data_i.ctx.op.eq(self.opcode)
             if not self.single_op:
-                yield rs.data_i.b.eq(op2)
+                yield rs.data_i.b.eq(ops[1])
+                if len(ops) == 3:
+                    yield rs.data_i.c.eq(ops[2])
             yield rs.data_i.muxid.eq(muxid)
             if hasattr(rs, "mask_i"):
                 yield rs.mask_i.eq(1) # TEMPORARY HACK
@@ -77,23 +80,12 @@ class MuxInOut:
                 yield
                 o_p_ready = yield rs.ready_o
 
-            if self.single_op:
-                fop1 = self.fpkls(op1)
-                res = self.fpop(fop1)
-                if hasattr(res, "bits"):
-                    r = res.bits
-                else:
-                    r = res
-                print("send", muxid, i, hex(op1), hex(r),
-                              fop1, res)
-            else:
-                fop1 = self.fpkls(op1)
-                fop2 = self.fpkls(op2)
-                res = self.fpop(fop1, fop2)
-                print("send", muxid, i, hex(op1), hex(op2), hex(res.bits),
-                              fop1, fop2, res)
+            print("send", muxid, i, *map(hex, ops),
+                          hex(self.do[muxid][i]))
 
             self.sent[muxid].append(i)
+            if self.stream:
+                continue
 
             yield rs.valid_i.eq(0)
             if hasattr(rs, "mask_i"):
@@ -160,7 +152,7 @@ class MuxInOut:
                 print ("cancelled/recv", muxid, hex(out_z))
                 continue
 
-            out_i = self.sent[muxid].pop()
+            out_i = self.sent[muxid].pop(0) # (in order, if streaming)
 
             print("recv", out_muxid, hex(out_z), "expected",
                   hex(self.do[muxid][out_i]))
@@ -169,7 +161,10 @@ class MuxInOut:
             assert muxid == out_muxid, "out_muxid %d not correct %d" % \
                                        (out_muxid, muxid)
 
-            assert self.do[muxid][out_i] == out_z
+            assert self.do[muxid][out_i] == out_z, \
+                "muxid %d vector %d: %s got %s expected %s" % \
+                    (muxid, out_i, list(map(hex, self.di[muxid][out_i])),
+                     hex(out_z), hex(self.do[muxid][out_i]))
 
             print ("senddel", muxid, out_i, self.sent[muxid])
             del self.do[muxid][out_i]
@@ -181,7 +176,7 @@ class MuxInOut:
         print("recv ended", muxid)
 
 
-def create_random(num_rows, width, single_op=False, n_vals=10):
+def create_random(num_rows, width, single_op=False, n_vals=10, n_ops=2):
     vals = []
     for muxid in range(num_rows):
         for i in range(n_vals):
@@ -280,7 +275,11 @@ def create_random(num_rows, width, single_op=False, n_vals=10):
                 #op1 = 0x656c
                 #op1 = 0x738c
 
-                vals.append((op1, op2,))
+                if n_ops == 3:
+                    op3 = randint(0, (1 << width)-1)
+                    vals.append((op1, op2, op3,))
+                else:
+                    vals.append((op1, op2,))
     return vals
 
 
@@ -295,34 +294,89 @@ def repeat(num_rows, vals):
     return vals + [vals[-1]] * n_to_repeat
 
 
-def pipe_cornercases_repeat(dut, name, mod, fmod, width, fn, cc, fpfn, count,
-                            single_op=False, opcode=None):
-    for i, fixed_num in enumerate(cc(mod)):
-        vals = fn(mod, fixed_num, count, width, single_op)
-        vals = repeat(dut.num_rows, vals)
-        #print ("repeat", i, fn, single_op, list(vals))
-        fmt = "test_pipe_fp%d_%s_cornercases_%d"
-        runfp(dut, width, fmt % (width, name, i),
-              fmod, fpfn, vals=vals, single_op=single_op, opcode=opcode)
+def get_trace():
+    """ IEEE754FPU_TRACE sets the default runfp tracing policy:
+
+        * "failure" (default) - untraced, then if a test fails it is run
+                                again (same seed) with a VCD, which stops
+                                at the failing vector
+        * "always"            - always write the VCD (much slower)
+        * "never"             - no VCD at all
+    """
+    return os.environ.get("IEEE754FPU_TRACE", "failure")
+
+
+def get_sim(default="pysim"):
+    """ IEEE754FPU_SIM sets the default runfp simulator:
+
+        * "pysim" (default) - nmigen's python simulator
+        * "cxxrtl"          - compiled, see cxxrtl_sim.py (no tracing)
+    """
+    return os.environ.get("IEEE754FPU_SIM", default)
 
 
 def runfp(dut, width, name, fpkls, fpop, single_op=False, n_vals=10,
-          vals=None, opcode=None, cancel=False, feedback_width=None):
-    if not os.path.exists("sim_out"):
-        os.makedirs("sim_out")
-    vl = rtlil.convert(dut, ports=dut.ports())
-    with open("sim_out/%s.il" % name, "w") as f:
-        f.write(vl)
+          vals=None, opcode=None, cancel=False, feedback_width=None,
+          n_ops=2, trace=None, sim_seed=None, sim=None, stream=False):
+    """ runs vals (random if None) through dut, checking against fpop.
+
+        sim_seed (random if None) seeds the send/receive timing: it and
+        the failing vector are in the AssertionError, on a failure.
+        trace: see get_trace.  sim: see get_sim.  stream: send each
+        row's values back-to-back (full throughput), rather than one at
+        a time, with random gaps.
+    """
+    if sim is None:
+        sim = get_sim()
+    assert sim in ("pysim", "cxxrtl"), sim
+    if trace is None:
+        trace = get_trace()
+    assert trace in ("failure", "always", "never"), trace
+    if sim_seed is None:
+        sim_seed = randint(0, (1<<32)-1)
+
+    os.makedirs("sim_out", exist_ok=True)
+    write_rtlil(dut, "sim_out/%s.il" % name) # cached: see rtlil_cache.py
 
     if vals is None:
-        vals = create_random(dut.num_rows, width, single_op, n_vals)
-
-    test = MuxInOut(dut, width, fpkls, fpop, vals, single_op, opcode=opcode)
-    fns = []
-    n_rows = dut.num_rows
-    if feedback_width is not None:
-        n_rows = feedback_width
-    for i in range(n_rows):
-        fns.append(test.rcv(i))
-        fns.append(test.send(i))
-    run_simulation(dut, {"sync": fns}, vcd_name="sim_out/%s.vcd" % name)
+        vals = create_random(dut.num_rows, width, single_op, n_vals, n_ops)
+    vals = as_operands(vals) # (simulate may be called twice)
+
+    if sim == "cxxrtl":
+        runfp_cxxrtl(dut, width, name, fpkls, fpop, single_op, vals=vals,
+                     opcode=opcode, feedback_width=feedback_width,
+                     sim_seed=sim_seed, stream=stream)
+        return
+
+    def simulate(vcd_name):
+        seed(sim_seed)
+        test = MuxInOut(dut, width, fpkls, fpop, vals, single_op,
+                        opcode=opcode, stream=stream)
+        fns = []
+        n_rows = dut.num_rows
+        if feedback_width is not None:
+            n_rows = feedback_width
+        for i in range(n_rows):
+            fns.append(test.rcv(i))
+            fns.append(test.send(i))
+        kwargs = {}
+        if vcd_name is not None:
+            kwargs["vcd_name"] = vcd_name
+        run_simulation(dut, {"sync": fns}, **kwargs)
+
+    vcd_name = "sim_out/%s.vcd" % name
+    if trace == "always":
+        simulate(vcd_name)
+        return
+    try:
+        simulate(None)
+    except AssertionError as e:
+        msg = "%s (seed %d): %s" % (name, sim_seed, e)
+        if trace == "failure":
+            print("runfp failed, re-running with tracing:", msg)
+            try:
+                simulate(vcd_name)
+            except Exception: # (expected: the same failure)
+                pass
+            msg += ", trace in %s" % vcd_name
+        raise AssertionError(msg) from e
@@ -0,0 +1,196 @@
+"""batch ("golden") reference results for the FP unit tests, using NumPy
+
+MuxInOut used to work out each expected result one at a time, wrapping
+the operands in sfpy Float16/32/64 and calling the python op.  for the
+operations that NumPy rounds correctly (IEEE754 round-to-nearest-even,
+result the same width as the operands: add, sub, mul, truediv, sqrt) the
+whole array of expected results is instead computed in one go, from the
+raw bits.
+
+NaN results are made canonical (positive, quiet, no payload) as RISC-V
+requires, which is also what berkeley-softfloat.patch (SPECIALIZE_TYPE
+RISCV) makes sfpy do.
+
+anything else (FMA, conversions, FP to INT...) gives None, and the
+caller falls back to sfpy.  a test-local op may say which NumPy ufunc
+(or function of arrays) it is, by setting an "np_op" attribute:
+
+    def sqrt(x):
+        return x.sqrt()
+    sqrt.np_op = np.sqrt
+
+np_op is given the operands as floats of the operand width (.view() gets
+the raw bits back, e.g. for INT to FP), and may return floats of any
+width (NaNs are made canonical for that width) or unsigned ints (raw
+bits).  rsqrt, fclass, fcvt_op, f2int_op and int2f_op below are the
+ones for the single-operand units.
+"""
+
+import math
+import operator
+
+import numpy as np
+
+
+UINT_TYPES = {16: np.uint16, 32: np.uint32, 64: np.uint64}
+INT_TYPES = {16: np.int16, 32: np.int32, 64: np.int64}
+FLOAT_TYPES = {16: np.float16, 32: np.float32, 64: np.float64}
+CANONICAL_NAN = {16: 0x7e00, 32: 0x7fc00000, 64: 0x7ff8000000000000}
+
+NP_OPS = {operator.add: np.add,
+          operator.sub: np.subtract,
+          operator.mul: np.multiply,
+          operator.truediv: np.divide,
+         }
+
+
+def get_np_op(fpop):
+    """ the NumPy ufunc doing the same as fpop, or None
+    """
+    np_op = getattr(fpop, "np_op", None)
+    if np_op is not None:
+        return np_op
+    return NP_OPS.get(fpop)
+
+
+def _as_tuple(v):
+    if isinstance(v, np.ndarray):
+        v = v.tolist()
+    if isinstance(v, (tuple, list)):
+        return tuple(int(x) for x in v)
+    return (int(v),)
+
+
+def as_operands(vals):
+    """ test values (ints, tuples of ints, or an array of either, one
+        row per test) as a list of tuples of python ints
+    """
+    if isinstance(vals, np.ndarray):
+        vals = vals.tolist()
+    return list(map(_as_tuple, vals))
+
+
+def expected_bits(fpop, width, ops):
+    """ expected results of fpop (as raw bits) for ops, a list of operand
+        tuples (see as_operands), or None if fpop is not supported
+    """
+    np_op = get_np_op(fpop)
+    if np_op is None or width not in FLOAT_TYPES or not ops:
+        return None
+    n_ops = len(ops[0])
+    if n_ops != getattr(np_op, "nin", n_ops):
+        return None
+
+    utype, ftype = UINT_TYPES[width], FLOAT_TYPES[width]
+    bits = np.array(ops, dtype=utype).reshape(len(ops), n_ops)
+    args = [np.ascontiguousarray(bits[:, i]).view(ftype)
+            for i in range(n_ops)]
+    with np.errstate(all='ignore'):
+        res = np_op(*args)
+    if res.dtype.kind == 'u':
+        return res.tolist()
+    if res.dtype.kind != 'f':
+        return None
+
+    res_width = res.dtype.itemsize * 8
+    res_bits = res.view(UINT_TYPES[res_width]).copy()
+    res_bits[np.isnan(res)] = CANONICAL_NAN[res_width]
+    return res_bits.tolist()
+
+
+def _rsqrt_bits(bits, m_width, e_width):
+    """ 1/sqrt of one positive, finite, non-zero FP number (raw bits),
+        correctly rounded: exact integer arithmetic (isqrt), then one
+        round-to-nearest-even.  the result is always a normal number.
+    """
+    bias = (1 << (e_width-1)) - 1
+    p = m_width + 1
+    be = bits >> m_width
+    m = bits & ((1 << m_width) - 1)
+    if be == 0:
+        e = 1 - bias - m_width # denormal
+    else:
+        m |= 1 << m_width
+        e = be - bias - m_width
+    if e & 1:
+        m, e = m << 1, e - 1
+    # x = m * 2^e (e even): 1/sqrt(x) = 2^(k - e/2) / sqrt(m) / 2^k,
+    # and q = floor(2^k / sqrt(m)) = isqrt(floor(2^2k / m)), p+3 bits or more
+    k = 2*p + 4
+    q = math.isqrt((1 << (2*k)) // m)
+    exact = q * q * m == 1 << (2*k)
+    s = q.bit_length() - p
+    mant, rem, half = q >> s, q & ((1 << s) - 1), 1 << (s-1)
+    if rem > half or (rem == half and (not exact or mant & 1)):
+        mant += 1
+    e_out = s - k - e // 2 + m_width + bias
+    if mant == 1 << p:
+        mant, e_out = mant >> 1, e_out + 1
+    assert 0 < e_out < (1 << e_width) - 1, (hex(bits), e_out)
+    return (e_out << m_width) | (mant & ((1 << m_width) - 1))
+
+
+def rsqrt(x):
+    """ 1/sqrt(x), correctly rounded (at any width: see _rsqrt_bits)
+    """
+    width = x.dtype.itemsize * 8
+    m_width = np.finfo(x.dtype).nmant
+    with np.errstate(all='ignore'):
+        res = np.divide(1, np.sqrt(x), dtype=x.dtype) # NaN, -ve, 0, inf
+    res_bits = res.view(UINT_TYPES[width]).copy()
+    finite = np.isfinite(x) & (x > 0)
+    res_bits[finite] = [_rsqrt_bits(int(b), m_width, width - 1 - m_width)
+                        for b in x.view(UINT_TYPES[width])[finite]]
+    return res_bits.view(x.dtype)
+
+
+def fclass(x):
+    """ the RISC-V FCLASS bitfield of each of x (same width as x)
+    """
+    width = x.dtype.itemsize * 8
+    bits = x.view(UINT_TYPES[width])
+    m_width = np.finfo(x.dtype).nmant
+    neg = np.signbit(x)
+    quiet = ((bits >> (m_width - 1)) & 1) != 0
+    subnormal = (x != 0) & (np.abs(x) < np.finfo(x.dtype).tiny)
+    normal = np.isfinite(x) & (x != 0) & ~subnormal
+    cls = np.select([np.isinf(x) & neg, normal & neg, subnormal & neg,
+                     (x == 0) & neg, (x == 0) & ~neg, subnormal & ~neg,
+                     normal & ~neg, np.isinf(x) & ~neg,
+                     np.isnan(x) & ~quiet, np.isnan(x) & quiet],
+                    [1<<i for i in range(10)])
+    return cls.astype(UINT_TYPES[width])
+
+
+def fcvt_op(width):
+    """ FP to FP conversion (to width), rounded to nearest even
+    """
+    def fcvt(x):
+        return x.astype(FLOAT_TYPES[width])
+    return fcvt
+
+
+def f2int_op(width, signed):
+    """ FP to (un)signed INT conversion, rounded to nearest even, and
+        saturated as RISC-V does: NaN gives the largest INT
+    """
+    lo, hi = (-(1 << (width-1)), (1 << (width-1)) - 1) if signed \
+             else (0, (1 << width) - 1)
+    def f2int(x):
+        res = np.rint(x.astype(np.float64))
+        res[np.isnan(res)] = hi
+        res = np.clip(res, lo, hi).astype(np.int64)
+        return (res & ((1 << width) - 1)).astype(UINT_TYPES[width])
+    return f2int
+
+
+def int2f_op(width, signed):
+    """ (un)signed INT (the operand's raw bits) to FP (of width)
+        conversion, rounded to nearest even
+    """
+    def int2f(x):
+        bits = x.view(UINT_TYPES[x.dtype.itemsize * 8])
+        if signed:
+            bits = bits.view(INT_TYPES[bits.dtype.itemsize * 8])
+        return bits.astype(FLOAT_TYPES[width])
+    return int2f
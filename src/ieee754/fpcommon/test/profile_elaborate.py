@@ -0,0 +1,288 @@
+""" profiling of where the time (and memory) goes in building a unit
+
+    FPDIVMuxInOut(64, 8) or Mul8_16_32_64 take a long time, and a lot of
+    memory, in python, before any simulation starts.  ElaborationProfiler
+    (a context manager) records, for every call, the wall time (inclusive
+    and exclusive of the calls inside it), optionally the memory
+    allocated (tracemalloc: slower), and for an elaborate the number of
+    (unique) AST nodes in the statements of the resulting fragment and
+    its number of submodules:
+
+    * every Elaboratable's elaborate (nmigen's Fragment.get)
+    * every PipeModBase stage's __init__, setup and process
+
+    which are then summed up per class, to show which stages dominate.
+    the PipeModBase (sub)classes that are patched are those imported by
+    the time the profiler is entered.
+
+        with ElaborationProfiler() as prof:
+            with prof.phase("construct"):
+                dut = FPDIVMuxInOut(64, 8)
+            with prof.phase("elaborate"):
+                Fragment.get(dut, None)
+        prof.print_report()
+
+    or, for the units of bench_synth, writing sim_out/profile_<unit>_
+    <width>.json:
+
+        python3 profile_elaborate.py unit [width] [memory] [convert]
+
+    (convert: also time nmigen's prepare and RTLIL conversion, as phases)
+"""
+
+import os
+import sys
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+from nmigen.hdl.ast import (Operator, Slice, Part, Cat, Repl, ArrayProxy,
+                            Assign, Switch, Property, Sample)
+from nmigen.hdl.ir import Fragment
+from nmigen.back import rtlil
+from nmutil.pipemodbase import PipeModBase
+
+
+PATCHED_METHODS = ("__init__", "setup", "process")
+
+
+def _children(node):
+    if isinstance(node, Operator):
+        return node.operands
+    if isinstance(node, Slice):
+        return [node.value]
+    if isinstance(node, Part):
+        return [node.value, node.offset]
+    if isinstance(node, Cat):
+        return node.parts
+    if isinstance(node, Repl):
+        return [node.value]
+    if isinstance(node, ArrayProxy):
+        return list(node.elems) + [node.index]
+    if isinstance(node, Assign):
+        return [node.lhs, node.rhs]
+    if isinstance(node, Switch):
+        return [node.test] + [stmt for stmts in node.cases.values()
+                              for stmt in stmts]
+    if isinstance(node, Property):
+        return [node.test]
+    if isinstance(node, Sample):
+        return [node.value]
+    return []
+
+
+def count_nodes(statements):
+    """ the number of unique AST nodes (statements and values) in
+        statements: shared sub-expressions are counted once
+    """
+    seen = set()
+    todo = list(statements)
+    while todo:
+        node = todo.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        todo.extend(_children(node))
+    return len(seen)
+
+
+def _subclasses(kls):
+    yield kls
+    for sub in kls.__subclasses__():
+        yield from _subclasses(sub)
+
+
+class _Frame:
+    def __init__(self, kind, kls, mem):
+        self.kind = kind
+        self.kls = kls
+        self.start = time.perf_counter()
+        self.mem = mem
+        self.child_time = 0.0
+        self.child_mem = 0
+
+
+class ElaborationProfiler:
+    """ see above.  records holds one dict per call.
+    """
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self._stack = []
+        self._patched = []
+        self._fragments = {} # id(fragment): (fragment, record)
+        self._top = None
+
+    def _mem(self):
+        if not self.memory:
+            return 0
+        return tracemalloc.get_traced_memory()[0]
+
+    def _enter(self, kind, kls):
+        self._stack.append(_Frame(kind, kls, self._mem()))
+
+    def _exit(self):
+        frame = self._stack.pop()
+        elapsed = time.perf_counter() - frame.start
+        alloc = self._mem() - frame.mem
+        if self._stack:
+            self._stack[-1].child_time += elapsed
+            self._stack[-1].child_mem += alloc
+        rec = {"kind": frame.kind, "class": frame.kls,
+               "time": elapsed - frame.child_time, "time_incl": elapsed,
+               "alloc": alloc - frame.child_mem, "alloc_incl": alloc}
+        self.records.append(rec)
+        return rec
+
+    @contextmanager
+    def phase(self, name):
+        """ records the block as a call ("phase" name)
+        """
+        self._enter("phase", name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def _wrap(self, kind, fn):
+        prof = self
+        @functools.wraps(fn)
+        def wrapper(obj, *args, **kwargs):
+            prof._enter(kind, type(obj).__qualname__)
+            try:
+                return fn(obj, *args, **kwargs)
+            finally:
+                prof._exit()
+        return wrapper
+
+    def _patch(self, owner, name, new):
+        self._patched.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, new)
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start()
+        get = Fragment.get
+        prof = self
+        def profiled_get(obj, platform):
+            if isinstance(obj, Fragment):
+                return get(obj, platform)
+            prof._enter("elaborate", type(obj).__qualname__)
+            try:
+                fragment = get(obj, platform)
+            finally:
+                rec = prof._exit()
+            prof._fragments[id(fragment)] = (fragment, rec)
+            prof._top = fragment
+            return fragment
+        self._patch(Fragment, "get", staticmethod(profiled_get))
+        for kls in set(_subclasses(PipeModBase)):
+            for name in PATCHED_METHODS:
+                if name in kls.__dict__:
+                    self._patch(kls, name,
+                                self._wrap(name.strip("_"),
+                                           kls.__dict__[name]))
+        return self
+
+    def __exit__(self, *args):
+        for owner, name, orig in reversed(self._patched):
+            setattr(owner, name, orig)
+        self._patched = []
+        if self.memory:
+            tracemalloc.stop()
+        self._name_fragments()
+
+    def _name_fragments(self):
+        """ gives each elaborate record the node and submodule counts, and
+            the hierarchical name, of its fragment, within the last
+            (top-level) one elaborated.  (done here, not timed.)
+        """
+        for fragment, rec in self._fragments.values():
+            rec["nodes"] = count_nodes(fragment.statements)
+            rec["submodules"] = len(fragment.subfragments)
+        if self._top is None:
+            return
+        todo = [(self._top, "top")]
+        while todo:
+            fragment, path = todo.pop()
+            if id(fragment) in self._fragments:
+                self._fragments[id(fragment)][1]["path"] = path
+            for i, (sub, name) in enumerate(fragment.subfragments):
+                todo.append((sub, "%s.%s" % (path, name or "U$%d" % i)))
+        self._fragments = {}
+        self._top = None
+
+    def by_class(self):
+        """ the records summed up per (kind, class), most time first
+        """
+        totals = {}
+        for rec in self.records:
+            key = (rec["kind"], rec["class"])
+            tot = totals.setdefault(key, {"kind": rec["kind"],
+                                          "class": rec["class"],
+                                          "calls": 0, "time": 0.0,
+                                          "alloc": 0, "nodes": 0,
+                                          "submodules": 0})
+            tot["calls"] += 1
+            for k in ("time", "alloc", "nodes", "submodules"):
+                tot[k] += rec.get(k, 0)
+        return sorted(totals.values(), key=lambda t: -t["time"])
+
+    def report(self):
+        phases = [rec for rec in self.records if rec["kind"] == "phase"]
+        return {"phases": {rec["class"]: rec["time_incl"] for rec in phases},
+                "memory": self.memory,
+                "by_class": self.by_class(),
+                "records": self.records}
+
+    def print_report(self, n=20):
+        for rec in self.records:
+            if rec["kind"] == "phase":
+                print("%-10s %8.2fs" % (rec["class"], rec["time_incl"]))
+        print("%-10s %-40s %6s %8s %10s %8s" % ("kind", "class", "calls",
+                                               "time", "alloc", "nodes"))
+        for tot in self.by_class()[:n]:
+            if tot["kind"] == "phase":
+                continue
+            print("%-10s %-40s %6d %7.2fs %10d %8d" % (tot["kind"],
+                        tot["class"][:40], tot["calls"], tot["time"],
+                        tot["alloc"], tot["nodes"]))
+
+
+def profile_unit(name, width, memory=False, convert=False):
+    """ profiles the construction and elaboration of a bench_synth unit,
+        and (convert=True) its conversion to RTLIL
+    """
+    from ieee754.fpcommon.test.bench_synth import UNITS
+    create = UNITS[name][0]
+    with ElaborationProfiler(memory) as prof:
+        with prof.phase("construct"):
+            dut, ports = create(*width)
+        with prof.phase("elaborate"):
+            fragment = Fragment.get(dut, None)
+        if convert:
+            with prof.phase("prepare"):
+                fragment = fragment.prepare(ports=ports)
+            with prof.phase("rtlil"):
+                rtlil.convert_fragment(fragment, "top")
+    return prof
+
+
+if __name__ == '__main__':
+    from ieee754.fpcommon.test.bench_synth import UNITS, width_name
+    name = sys.argv[1]
+    width = UNITS[name][1][-1]
+    if len(sys.argv) > 2:
+        width = tuple(map(int, sys.argv[2].split("_")))
+    if not isinstance(width, tuple):
+        width = (width,)
+    prof = profile_unit(name, width, "memory" in sys.argv[3:],
+                        "convert" in sys.argv[3:])
+    os.makedirs("sim_out", exist_ok=True)
+    fname = os.path.join("sim_out", "profile_%s_%s.json" % \
+                                    (name, width_name(width)))
+    with open(fname, "w") as f:
+        json.dump(prof.report(), f, indent=1)
+    prof.print_report()
@@ -0,0 +1,137 @@
+"""on-disk cache of the RTLIL that runfp writes out for each test
+
+runfp writes sim_out/<name>.il for every test, and converting e.g. the
+FP64 divider's ALU takes several seconds, for what is mostly the same
+DUT over and over (run_pipe_fp's corner cases alone call runfp a dozen
+times).
+the RTLIL is instead kept in sim_out/rtlil_cache/<key>.il, where the key
+is a hash of:
+
+* the DUT's configuration: its class, and (recursively) the classes and
+  plain values (ints, strings, lists...) of its attributes, which covers
+  the PipelineSpec(s): width, id_wid, op_wid, n_comb_stages, core_config
+  etc., and which sub-module classes got used (e.g. FPCVT's modkls)
+* the source of the ieee754 and nmutil packages, and the nmigen version
+
+so that a rerun (or a repeated runfp on the same DUT) just copies the
+cached file.  deleting sim_out/rtlil_cache clears it.  the key of a DUT
+that was elaborated before its first runfp will not match (a miss, not
+a wrong hit).
+
+only the RTLIL emission is skipped, not the elaboration: the simulator
+(run_simulation) still elaborates the DUT on every runfp, as it needs
+the live nmigen objects, which cannot be kept on disk.  that is the
+smaller part: of the 5.7s that rtlil.convert takes on the FP64
+divider's ALU, 1.0s is elaborating it.
+"""
+
+import os
+import enum
+import types
+import hashlib
+import shutil
+import weakref
+
+import nmigen
+from nmigen import Module, Value
+from nmigen.cli import rtlil
+
+
+CACHE_DIR = os.path.join("sim_out", "rtlil_cache")
+
+_source_hash = None
+_keys = weakref.WeakKeyDictionary() # dut: key (not keeping dut alive)
+
+
+def source_hash():
+    """ hash of the ieee754 and nmutil python sources (once per process)
+    """
+    global _source_hash
+    if _source_hash is not None:
+        return _source_hash
+    import ieee754
+    import nmutil
+    h = hashlib.sha256()
+    h.update(str(getattr(nmigen, "__version__", None)).encode())
+    for pkg in (ieee754, nmutil):
+        root = os.path.dirname(pkg.__file__)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for fname in sorted(filenames):
+                if not fname.endswith(".py"):
+                    continue
+                path = os.path.join(dirpath, fname)
+                h.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    h.update(f.read())
+    _source_hash = h.hexdigest()
+    return _source_hash
+
+
+def _kls_name(kls):
+    return "%s.%s" % (kls.__module__, kls.__qualname__)
+
+
+def _config(obj, seen, depth):
+    """ a (deterministic) description of obj's configuration: classes and
+        plain values, skipping nmigen Values and "private" attributes
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return repr(obj)
+    if isinstance(obj, enum.Enum):
+        return repr(obj)
+    if isinstance(obj, type):
+        return _kls_name(obj)
+    if isinstance(obj, (Value, Module)):
+        return "-"
+    if isinstance(obj, (types.FunctionType, types.BuiltinFunctionType)):
+        return "%s.%s" % (obj.__module__, obj.__qualname__)
+    if isinstance(obj, types.MethodType):
+        return _config(obj.__func__, seen, depth)
+    if id(obj) in seen or depth == 0:
+        return _kls_name(type(obj))
+    seen.add(id(obj))
+    if isinstance(obj, (list, tuple)):
+        return "[%s]" % ",".join(_config(o, seen, depth-1) for o in obj)
+    if isinstance(obj, dict):
+        items = sorted((repr(k), _config(v, seen, depth-1))
+                       for (k, v) in obj.items())
+        return "{%s}" % ",".join("%s:%s" % kv for kv in items)
+    if not hasattr(obj, "__dict__"):
+        return _kls_name(type(obj))
+    items = sorted((k, v) for (k, v) in vars(obj).items()
+                   if not k.startswith("_"))
+    return "%s(%s)" % (_kls_name(type(obj)),
+                       ",".join("%s=%s" % (k, _config(v, seen, depth-1))
+                                for (k, v) in items))
+
+
+def config_key(dut, depth=8):
+    """ the cache key for dut: a hash of its configuration and the source.
+
+        elaborating adds attributes (Modules, stage data...), so the key
+        is worked out once per DUT object, the first time (before runfp
+        elaborates it).
+    """
+    if dut in _keys:
+        return _keys[dut]
+    h = hashlib.sha256()
+    h.update(_config(dut, set(), depth).encode())
+    h.update(source_hash().encode())
+    _keys[dut] = h.hexdigest()
+    return h.hexdigest()
+
+
+def write_rtlil(dut, fname):
+    """ writes dut's RTLIL to fname, from the cache if it is there
+    """
+    cached = os.path.join(CACHE_DIR, config_key(dut) + ".il")
+    if not os.path.exists(cached):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        vl = rtlil.convert(dut, ports=dut.ports())
+        # write-then-rename: other (sharded) test processes may be reading
+        tmp = "%s.%d" % (cached, os.getpid())
+        with open(tmp, "w") as f:
+            f.write(vl)
+        os.replace(tmp, cached)
+    shutil.copyfile(cached, fname)
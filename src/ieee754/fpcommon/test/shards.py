@@ -0,0 +1,96 @@
+"""sharded (multi-process) running of FP pipeline test campaigns
+
+a campaign (PipeFPCase, run_pipe_fp) is a list of independent jobs: one
+runfp call each, (name, vals).  the jobs are dealt out round-robin into
+n_workers shards, and each shard runs in its own (forked) process, with
+its own copy of the DUT, elaborated and simulated there.  every shard
+seeds "random" (the send/receive timing in MuxInOut) from the campaign
+seed plus the shard number, and reports pass/fail per job: these are
+merged back into one report (also written to sim_out/<name>_shards.json).
+
+forking is needed (no pickling of DUTs or test-local functions), so this
+is unix-only.  a campaign is reproduced by passing the same seed and
+n_workers again.
+"""
+
+import os
+import json
+import random
+import traceback
+import multiprocessing
+from queue import Empty
+
+
+def shard_jobs(jobs, n_shards):
+    """ deals the jobs out round-robin, so that each shard gets a mix
+    """
+    return [jobs[i::n_shards] for i in range(n_shards)]
+
+
+def _run_shard(queue, shard, seed, jobs, run_job):
+    random.seed(seed)
+    results = []
+    for name, vals in jobs:
+        try:
+            run_job(name, vals)
+            results.append({"name": name, "passed": True})
+        except Exception:
+            results.append({"name": name, "passed": False,
+                            "error": traceback.format_exc()})
+    queue.put({"shard": shard, "seed": seed, "jobs": results})
+
+
+def run_shards(name, jobs, n_workers, run_job, seed):
+    """ runs the jobs (calling run_job(name, vals) for each) in n_workers
+        processes, returning the report: one entry per shard.  raises
+        AssertionError listing the failed jobs, and their shard seeds.
+    """
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    shards = shard_jobs(jobs, max(1, min(n_workers, len(jobs))))
+    procs = []
+    for shard, sjobs in enumerate(shards):
+        p = ctx.Process(target=_run_shard,
+                        args=(queue, shard, seed + shard, sjobs, run_job))
+        p.start()
+        procs.append(p)
+
+    # collect before joining (a full queue would block the workers)
+    report = {}
+    while len(report) < len(procs):
+        try:
+            res = queue.get(timeout=1)
+        except Empty:
+            if not any(p.is_alive() for p in procs):
+                break
+            continue
+        report[res["shard"]] = res
+    for p in procs:
+        p.join()
+
+    # a shard that died without reporting fails all its jobs
+    for shard, sjobs in enumerate(shards):
+        if shard not in report:
+            report[shard] = {"shard": shard, "seed": seed + shard,
+                             "jobs": [{"name": n, "passed": False,
+                                       "error": "worker died (exit %s)" % \
+                                                procs[shard].exitcode}
+                                      for (n, vals) in sjobs]}
+    report = [report[shard] for shard in range(len(shards))]
+
+    os.makedirs("sim_out", exist_ok=True)
+    with open("sim_out/%s_shards.json" % name, "w") as f:
+        json.dump({"seed": seed, "n_workers": n_workers,
+                   "shards": report}, f, indent=1)
+
+    failed = ["%s (shard %d, seed %d)" % (job["name"], r["shard"], r["seed"])
+              for r in report for job in r["jobs"] if not job["passed"]]
+    n_jobs = sum(len(r["jobs"]) for r in report)
+    print("%s: %d/%d passed, %d shards, seed %d" % \
+            (name, n_jobs - len(failed), n_jobs, len(shards), seed))
+    for r in report:
+        for job in r["jobs"]:
+            if not job["passed"]:
+                print(job["error"])
+    assert not failed, "failed: %s" % ", ".join(failed)
+    return report
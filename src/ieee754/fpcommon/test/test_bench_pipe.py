@@ -0,0 +1,89 @@
+""" test of the pipeline throughput / latency benchmark
+"""
+
+from ieee754.fpcommon.test.bench_pipe import (create_unit, run_bench,
+                                              percentile, compare)
+
+import unittest
+
+
+class BenchPipeTestCase(unittest.TestCase):
+
+    def bench(self, unit, **kwargs):
+        alu, opcode, n_operands = create_unit(unit, 16, 4)
+        return run_bench(alu, 16, 4, opcode, n_operands, n_ops=40,
+                         **kwargs)
+
+    def test_percentile(self):
+        vals = list(range(1, 101))
+        self.assertEqual(percentile(vals, 50), 50)
+        self.assertEqual(percentile(vals, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_full_load(self):
+        res = self.bench("add")
+        self.assertEqual(res["completed"], 40)
+        self.assertEqual(res["lost"], 0)
+        # no backpressure: one result per cycle, fixed latency
+        self.assertGreater(res["ops_per_cycle"], 0.8)
+        lat = res["pipe_latency"]
+        self.assertEqual(lat["min"], lat["max"])
+        self.assertEqual(lat["hist"], {str(lat["min"]): 40})
+        self.assertEqual(sum(res["occupancy"]["hist"].values()),
+                         res["cycles"])
+
+    def test_stall(self):
+        res = self.bench("mul", stall=0.5, load=0.5)
+        self.assertEqual(res["completed"], 40)
+        self.assertLess(res["ops_per_cycle"], 0.5)
+        self.assertGreater(res["latency"]["max"], res["latency"]["min"])
+
+    def test_cancel(self):
+        res = self.bench("div", cancel=0.5)
+        self.assertGreater(res["cancelled"], 0)
+        self.assertEqual(res["completed"] + res["cancelled"] + res["lost"],
+                         40)
+
+    def test_newton(self):
+        # the Newton-Raphson core: fewer stages than the restoring one
+        res = self.bench("div_nr")
+        self.assertEqual(res["completed"], 40)
+        self.assertLess(res["pipe_latency"]["max"],
+                        self.bench("div")["pipe_latency"]["min"])
+
+    def test_iterative(self):
+        # one operation at a time, many cycles each: cancels included
+        res = self.bench("div_iter", cancel=0.5)
+        self.assertGreater(res["cancelled"], 0)
+        self.assertEqual(res["completed"] + res["cancelled"], 40)
+        self.assertEqual(res["lost"], 0)
+        res = self.bench("div_iter")
+        self.assertEqual(res["completed"], 40)
+        self.assertLess(res["ops_per_cycle"],
+                        self.bench("div")["ops_per_cycle"])
+
+    def test_exact(self):
+        # exact results finish early: on average, well before the others
+        exact = self.bench("div_iter", trace="exact")
+        self.assertEqual(exact["completed"], 40)
+        self.assertLess(exact["pipe_latency"]["mean"],
+                        self.bench("div_iter")["pipe_latency"]["mean"])
+        # and, with lanes, out of order
+        res = self.bench("div_lanes", trace="exact", load=0.5)
+        self.assertEqual(res["completed"], 40)
+        self.assertEqual(res["lost"], 0)
+        self.assertLess(res["pipe_latency"]["min"],
+                        res["pipe_latency"]["max"])
+
+    def test_compare(self):
+        old = self.bench("add", load=0.5)
+        new = self.bench("add", load=0.5)
+        for name, o, n in compare(old, new):
+            self.assertEqual(o, n, name)
+        with self.assertRaises(AssertionError):
+            compare(old, self.bench("add"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+""" test of the yosys area / logic depth benchmark
+"""
+
+from ieee754.fpcommon.test.bench_synth import run, diff, find_yosys
+
+import unittest
+
+
+class BenchSynthTestCase(unittest.TestCase):
+
+    def test_diff(self):
+        old = {"results": [{"unit": "fsgnj", "width": "16", "cells": 24,
+                            "ff": 21, "depth": 2},
+                           {"unit": "fpadd", "width": "16", "cells": 9}]}
+        new = {"results": [{"unit": "fsgnj", "width": "16", "cells": 20,
+                            "ff": 21, "depth": 2},
+                           {"unit": "fpadd", "width": "16", "error": "x"},
+                           {"unit": "fpmax", "width": "16", "cells": 5,
+                            "ff": 2, "depth": 3}]}
+        self.assertEqual(diff(old, new),
+                         [("fsgnj", "16", "cells", 24, 20),
+                          ("fpadd", "16", "cells", 9, None),
+                          ("fpmax", "16", "cells", None, 5),
+                          ("fpmax", "16", "ff", None, 2),
+                          ("fpmax", "16", "depth", None, 3)])
+
+    def test_synth(self):
+        try:
+            find_yosys()
+        except FileNotFoundError:
+            self.skipTest("no yosys")
+        table = run(["fsgnj:16", "fpcmp:16"])
+        self.assertEqual([(r["unit"], r["width"]) for r in table["results"]],
+                         [("fpcmp", "16"), ("fsgnj", "16")])
+        for res in table["results"]:
+            self.assertNotIn("error", res)
+            self.assertGreater(res["cells"], res["ff"])
+            self.assertGreater(res["depth"], 0)
+        self.assertEqual(diff(table, table), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
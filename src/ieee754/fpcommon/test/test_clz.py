@@ -0,0 +1,53 @@
+""" exhaustive test of the CLZ/CTZ trees against PriorityEncoder
+"""
+
+from nmigen import Module
+from nmigen.lib.coding import PriorityEncoder
+from nmigen.back.pysim import Simulator, Settle
+
+from ieee754.fpcommon.clz import CLZ, CTZ
+
+import unittest
+
+
+class CLZTestCase(unittest.TestCase):
+
+    def check_tree(self, kls, width, reverse):
+        m = Module()
+        m.submodules.dut = dut = kls(width)
+        m.submodules.pe = pe = PriorityEncoder(width)
+        if reverse:
+            m.d.comb += pe.i.eq(dut.sig_in[::-1]) # clz: bit-reversed PE
+        else:
+            m.d.comb += pe.i.eq(dut.sig_in)       # ctz: PE as-is
+
+        sim = Simulator(m)
+        def process():
+            for i in range(1<<width):
+                yield dut.sig_in.eq(i)
+                yield Settle()
+                lz = yield dut.lz
+                zero = yield dut.zero
+                pe_o = yield pe.o
+                pe_n = yield pe.n
+                msg = "%s(%d) in %x out %d" % (kls.__name__, width, i, lz)
+                self.assertEqual(zero, pe_n, msg)
+                if pe_n: # all zeros: count is the full width
+                    self.assertEqual(lz, width, msg)
+                else:
+                    self.assertEqual(lz, pe_o, msg)
+
+        sim.add_process(process)
+        sim.run()
+
+    def test_clz(self):
+        for width in range(1, 10):
+            self.check_tree(CLZ, width, True)
+
+    def test_ctz(self):
+        for width in range(1, 10):
+            self.check_tree(CTZ, width, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+""" test of the compiled (CXXRTL) runfp simulator
+"""
+
+from ieee754.fpcommon.test.cxxrtl_sim import runfp_cxxrtl, unavailable
+from ieee754.fpcommon.test.fpmux import create_random
+from ieee754.fpadd.pipeline import FPADDMuxInOut
+
+import unittest
+from operator import add, sub
+
+
+@unittest.skipIf(unavailable(), "cxxrtl: %s" % unavailable())
+class CXXRTLSimTestCase(unittest.TestCase):
+
+    def test_add(self):
+        dut = FPADDMuxInOut(16, 4)
+        vals = create_random(dut.num_rows, 16, n_vals=1000)
+        cycles = runfp_cxxrtl(dut, 16, "test_cxxrtl_add16", int, add,
+                              vals=vals, sim_seed=0)
+        self.assertGreater(cycles, 1000)
+
+    def test_stream(self):
+        # back-to-back: one operation per cycle, plus the pipeline latency
+        dut = FPADDMuxInOut(16, 4)
+        vals = create_random(dut.num_rows, 16, n_vals=1000)
+        cycles = runfp_cxxrtl(dut, 16, "test_cxxrtl_stream16", int, add,
+                              vals=vals, stream=True)
+        self.assertLess(cycles, 4000 + 100)
+
+    def test_mismatch(self):
+        dut = FPADDMuxInOut(16, 4)
+        with self.assertRaises(AssertionError) as cm:
+            runfp_cxxrtl(dut, 16, "test_cxxrtl_mismatch", int, sub,
+                         vals=[(0x3c00, 0x3c00)] * 4, sim_seed=0)
+        self.assertIn("muxid 0 vector 0: ['0x3c00', '0x3c00'] got 0x4000 "
+                      "expected 0x0", str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
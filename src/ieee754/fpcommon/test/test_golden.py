@@ -0,0 +1,88 @@
+""" test of the batch (NumPy) reference results against sfpy
+"""
+
+from ieee754.fpcommon.test.golden import (expected_bits, as_operands,
+                                          CANONICAL_NAN, rsqrt as np_rsqrt,
+                                          FLOAT_TYPES, UINT_TYPES)
+from ieee754.fpcommon.test.fpmux import create_random
+from ieee754.fpdiv.test.test_fprsqrt_pipe_16 import rsqrt
+from ieee754.fclass.test.test_fclass_pipe import fclass_16
+from ieee754.fcvt.test.test_fcvt_up_pipe_16_32 import fcvt_32
+from ieee754.fcvt.test.test_fcvt_up_pipe_16_64 import fcvt_64
+from ieee754.fcvt.test.test_fcvt_f2int_pipe import (fcvt_f16_i16,
+                                                    fcvt_f16_ui16)
+
+import unittest
+import random
+import numpy as np
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from sfpy import Float16, Float32, Float64
+from operator import add, sub, mul, truediv
+
+
+def sqrt(x):
+    return x.sqrt()
+sqrt.np_op = np.sqrt
+
+
+class TestGolden(unittest.TestCase):
+
+    def check(self, fpkls, width, fpop, single_op=False, ops=None):
+        if ops is None:
+            ops = as_operands(create_random(1, width, single_op, 2000))
+        expected = expected_bits(fpop, width, ops)
+        for op, exp in zip(ops, expected):
+            res = fpop(*map(fpkls, op))
+            res = getattr(res, "bits", res)
+            self.assertEqual(res, exp, "%s %s" % (fpop.__name__,
+                                                  list(map(hex, op))))
+
+    def test_binary_ops(self):
+        for fpkls, width in ((Float16, 16), (Float32, 32), (Float64, 64)):
+            for fpop in (add, sub, mul, truediv):
+                self.check(fpkls, width, fpop)
+
+    def test_sqrt(self):
+        for fpkls, width in ((Float16, 16), (Float32, 32), (Float64, 64)):
+            self.check(fpkls, width, sqrt, single_op=True)
+
+    def test_fp16_exhaustive(self):
+        ops = [(i,) for i in range(1<<16)]
+        for fpop in (rsqrt, fclass_16, fcvt_32, fcvt_64,
+                     fcvt_f16_i16, fcvt_f16_ui16):
+            self.check(Float16, 16, fpop, ops=ops)
+
+    def test_rsqrt_exact(self):
+        # correctly rounded at every width (not FP64 then rounded): the
+        # nearest FP number to an 80-digit 1/sqrt(x)
+        for width in (16, 32, 64):
+            ftype, utype = FLOAT_TYPES[width], UINT_TYPES[width]
+            rand = random.Random(width)
+            bits = [rand.randrange(1, 1 << (width-1)) for _ in range(500)]
+            x = np.array(bits, dtype=utype).view(ftype)
+            x = x[np.isfinite(x)]
+            for xv, res in zip(x, np_rsqrt(x)):
+                with localcontext() as ctx:
+                    ctx.prec = 80
+                    ref = Fraction(1 / Decimal(float(xv)).sqrt())
+                near = ftype(float(ref))
+                cands = [near, np.nextafter(near, ftype(0)),
+                         np.nextafter(near, ftype(np.inf))]
+                exp = min(cands, key=lambda c: (abs(Fraction(float(c))-ref),
+                                                int(c.view(utype)) & 1))
+                self.assertEqual(res, exp, "rsqrt %r" % xv)
+
+    def test_canonical_nan(self):
+        # -Inf + Inf and a signalling NaN operand: both canonical NaN
+        vals = np.array([[0xfc00, 0x7c00], [0x7c01, 0x3c00]])
+        self.assertEqual(expected_bits(add, 16, as_operands(vals)),
+                         [CANONICAL_NAN[16]] * 2)
+
+    def test_unsupported(self):
+        self.assertIsNone(expected_bits(lambda x: x, 16, [(0x3c00,)]))
+        self.assertIsNone(expected_bits(add, 16, [(0x3c00,)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+""" test of the elaboration profiler
+"""
+
+from nmigen import Signal
+from nmigen.hdl.ir import Fragment
+from nmutil.pipemodbase import PipeModBase
+
+from ieee754.fpcommon.test.profile_elaborate import (count_nodes,
+                                                     profile_unit)
+
+import unittest
+
+
+class ProfileElaborateTestCase(unittest.TestCase):
+
+    def test_count_nodes(self):
+        a, b, c = Signal(4), Signal(4), Signal(4)
+        s = b + c
+        # Assign, a, +, b, c: the shared sum only counted once
+        self.assertEqual(count_nodes([a.eq(s)]), 5)
+        self.assertEqual(count_nodes([a.eq(s), c.eq(s)]), 6)
+
+    def test_profile(self):
+        get, init = Fragment.get, PipeModBase.__init__
+        prof = profile_unit("fsgnj", (16,))
+        # everything put back
+        self.assertIs(Fragment.get, get)
+        self.assertIs(PipeModBase.__init__, init)
+
+        report = prof.report()
+        self.assertEqual(list(report["phases"]), ["construct", "elaborate"])
+        elab = [rec for rec in prof.records if rec["kind"] == "elaborate"]
+        self.assertTrue(elab)
+        for rec in elab:
+            self.assertTrue(rec["path"].startswith("top"))
+            self.assertLessEqual(rec["time"], rec["time_incl"])
+        self.assertIn("top", [rec["path"] for rec in elab])
+        self.assertGreater(sum(rec["nodes"] for rec in elab), 0)
+
+        kinds = {(tot["kind"], tot["class"]) for tot in prof.by_class()}
+        self.assertIn(("init", "FSGNJPipeMod"), kinds)
+        total = sum(tot["time"] for tot in prof.by_class()
+                    if tot["kind"] != "phase")
+        phases = sum(report["phases"].values())
+        self.assertLessEqual(total, phases)
+
+
+if __name__ == '__main__':
+    unittest.main()
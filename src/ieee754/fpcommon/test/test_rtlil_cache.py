@@ -0,0 +1,42 @@
+""" test of the runfp RTLIL cache keys
+"""
+
+from ieee754.fpcommon.test.rtlil_cache import config_key
+from ieee754.fpadd.pipeline import FPADDMuxInOut
+from ieee754.fcvt.pipeline import FPCVTDownMuxInOut, FPCVTIntMuxInOut
+
+import gc
+import weakref
+import unittest
+
+
+class RTLILCacheTestCase(unittest.TestCase):
+
+    def test_same_config(self):
+        self.assertEqual(config_key(FPADDMuxInOut(16, 4)),
+                         config_key(FPADDMuxInOut(16, 4)))
+
+    def test_different_config(self):
+        keys = [config_key(FPADDMuxInOut(16, 4)),
+                config_key(FPADDMuxInOut(32, 4)),
+                config_key(FPADDMuxInOut(16, 8)),
+                config_key(FPADDMuxInOut(16, 4, early_out=True)),
+                # same class (FPCVTMuxInOutBase), different modkls
+                config_key(FPCVTDownMuxInOut(32, 16, 4)),
+                config_key(FPCVTIntMuxInOut(32, 16, 4)),
+               ]
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_not_kept_alive(self):
+        # the memoised keys must not keep every tested DUT (and with it
+        # all of its elaborated nmigen objects) alive
+        dut = FPADDMuxInOut(16, 4)
+        config_key(dut)
+        ref = weakref.ref(dut)
+        del dut
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+if __name__ == '__main__':
+    unittest.main()
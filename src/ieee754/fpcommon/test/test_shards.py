@@ -0,0 +1,40 @@
+""" test of the sharded (multi-process) test-campaign runner
+"""
+
+from ieee754.fpcommon.test.shards import shard_jobs, run_shards
+
+import os
+import unittest
+
+
+def run_job(name, vals):
+    if name == "fail":
+        assert False, "mismatch"
+    if name == "die":
+        os._exit(1)
+
+
+class ShardsTestCase(unittest.TestCase):
+
+    def test_shard_jobs(self):
+        shards = shard_jobs(list(range(10)), 4)
+        self.assertEqual(shards, [[0, 4, 8], [1, 5, 9], [2, 6], [3, 7]])
+
+    def test_pass(self):
+        jobs = [("job%d" % i, [i]) for i in range(10)]
+        report = run_shards("test_shards_pass", jobs, 3, run_job, 100)
+        self.assertEqual([r["seed"] for r in report], [100, 101, 102])
+        self.assertEqual(sum(len(r["jobs"]) for r in report), 10)
+
+    def test_fail(self):
+        jobs = [("ok", []), ("fail", []), ("die", [])]
+        with self.assertRaises(AssertionError) as cm:
+            run_shards("test_shards_fail", jobs, 3, run_job, 0)
+        msg = str(cm.exception)
+        self.assertIn("fail (shard 1, seed 1)", msg)
+        self.assertIn("die (shard 2, seed 2)", msg)
+        self.assertNotIn("ok", msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,7 @@ from nmutil.pipemodbase import PipeModBase
 from ieee754.fpcommon.fpbase import FPNumBaseRecord
 from ieee754.fpcommon.denorm import FPSCData
 from ieee754.fpcommon.getop import FPPipeContext
+from ieee754.fpcommon.msbhigh import FPMSBHigh
 from ieee754.div_rem_sqrt_rsqrt.div_pipe import DivPipeInputData
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation as DPCOp
 
@@ -29,6 +30,11 @@ class FPDivPreFPAdjust(PipeModBase):
     the end, and puts the (adjusted) mantissa into the processing engine.
 
     no *actual* processing occurs here: it is *purely* preparation work.
+
+    the SRT and Newton-Raphson cores (PipelineSpec.srt, .newton) need
+    normalised mantissas (core_config.normalised_inputs), so with them
+    denormal a and b are normalised (leading zeros shifted out, into the
+    exponent) first.
     """
     def __init__(self, pspec):
         super().__init__(pspec, "pre_fp_adjust")
@@ -43,22 +49,26 @@ class FPDivPreFPAdjust(PipeModBase):
         m = Module()
         comb = m.d.comb
 
-        # mantissas start in the range [1.0, 2.0)
+        # mantissas start in the range [1.0, 2.0), except for denormals
+        a, b = self.i.a, self.i.b
+        if self.pspec.core_config.normalised_inputs:
+            a = self._normalise(m, "a", a)
+            b = self._normalise(m, "b", b)
 
         # intermediary temp signals
         is_div = Signal(reset_less=True)
         need_exp_adj = Signal(reset_less=True)
 
-        # "adjusted" - ``self.i.a.rmw`` fractional bits and 2 integer bits
-        adj_a_mw = self.i.a.rmw
-        adj_a_m = Signal(self.i.a.rmw + 2, reset_less=True)
-        adj_a_e = Signal((len(self.i.a.e), True), reset_less=True)
+        # "adjusted" - ``a.rmw`` fractional bits and 2 integer bits
+        adj_a_mw = a.rmw
+        adj_a_m = Signal(a.rmw + 2, reset_less=True)
+        adj_a_e = Signal((len(a.e), True), reset_less=True)
 
         # adjust (shift) the exponent so that it is even, but only for [r]sqrt
         comb += [is_div.eq(self.i.ctx.op == int(DPCOp.UDivRem)),
-                 need_exp_adj.eq(~is_div & self.i.a.e[0]), # even? !div? adjust
-                 adj_a_m.eq(self.i.a.m << need_exp_adj),
-                 adj_a_e.eq(self.i.a.e - need_exp_adj)]
+                 need_exp_adj.eq(~is_div & a.e[0]), # even? !div? adjust
+                 adj_a_m.eq(a.m << need_exp_adj),
+                 adj_a_e.eq(a.e - need_exp_adj)]
 
         # adj_a_m now in the range [1.0, 4.0) for sqrt/rsqrt
         # and [1.0, 2.0) for div
@@ -67,11 +77,11 @@ class FPDivPreFPAdjust(PipeModBase):
         divr_rad = Signal(len(self.o.divisor_radicand), reset_less=True)
 
         # real mantissa fractional widths
-        a_mw = self.i.a.rmw
-        b_mw = self.i.b.rmw
+        a_mw = a.rmw
+        b_mw = b.rmw
 
-        comb += [self.o.dividend.eq(self.i.a.m << (fw*2 - a_mw)),
-                 divr_rad.eq(Mux(is_div, self.i.b.m << (fw - b_mw),
+        comb += [self.o.dividend.eq(a.m << (fw*2 - a_mw)),
+                 divr_rad.eq(Mux(is_div, b.m << (fw - b_mw),
                                          adj_a_m << (fw - adj_a_mw))),
                  self.o.divisor_radicand.eq(divr_rad),
         ]
@@ -79,8 +89,8 @@ class FPDivPreFPAdjust(PipeModBase):
         ############# DIV #############
         with m.If(self.i.ctx.op == int(DPCOp.UDivRem)):
             # DIV: subtract exponents, XOR sign
-            comb += [self.o.z.e.eq(self.i.a.e - self.i.b.e),
-                     self.o.z.s.eq(self.i.a.s ^ self.i.b.s),
+            comb += [self.o.z.e.eq(a.e - b.e),
+                     self.o.z.s.eq(a.s ^ b.s),
                      self.o.operation.eq(int(DPCOp.UDivRem))
                     ]
 
@@ -107,4 +117,14 @@ class FPDivPreFPAdjust(PipeModBase):
 
         return m
 
+    def _normalise(self, m, name, x):
+        """ x (an FPNumBaseRecord) with the mantissa MSB set """
+        msb = FPMSBHigh(len(x.m), len(x.e))
+        setattr(m.submodules, "norm_%s" % name, msb)
+        m.d.comb += [msb.m_in.eq(x.m), msb.e_in.eq(x.e)]
+        norm = FPNumBaseRecord(self.pspec.width, False, name="norm_"+name)
+        m.d.comb += [norm.s.eq(x.s), norm.m.eq(msb.m_out),
+                     norm.e.eq(msb.e_out)]
+        return norm
+
 
@@ -11,16 +11,29 @@ data formatting.
 there's no "actual" work done here: it's just a "joining-together" job.
 see pipeline.py for an ASCII diagram showing how everything fits together
 
+with PipelineSpec.srt, the DivPipeSRT* stages (radix-4 SRT core, see
+div_rem_sqrt_rsqrt/srt.py) are used instead of the DivPipe* ones, and
+with PipelineSpec.newton the DivPipeNR* ones (Newton-Raphson, see
+div_rem_sqrt_rsqrt/newton.py).
+
+with PipelineSpec.iterative, FPDivStagesIterative replaces all of the
+FPDivStagesIntermediate pipes (and the calculate stages of the setup and
+final ones): an FSM loops over that many DivPipeIterativeStages instead
+(with PipelineSpec.lanes, that many FSMs, each with its own stages).
+FPDivStagesAdmit, at the very front, holds operations back meanwhile.
+
 Relevant bugreport: http://bugs.libre-riscv.org/show_bug.cgi?id=99
 
 """
 
+from nmigen import Module, Signal, Const
+
 from nmutil.pipemodbase import PipeModBaseChain
-from ieee754.div_rem_sqrt_rsqrt.div_pipe import (DivPipeInterstageData,
-                                                 DivPipeSetupStage,
-                                                 DivPipeCalculateStage,
-                                                 DivPipeFinalStage,
-                                                )
+from nmutil.singlepipe import ControlBase
+from ieee754.div_rem_sqrt_rsqrt.div_pipe import (get_div_pipe_stages,
+                                                 DivPipeInterstageData,
+                                                 DivPipeIterativeStage)
+from ieee754.fpcommon.basedata import FPBaseData
 from ieee754.fpdiv.div0 import FPDivPreFPAdjust
 from ieee754.fpdiv.div2 import FPDivPostToFPFormat
 
@@ -47,12 +60,13 @@ class FPDivStagesSetup(PipeModBaseChain):
 
         # does 1 "convert" (actual processing) from DivPipeInputData
         # into "intermediate" output (DivPipeInterstageData)
-        divstages.append(DivPipeSetupStage(self.pspec))
+        setup, calculate, final = get_div_pipe_stages(self.pspec)
+        divstages.append(setup(self.pspec))
 
         # here is where the intermediary stages are added.
         for count in range(self.n_stages): # number of combinatorial stages
             idx = count + self.stage_offs
-            divstages.append(DivPipeCalculateStage(self.pspec, idx))
+            divstages.append(calculate(self.pspec, idx))
 
         return divstages
 
@@ -73,11 +87,12 @@ class FPDivStagesIntermediate(PipeModBaseChain):
 
         # chain to be returned
         divstages = []
+        _, calculate, _ = get_div_pipe_stages(self.pspec)
 
         # here is where the intermediary stages are added.
         for count in range(self.n_stages): # number of combinatorial stages
             idx = count + self.stage_offs
-            divstages.append(DivPipeCalculateStage(self.pspec, idx))
+            divstages.append(calculate(self.pspec, idx))
 
         return divstages
 
@@ -98,17 +113,176 @@ class FPDivStagesFinal(PipeModBaseChain):
 
         # chain to be returned
         divstages = []
+        _, calculate, final = get_div_pipe_stages(self.pspec)
 
         # here is where the last intermediary stages are added.
         for count in range(self.n_stages): # number of combinatorial stages
             idx = count + self.stage_offs
-            divstages.append(DivPipeCalculateStage(self.pspec, idx))
+            divstages.append(calculate(self.pspec, idx))
 
         # does the final conversion from intermediary to output data
-        divstages.append(DivPipeFinalStage(self.pspec))
+        divstages.append(final(self.pspec))
 
         # does conversion from DivPipeOutputData into FPPostCalcData format
         # so that post-normalisation and corrections can take over
         divstages.append(FPDivPostToFPFormat(self.pspec))
 
         return divstages
+
+
+class FPDivStagesIterative(ControlBase):
+    """ multi-cycle replacement for the FPDivStagesIntermediate pipes
+
+        each of the pspec.lanes lanes is an FSM which loops its own
+        pspec.iterative DivPipeIterativeStages (combinatorial) over one
+        operation until every quotient / root bit is done, or until the
+        remainder is zero (an exact result, see DivPipeCoreIterativeStage).
+        p.ready_o is high while a lane is idle (the lowest one loads), and
+        the lowest done lane is n.data_o: with more than one lane, results
+        may overtake each other (ctx.muxid says whose they are).  otherwise
+        the ready / valid (and mask / stop) signalling is that of the pipes
+        it replaces, so FPDIVBasePipe connects it just the same.
+
+        IDLE - idle: loads data_r from p.data_i
+        CALC - data_r goes through the stages, once per clock
+        DONE - n.valid_o, until it is taken
+    """
+
+    def __init__(self, pspec):
+        self.pspec = pspec
+        self.maskwid = maskwid = getattr(pspec, "maskwid", 0)
+        self.lanes = lanes = getattr(pspec, "lanes", 1)
+        super().__init__(maskwid=maskwid)
+        self.p.data_i = DivPipeInterstageData(pspec)
+        self.n.data_o = DivPipeInterstageData(pspec)
+        k = pspec.iterative
+        self.stages = [[DivPipeIterativeStage(pspec, lane * k + instance)
+                        for instance in range(k)]
+                       for lane in range(lanes)]
+        self.idle = Signal(lanes, reset_less=True)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb, sync = m.d.comb, m.d.sync
+        m.submodules.p = p = self.p
+        m.submodules.n = n = self.n
+        cc = self.pspec.core_config
+
+        # as MaskCancellable: only unmasked (uncancelled) data is valid
+        p_valid_i = Signal(reset_less=True)
+        if self.maskwid:
+            maskedout = Signal(self.maskwid, reset_less=True)
+            comb += maskedout.eq(p.mask_i & ~p.stop_i)
+            comb += p_valid_i.eq(p.valid_i_test & maskedout.bool())
+            comb += n.stop_o.eq(p.stop_i)
+        else:
+            comb += p_valid_i.eq(p.valid_i_test)
+
+        # lowest set bits: the idle lane that loads, the done one that goes
+        done = Signal(self.lanes, reset_less=True)
+        load_sel = Signal(self.lanes, reset_less=True)
+        out_sel = Signal(self.lanes, reset_less=True)
+        comb += load_sel.eq(self.idle & -self.idle)
+        comb += out_sel.eq(done & -done)
+        comb += p._ready_o.eq(self.idle.bool())
+        comb += n.valid_o.eq(done.bool())
+
+        for lane, stages in enumerate(self.stages):
+            data_r = DivPipeInterstageData(self.pspec)
+            shift = Signal(range(cc.quotient_width + 1), reset_less=True,
+                           name="shift_%d" % lane)
+
+            # the stages, chained combinatorially from data_r
+            data, shift_i = data_r, shift
+            for stage in stages:
+                stage.setup(m, data)
+                comb += stage.shift_i.eq(shift_i)
+                data, shift_i = stage.process(data), stage.shift_o
+
+            cancel = Const(0)
+            if self.maskwid:
+                mask_r = Signal(self.maskwid, reset_less=True,
+                                name="mask_r_%d" % lane)
+                cancel = Signal(reset_less=True, name="cancel_%d" % lane)
+                comb += cancel.eq(~(mask_r & ~p.stop_i).bool())
+
+            with m.If(out_sel[lane]):
+                comb += n.data_o.eq(data_r)
+                if self.maskwid:
+                    comb += n.mask_o.eq(mask_r)
+
+            load = Signal(reset_less=True, name="load_%d" % lane)
+            comb += load.eq(p_valid_i & load_sel[lane])
+            with m.If(load):
+                sync += data_r.eq(p.data_i)
+                sync += shift.eq(cc.quotient_width)
+                if self.maskwid:
+                    sync += mask_r.eq(maskedout)
+
+            with m.FSM(name="lane_%d" % lane):
+                with m.State("IDLE"):
+                    comb += self.idle[lane].eq(1)
+                    with m.If(load):
+                        m.next = "CALC"
+                with m.State("CALC"):
+                    sync += data_r.eq(data)
+                    sync += shift.eq(shift_i)
+                    with m.If(cancel):
+                        m.next = "IDLE"
+                    with m.Elif(shift_i == 0):
+                        m.next = "DONE"
+                with m.State("DONE"):
+                    comb += done[lane].eq(1)
+                    with m.If((out_sel[lane] & n.ready_i_test) | cancel):
+                        m.next = "IDLE"
+
+        return m
+
+
+class FPDivStagesAdmit(ControlBase):
+    """ lets operations into FPDIVBasePipe only when FPDivStagesIterative
+        can take them straight away
+
+        the MaskCancellable pipes in front of FPDivStagesIterative must
+        never be stalled by it: they do not hold mask_r while stalled (the
+        operation would be lost), so nothing gets past here unless there
+        are more idle lanes than operations in the pipes listed.  it is
+        its own (pass-through) stage, FPBaseData in and out.
+    """
+
+    def __init__(self, pspec, pipes, iterative):
+        self.pspec = pspec
+        self.pipes = pipes
+        self.iterative = iterative
+        self.maskwid = maskwid = getattr(pspec, "maskwid", 0)
+        super().__init__(stage=self, maskwid=maskwid)
+
+    def ispec(self):
+        return FPBaseData(self.pspec)
+
+    def ospec(self):
+        return FPBaseData(self.pspec)
+
+    def process(self, i):
+        return i
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+        m.submodules.p = p = self.p
+        m.submodules.n = n = self.n
+
+        free = Signal(reset_less=True)
+        idle = self.iterative.idle
+        n_idle = sum(idle[lane] for lane in range(len(idle)))
+        n_busy = sum(pipe.n.valid_o for pipe in self.pipes)
+        comb += free.eq(n_idle > n_busy)
+
+        comb += n.valid_o.eq(p.valid_i_test & free)
+        comb += p._ready_o.eq(n.ready_i_test & free)
+        comb += n.data_o.eq(p.data_i)
+        if self.maskwid:
+            comb += n.mask_o.eq(p.mask_i)
+            comb += n.stop_o.eq(p.stop_i)
+
+        return m
@@ -61,6 +61,40 @@ pipeline clock delay, a corresponding ReservationStation is needed.
 if there are 24 pipeline stages, we need a whopping TWENTY FOUR
 RS's.  that's far too many.  6 is just about an acceptable number.
 even 8 is starting to get alarmingly high.
+
+setting PipelineSpec.early_out lets NaN / Inf / zero results (out_do_z)
+leave after scnorm, through a bypass stage (see fpcommon/bypass.py),
+instead of going through all of the pipediv stages.
+
+setting PipelineSpec.srt replaces the restoring core (radix 8, every
+candidate digit tried in parallel) with a radix-4 SRT one (carry-save
+partial remainder, digit selected from a small table: see
+div_rem_sqrt_rsqrt/srt.py).  each SRT stage is much smaller and shallower,
+so more of them (n_comb_stages) are chained per pipeline stage.  the SRT
+core does div and sqrt only, on normalised mantissas: FPDivPreFPAdjust
+normalises denormal inputs first.
+
+setting PipelineSpec.newton instead uses a Newton-Raphson core
+(div_rem_sqrt_rsqrt/newton.py): a seed ROM in the setup stage, then one
+iteration (two or three multiplies, doubling the number of correct bits)
+per pipeline stage, then the product and a remainder-based correction in
+the final one.  that is 3, 4 and 5 pipediv stages for FP16, FP32 and FP64
+(against 4, 6 and 12 for the restoring core).  it also needs normalised
+mantissas.
+
+setting PipelineSpec.iterative (k > 0) keeps the restoring core but not
+the pipeline: pipediv1 is FPDivStagesIterative, an FSM that loops k
+calculate stages (radix 8 each) over the operation until it is done, and
+pipediv0 / pipediv2 have no calculate stages.  one operation at a time, so
+FPDivStagesAdmit (in front of scnorm) holds the next one back until it can
+go straight through.  FP64 is ceil(22 / k) cycles in the FSM, plus 5.
+exact results (a zero remainder: x / 2^n, 6.0 / 3.0, sqrt(4.0)...) leave
+the FSM as soon as the remainder is zero, so in fewer.
+
+setting PipelineSpec.lanes as well (variable-latency mode) gives the FSM
+that many lanes, each with its own k calculate stages, for as many
+operations at once: an exact one overtakes the others, the
+ReservationStations routing each result by ctx.muxid as usual.
 """
 
 from nmutil.singlepipe import ControlBase
@@ -69,11 +103,15 @@ from nmutil.concurrentunit import ReservationStations, num_bits
 from ieee754.fpcommon.fpbase import FPFormat
 from ieee754.fpcommon.normtopack import FPNormToPack
 from ieee754.fpdiv.specialcases import FPDIVSpecialCasesDeNorm
-from ieee754.fpdiv.divstages import (FPDivStagesSetup,
+from ieee754.fpdiv.divstages import (FPDivStagesSetup, FPDivStagesIterative,
+                                     FPDivStagesAdmit,
                                      FPDivStagesIntermediate,
                                      FPDivStagesFinal)
 from ieee754.pipeline import PipelineSpec
+from ieee754.fpcommon.bypass import connect_early_out
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreConfig
+from ieee754.div_rem_sqrt_rsqrt.srt import SRTDivPipeCoreConfig
+from ieee754.div_rem_sqrt_rsqrt.newton import NRDivPipeCoreConfig
 from nmutil.dynamicpipe import MaskCancellableRedir
 
 
@@ -90,15 +128,22 @@ class FPDIVBasePipe(ControlBase):
         # get number of stages, set up loop.
         n_stages = pspec.core_config.n_stages
         max_n_comb_stages = self.pspec.n_comb_stages
-        print("n_stages", n_stages)
         stage_idx = 0
 
         end = False
+        if pspec.iterative:
+            # no calculate stages in the setup and final pipes: all of
+            # them are done (over and over) in FPDivStagesIterative
+            pipechain = [FPDivStagesSetup(pspec, 0, 0),
+                         FPDivStagesIterative(pspec),
+                         FPDivStagesFinal(pspec, 0, n_stages)]
+            end = True
+
         while not end:
 
             n_comb_stages = max_n_comb_stages
             # needs to convert input from pipestart ospec
-            if stage_idx == 0:
+            if not pipechain:
                 n_comb_stages -= 1
                 kls = FPDivStagesSetup  # does n_comb_stages-1 calcs as well
 
@@ -123,16 +168,31 @@ class FPDIVBasePipe(ControlBase):
         self.pipestart = pipestart = FPDIVSpecialCasesDeNorm(self.pspec)
         self.pipeend = pipeend = FPNormToPack(self.pspec)
 
-        self._eqs = self.connect([pipestart] + pipechain + [pipeend])
+        # nothing may queue up in front of FPDivStagesIterative
+        self.admit = None
+        if pspec.iterative:
+            pipes = [pipestart, pipechain[0]]
+            if pspec.early_out:
+                # nor may the bypass catch up with one at the merge
+                pipes += [pipechain[2], pipeend]
+            self.admit = FPDivStagesAdmit(pspec, pipes, pipechain[1])
+
+        self._eqs = connect_early_out(self, pspec,
+                                      [pipestart] + pipechain + [pipeend],
+                                      self.admit)
 
     def elaborate(self, platform):
         m = ControlBase.elaborate(self, platform)
 
         # add submodules
+        if self.admit is not None:
+            m.submodules.admit = self.admit
         m.submodules.scnorm = self.pipestart
         for i, p in enumerate(self.pipechain):
             setattr(m.submodules, "pipediv%d" % i, p)
         m.submodules.normpack = self.pipeend
+        if self.early_out is not None:
+            self.early_out.elaborate(m)
 
         # ControlBase.connect creates the "eqs" needed to connect each pipe
         m.d.comb += self._eqs
@@ -155,11 +215,34 @@ class FPDIVMuxInOut(ReservationStations):
 
         :op_wid: - set this to the width of an operator which can
                    then be used to change the behaviour of the pipeline.
+        :early_out: - special-case results bypass the pipeline (see bypass)
+        :supported: - the DivPipeCoreOperations the core is built for
+                   (default all: div, sqrt and rsqrt)
+        :srt: - use the radix-4 SRT core (div and sqrt only)
+        :newton: - use the Newton-Raphson core (far fewer stages)
+        :iterative: - k > 0 replaces the calculate pipes with a multi-cycle
+                   FSM reusing k calculate stages (restoring core only)
+        :lanes: - with iterative: that many FSMs, finishing out of order
     """
 
-    def __init__(self, width, num_rows, op_wid=2):
+    def __init__(self, width, num_rows, op_wid=2, early_out=False,
+                       supported=None, srt=False, newton=False, iterative=0,
+                       lanes=1):
+        if srt and newton:
+            raise ValueError("srt and newton are alternative cores")
+        if iterative and (srt or newton):
+            raise ValueError("iterative is only for the restoring core")
+        if lanes != 1 and not iterative:
+            raise ValueError("lanes is only for the iterative core")
+        if lanes > 1 and early_out:
+            raise ValueError("early_out needs in-order (lanes=1) results")
         self.id_wid = num_bits(num_rows)
         self.pspec = PipelineSpec(width, self.id_wid, op_wid)
+        self.pspec.early_out = early_out
+        self.pspec.srt = srt
+        self.pspec.newton = newton
+        self.pspec.iterative = iterative
+        self.pspec.lanes = lanes
 
         # get the standard mantissa width, store in the pspec
         fmt = FPFormat.standard(width)
@@ -174,7 +257,17 @@ class FPDIVMuxInOut(ReservationStations):
         # rounding width to a multiple of log2_radix is not needed,
         # DivPipeCoreCalculateStage just internally reduces log2_radix on
         # the last stage
-        cfg = DivPipeCoreConfig(fmt.width, fraction_width, log2_radix)
+        if srt:
+            # radix 4, and 3 (much shorter) compute stages per pipeline stage
+            cfg = SRTDivPipeCoreConfig(fmt.width, fraction_width, supported)
+            n_comb_stages = 3
+        elif newton:
+            # one iteration (a few multiplies deep) per pipeline stage
+            cfg = NRDivPipeCoreConfig(fmt.width, fraction_width, supported)
+            n_comb_stages = 1
+        else:
+            cfg = DivPipeCoreConfig(fmt.width, fraction_width, log2_radix,
+                                    supported)
 
         self.pspec.pipekls = MaskCancellableRedir
         self.pspec.maskwid = maskwid * num_rows # RS gets just maskwid
@@ -165,6 +165,16 @@ class FPDIVSpecialCasesMod(PipeModBase):
 
                 comb += self.o.oz.eq(oz)
 
+        # an operation that the core was not built for (e.g. rsqrt, with
+        # srt=True) would come out as garbage: make it a canonical NaN
+        unsupported = [int(op) for op in DP
+                       if op not in self.pspec.core_config.supported]
+        if unsupported:
+            with m.Switch(self.i.ctx.op):
+                with m.Case(*unsupported):
+                    comb += self.o.out_do_z.eq(1)
+                    comb += self.o.oz.eq(z_nan.v)
+
         # pass through context
         comb += self.o.ctx.eq(self.i.ctx)
 
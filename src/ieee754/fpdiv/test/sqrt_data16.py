@@ -1,9 +0,0 @@
-def regressions():
-    yield 0x3686,
-    yield 0x4400,
-    yield 0x4800,
-    yield 0x48f0,
-    yield 0x429,
-    yield 0x2631,
-    yield 0x3001,
-
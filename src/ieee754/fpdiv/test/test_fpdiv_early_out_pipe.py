@@ -0,0 +1,48 @@
+""" test of FPDIVMuxInOut with the special-case bypass (early_out)
+"""
+
+from ieee754.fpdiv.pipeline import (FPDIVMuxInOut,)
+from ieee754.fpcommon.test.case_gen import run_pipe_fp
+from ieee754.fpcommon.test.fpmux import runfp, repeat
+from ieee754.fpdiv.test.test_fpdiv_srt_pipe import get_vals
+from ieee754.fpcommon.test import unit_test_half
+from ieee754.fpdiv.test.div_data16 import regressions
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
+
+import unittest
+from sfpy import Float16
+from operator import truediv as div
+
+
+class TestDivEarlyOutPipe(unittest.TestCase):
+    def test_pipe_early_out_fp16(self):
+        dut = FPDIVMuxInOut(16, 4, early_out=True)
+        # don't forget to initialize opcode; don't use magic numbers
+        opcode = int(DivPipeCoreOperation.UDivRem)
+        run_pipe_fp(dut, 16, "div16_early_out", unit_test_half, Float16,
+                    regressions, div, 10, opcode=opcode)
+
+    def test_pipe_early_out_collide_fp16(self):
+        # bypass (NaN, Inf, zero) results coming out on the same clock as
+        # main pipeline ones, so waiting in the bypass: the last one was lost
+        dut = FPDIVMuxInOut(16, 4, early_out=True)
+        vals = [(0xad39, 0x7b6d), (0xaa83, 0x0367), (0x7c63, 0x40f5),
+                (0xfbf4, 0x5987), (0x72ef, 0xd0eb), (0xf4e9, 0x80ef),
+                (0x7d87, 0x74d5)]
+        runfp(dut, 16, "div16_early_out_collide", None, div,
+              vals=repeat(dut.num_rows, vals), stream=True,
+              opcode=int(DivPipeCoreOperation.UDivRem))
+
+    def test_pipe_early_out_streamed(self):
+        # a third of the operands special, back-to-back: many collisions
+        for width, count in ((16, 200), (32, 100), (64, 60)):
+            with self.subTest(width=width):
+                dut = FPDIVMuxInOut(width, 4, early_out=True)
+                vals = repeat(dut.num_rows, get_vals(width, count))
+                runfp(dut, width, "div%d_early_out_streamed" % width, None,
+                      div, vals=vals, stream=True,
+                      opcode=int(DivPipeCoreOperation.UDivRem))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+""" test of FPDIVMuxInOut with the iterative (multi-cycle) core
+
+    the expected results all come from NumPy (see golden.py), with the
+    operands of test_fpdiv_srt_pipe (denormals, random and special cases),
+    or exact ones (which finish early) from bench_pipe's "exact" trace.
+"""
+
+from ieee754.fpdiv.pipeline import (FPDIVMuxInOut,)
+from ieee754.fpdiv.test.test_fpdiv_srt_pipe import get_vals, sqrt
+from ieee754.fpdiv.test.test_fpdiv_nr_pipe import rsqrt
+from ieee754.fpcommon.test.fpmux import runfp, repeat
+from ieee754.fpcommon.test.bench_pipe import exact_operands
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
+
+import unittest
+from random import Random
+from operator import truediv as div
+
+
+def get_exact_vals(width, count, single_op=False, seed=0):
+    """ exact divides (or square roots), as get_vals
+    """
+    rng = Random(seed)
+    n_operands = 1 if single_op else 2
+    return [tuple(exact_operands(rng, width, n_operands))
+            for _ in range(count)]
+
+
+class TestDivIterativePipe(unittest.TestCase):
+    def run_iter(self, width, name, op, fpop, count, single_op=False,
+                 iterative=1, early_out=False, lanes=1, exact=False):
+        dut = FPDIVMuxInOut(width, 4, iterative=iterative,
+                            early_out=early_out, lanes=lanes)
+        get = get_exact_vals if exact else get_vals
+        vals = repeat(dut.num_rows, get(width, count, single_op))
+        # don't forget to initialize opcode; don't use magic numbers
+        runfp(dut, width, name, None, fpop, single_op=single_op,
+              vals=vals, opcode=int(op))
+
+    def test_pipe_iter_div_fp16(self):
+        self.run_iter(16, "div16_iter", DivPipeCoreOperation.UDivRem, div,
+                      100)
+
+    def test_pipe_iter_sqrt_fp16(self):
+        self.run_iter(16, "sqrt16_iter", DivPipeCoreOperation.SqrtRem, sqrt,
+                      100, single_op=True)
+
+    def test_pipe_iter_rsqrt_fp16(self):
+        self.run_iter(16, "rsqrt16_iter", DivPipeCoreOperation.RSqrtRem,
+                      rsqrt, 100, single_op=True)
+
+    def test_pipe_iter3_div_fp16(self):
+        self.run_iter(16, "div16_iter3", DivPipeCoreOperation.UDivRem, div,
+                      100, iterative=3)
+
+    def test_pipe_iter_div_fp16_early_out(self):
+        self.run_iter(16, "div16_iter_eo", DivPipeCoreOperation.UDivRem, div,
+                      100, iterative=2, early_out=True)
+
+    def test_pipe_iter_div_fp16_exact(self):
+        self.run_iter(16, "div16_iter_exact", DivPipeCoreOperation.UDivRem,
+                      div, 100, exact=True)
+
+    def test_pipe_iter_sqrt_fp16_exact(self):
+        self.run_iter(16, "sqrt16_iter_exact", DivPipeCoreOperation.SqrtRem,
+                      sqrt, 100, single_op=True, exact=True)
+
+    def test_pipe_lanes_div_fp16(self):
+        self.run_iter(16, "div16_lanes", DivPipeCoreOperation.UDivRem, div,
+                      100, lanes=4)
+
+    def test_pipe_lanes_div_fp16_exact(self):
+        self.run_iter(16, "div16_lanes_exact", DivPipeCoreOperation.UDivRem,
+                      div, 100, lanes=4, exact=True)
+
+    def test_pipe_iter_div_fp32(self):
+        self.run_iter(32, "div32_iter", DivPipeCoreOperation.UDivRem, div,
+                      40)
+
+    def test_pipe_iter3_div_fp64(self):
+        self.run_iter(64, "div64_iter3", DivPipeCoreOperation.UDivRem, div,
+                      20, iterative=3)
+
+    def test_pipe_lanes_div_fp64_exact(self):
+        self.run_iter(64, "div64_lanes_exact", DivPipeCoreOperation.UDivRem,
+                      div, 40, lanes=2, exact=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+""" test of FPDIVMuxInOut with the Newton-Raphson core (newton=True)
+
+    the expected results all come from NumPy (see golden.py: rsqrt is
+    worked out exactly, at every width), with the operands of
+    test_fpdiv_srt_pipe (denormals, random and special cases).
+"""
+
+from ieee754.fpdiv.pipeline import (FPDIVMuxInOut,)
+from ieee754.fpdiv.test.test_fpdiv_srt_pipe import get_vals, sqrt
+from ieee754.fpcommon.test.fpmux import runfp, repeat
+from ieee754.fpcommon.test.golden import rsqrt as np_rsqrt
+from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
+
+import unittest
+from operator import truediv as div
+
+
+def rsqrt(x):
+    return 1 / x.sqrt()
+rsqrt.np_op = np_rsqrt # batch reference (see golden.py)
+
+
+class TestDivNRPipe(unittest.TestCase):
+    def run_nr(self, width, name, op, fpop, count, single_op=False):
+        dut = FPDIVMuxInOut(width, 4, newton=True)
+        vals = repeat(dut.num_rows, get_vals(width, count, single_op))
+        # don't forget to initialize opcode; don't use magic numbers
+        runfp(dut, width, name, None, fpop, single_op=single_op,
+              vals=vals, opcode=int(op))
+
+    def test_pipe_nr_div_fp16(self):
+        self.run_nr(16, "div16_nr", DivPipeCoreOperation.UDivRem, div, 200)
+
+    def test_pipe_nr_sqrt_fp16(self):
+        self.run_nr(16, "sqrt16_nr", DivPipeCoreOperation.SqrtRem, sqrt,
+                    200, single_op=True)
+
+    def test_pipe_nr_rsqrt_fp16(self):
+        self.run_nr(16, "rsqrt16_nr", DivPipeCoreOperation.RSqrtRem, rsqrt,
+                    200, single_op=True)
+
+    def test_pipe_nr_div_fp32(self):
+        self.run_nr(32, "div32_nr", DivPipeCoreOperation.UDivRem, div, 100)
+
+    def test_pipe_nr_sqrt_fp32(self):
+        self.run_nr(32, "sqrt32_nr", DivPipeCoreOperation.SqrtRem, sqrt,
+                    100, single_op=True)
+
+    def test_pipe_nr_rsqrt_fp32(self):
+        self.run_nr(32, "rsqrt32_nr", DivPipeCoreOperation.RSqrtRem, rsqrt,
+                    100, single_op=True)
+
+    def test_pipe_nr_div_fp64(self):
+        self.run_nr(64, "div64_nr", DivPipeCoreOperation.UDivRem, div, 40)
+
+    def test_pipe_nr_sqrt_fp64(self):
+        self.run_nr(64, "sqrt64_nr", DivPipeCoreOperation.SqrtRem, sqrt,
+                    40, single_op=True)
+
+    def test_pipe_nr_rsqrt_fp64(self):
+        self.run_nr(64, "rsqrt64_nr", DivPipeCoreOperation.RSqrtRem, rsqrt,
+                    40, single_op=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@
 from ieee754.fpdiv.pipeline import (FPDIVMuxInOut,)
 from ieee754.fpcommon.test.case_gen import run_pipe_fp
 from ieee754.fpcommon.test import unit_test_half
-#from ieee754.fpdiv.test.rsqrt_data16 import regressions
+from ieee754.fpcommon.test.golden import rsqrt as np_rsqrt
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
 
 import unittest
@@ -15,6 +15,7 @@ def rsqrt(x):
     # FIXME: switch to correct implementation
     # needs to use exact arithmetic and rounding only once at the end
     return x.__class__(float(Float64(1.0) / x.to_f64().sqrt()))
+rsqrt.np_op = np_rsqrt # batch reference (see golden.py)
 
 
 class TestDivPipe(unittest.TestCase):
@@ -23,7 +24,8 @@ class TestDivPipe(unittest.TestCase):
         # don't forget to initialize opcode; don't use magic numbers
         opcode = int(DivPipeCoreOperation.RSqrtRem)
         run_pipe_fp(dut, 16, "rsqrt16", unit_test_half, Float16, None,
-                    rsqrt, 100, single_op=True, opcode=opcode)
+                    rsqrt, 100, single_op=True, opcode=opcode,
+                    exhaustive=True)
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,11 +6,13 @@ from ieee754.fpcommon.test.fpmux import runfp
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
 
 import unittest
+import numpy as np
 from sfpy import Float64, Float32, Float16
 
 
 def sqrt(x):
     return x.sqrt()
+sqrt.np_op = np.sqrt # batch reference (see golden.py)
 
 
 class TestDivPipe(unittest.TestCase):
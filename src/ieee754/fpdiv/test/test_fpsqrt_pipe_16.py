@@ -4,15 +4,16 @@
 from ieee754.fpdiv.pipeline import (FPDIVMuxInOut,)
 from ieee754.fpcommon.test.case_gen import run_pipe_fp
 from ieee754.fpcommon.test import unit_test_half
-from ieee754.fpdiv.test.sqrt_data16 import regressions
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
 
 import unittest
+import numpy as np
 from sfpy import Float16
 
 
 def sqrt(x):
     return x.sqrt()
+sqrt.np_op = np.sqrt # batch reference (see golden.py)
 
 
 class TestDivPipe(unittest.TestCase):
@@ -20,8 +21,9 @@ class TestDivPipe(unittest.TestCase):
         dut = FPDIVMuxInOut(16, 4)
         # don't forget to initialize opcode; don't use magic numbers
         opcode = int(DivPipeCoreOperation.SqrtRem)
-        run_pipe_fp(dut, 16, "sqrt16", unit_test_half, Float16, regressions,
-                    sqrt, 100, single_op=True, opcode=opcode)
+        run_pipe_fp(dut, 16, "sqrt16", unit_test_half, Float16, None,
+                    sqrt, 100, single_op=True, opcode=opcode,
+                    exhaustive=True)
 
 if __name__ == '__main__':
     unittest.main()
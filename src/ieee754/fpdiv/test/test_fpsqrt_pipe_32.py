@@ -8,11 +8,13 @@ from ieee754.fpdiv.test.sqrt_data32 import regressions
 from ieee754.div_rem_sqrt_rsqrt.core import DivPipeCoreOperation
 
 import unittest
+import numpy as np
 from sfpy import Float32
 
 
 def sqrt(x):
     return x.sqrt()
+sqrt.np_op = np.sqrt # batch reference (see golden.py)
 
 
 class TestDivPipe(unittest.TestCase):
@@ -0,0 +1,55 @@
+"""IEEE754 Floating Point Fused Multiply-Add Pipeline
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+"""
+
+from nmigen import Signal
+
+from ieee754.fpcommon.fpbase import FPNumBaseRecord
+from ieee754.fpcommon.getop import FPPipeContext
+from ieee754.fpcommon.pscdata import FPSCData
+
+
+class FPMAddSCData(FPSCData):
+    """ FPSCData with a third operand (c, the addend)
+    """
+
+    def __init__(self, pspec, m_extra):
+        super().__init__(pspec, m_extra)
+        self.c = FPNumBaseRecord(pspec.width, m_extra, name="c")  # operand c
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield from self.c
+
+    def eq(self, i):
+        return super().eq(i) + [self.c.eq(i.c)]
+
+
+class FPMAddStage0Data:
+    """ product of a and b (exact, double-width), with c passed through
+    """
+
+    def __init__(self, pspec):
+        width = pspec.width
+        self.z = FPNumBaseRecord(width, False) # product sign and exponent
+        self.c = FPNumBaseRecord(width, False, name="c")
+        self.out_do_z = Signal(reset_less=True)
+        self.oz = Signal(width, reset_less=True)
+        self.product = Signal(self.z.m_width*2, reset_less=True)
+        self.ctx = FPPipeContext(pspec)
+        self.muxid = self.ctx.muxid
+
+    def __iter__(self):
+        yield from self.z
+        yield from self.c
+        yield self.out_do_z
+        yield self.oz
+        yield self.product
+        yield from self.ctx
+
+    def eq(self, i):
+        return [self.z.eq(i.z), self.c.eq(i.c), self.out_do_z.eq(i.out_do_z),
+                self.oz.eq(i.oz), self.product.eq(i.product),
+                self.ctx.eq(i.ctx)]
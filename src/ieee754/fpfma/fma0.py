@@ -0,0 +1,43 @@
+"""IEEE754 Floating Point Fused Multiply-Add Pipeline
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+"""
+
+from nmigen import Module
+
+from nmutil.pipemodbase import PipeModBase
+from ieee754.fpfma.datastruct import FPMAddSCData, FPMAddStage0Data
+
+
+class FPMAddStage0Mod(PipeModBase):
+    """ First stage of fma: the (exact, unrounded) mantissa product a * b
+    """
+
+    def __init__(self, pspec):
+        super().__init__(pspec, "fma0")
+
+    def ispec(self):
+        return FPMAddSCData(self.pspec, False)
+
+    def ospec(self):
+        return FPMAddStage0Data(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        # a and b are normalised, so the product has its MSB in the
+        # top 2 bits.  exponent is for the LSB at m_width-1 (as for c)
+        comb += [self.o.z.e.eq(self.i.a.e + self.i.b.e),
+                 self.o.z.s.eq(self.i.a.s ^ self.i.b.s),
+                 self.o.product.eq(self.i.a.m * self.i.b.m),
+                ]
+
+        # pass through c and context
+        comb += self.o.c.eq(self.i.c)
+        comb += self.o.oz.eq(self.i.oz)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
@@ -0,0 +1,122 @@
+"""IEEE754 Floating Point Fused Multiply-Add Pipeline
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+"""
+
+from nmigen import Module, Signal, Mux
+
+from nmutil.pipemodbase import PipeModBase
+from ieee754.fpcommon.fpbase import MultiShiftRMerge
+from ieee754.fpcommon.msbhigh import FPMSBHigh
+from ieee754.fpcommon.postcalc import FPPostCalcData
+from ieee754.fpfma.datastruct import FPMAddStage0Data
+
+
+class FPMAddStage1Mod(PipeModBase):
+    """ Second stage of fma: align, add, normalise (no rounding)
+
+        the product p (2*mw bits, with its MSB in the top 2) and c (mw
+        bits) are placed in a window of 2*mw+7 bits, where mw is the
+        mantissa width including the hidden bit.  p goes in at bit 2.
+        c goes in with its LSB kmax=mw+4 bits above the LSB of p, which is
+        as far up as it can go, and is then shifted *down* to line up with
+        p.  if c is even further up than that, it is p that is shifted down
+        instead.  both shifts merge the bits shifted out into bit 0 (sticky).
+
+        this is always safe: any time that bits are shifted out, the two
+        numbers are so far apart that there can be no massive cancellation,
+        so bit 0 never ends up anywhere near the guard and round bits.
+
+        the sum is then normalised (limited so that e does not go below
+        -126) and passed to FPNormToPack as mantissa, guard, round, sticky.
+    """
+
+    def __init__(self, pspec):
+        super().__init__(pspec, "fma1")
+
+    def ispec(self):
+        return FPMAddStage0Data(self.pspec)
+
+    def ospec(self):
+        return FPPostCalcData(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        z = self.i.z
+        c = self.i.c
+        mw = c.m_width
+        espec = (len(c.e)+2, True)
+        kmax = mw + 4
+        wid = 2*mw + 7
+
+        # where the LSB of c is, relative to the LSB of p.  p has
+        # the value product * 2^(e_p - 2*(mw-1)), c is m * 2^(e_c - (mw-1))
+        k = Signal(espec, reset_less=True)
+        cup = Signal(reset_less=True)
+        c_diff = Signal(espec, reset_less=True)
+        p_diff = Signal(espec, reset_less=True)
+        comb += [k.eq(c.e - z.e + (mw - 1)),
+                 cup.eq(k > kmax),
+                 c_diff.eq(Mux(cup, 0, kmax - k)),
+                 p_diff.eq(Mux(cup, k - kmax, 0)),
+                ]
+
+        # shift c down (or p down, if c is way up) merging into sticky
+        m.submodules.multishift_c = msr_c = MultiShiftRMerge(wid, espec)
+        m.submodules.multishift_p = msr_p = MultiShiftRMerge(wid, espec)
+        comb += [msr_c.inp.eq(c.m << (kmax+2)),
+                 msr_c.diff.eq(c_diff),
+                 msr_p.inp.eq(self.i.product << 2),
+                 msr_p.diff.eq(p_diff),
+                ]
+
+        # add or subtract.  subtract may go negative: take the magnitude
+        sub = Signal(reset_less=True)
+        tot = Signal(wid+1, reset_less=True)
+        neg = Signal(reset_less=True)
+        mag = Signal(wid, reset_less=True)
+        comb += [sub.eq(z.s != c.s),
+                 tot.eq(Mux(sub, msr_p.m - msr_c.m, msr_p.m + msr_c.m)),
+                 neg.eq(tot[-1]),
+                 mag.eq(Mux(neg, -tot, tot)),
+                ]
+
+        # sign: exact zero (a*b == -c) is +ve zero (round-to-nearest)
+        tot_zero = Signal(reset_less=True)
+        comb += tot_zero.eq(tot == 0)
+        with m.If(tot_zero):
+            comb += self.o.z.s.eq(0)
+        with m.Else():
+            comb += self.o.z.s.eq(Mux(neg, c.s, z.s))
+
+        # normalise, limited so as not to go below e=-126.  the exponent
+        # of the top of the window is at least that of c, plus one
+        e_top = Signal(espec, reset_less=True)
+        comb += e_top.eq(z.e + 6 + p_diff)
+        m.submodules.norm_msb = msb = FPMSBHigh(wid, espec[0], True)
+        comb += [msb.m_in.eq(mag),
+                 msb.e_in.eq(e_top),
+                 msb.limclz.eq(e_top - self.o.z.N126),
+                ]
+
+        # top bits are mantissa, then guard and round, rest is sticky
+        nm = msb.m_out
+        lsb = wid - mw
+        # FPMSBHigh does not shift zero at all: give it the zero exponent
+        comb += [self.o.z.e.eq(Mux(tot_zero, self.o.z.N127, msb.e_out)),
+                 self.o.z.m.eq(nm[lsb:]),              # mantissa
+                 self.o.of.m0.eq(nm[lsb]),             # copy of LSB
+                 self.o.of.guard.eq(nm[lsb-1]),        # guard
+                 self.o.of.round_bit.eq(nm[lsb-2]),    # round
+                 self.o.of.sticky.eq(nm[:lsb-2].bool()), # sticky
+                ]
+
+        # pass through context
+        comb += self.o.oz.eq(self.i.oz)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
@@ -0,0 +1,19 @@
+"""IEEE754 Floating Point Fused Multiply-Add Pipeline
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+"""
+
+from nmutil.pipemodbase import PipeModBaseChain
+from ieee754.fpfma.fma0 import FPMAddStage0Mod
+from ieee754.fpfma.fma1 import FPMAddStage1Mod
+
+
+class FPMAddStages(PipeModBaseChain):
+
+    def get_chain(self):
+        # chain MAddStage0 and MAddStage1
+        m0mod = FPMAddStage0Mod(self.pspec)
+        m1mod = FPMAddStage1Mod(self.pspec)
+
+        return [m0mod, m1mod]
@@ -0,0 +1,90 @@
+"""IEEE754 Floating Point Fused Multiply-Add Pipeline
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+computes (a * b) + c with a *single* rounding.  chaining FPMUL into
+FPADD would round twice, take two pipelines' worth of latency and need
+two sets of Reservation Stations.
+
+Stack looks like this:
+
+* scnorm    - FPMAddSpecialCasesDeNorm
+* fmastages - FPMAddStages
+* normpack  - FPNormToPack
+
+scnorm    - FPMAddSpecialCasesDeNorm ispec FPBaseData (n_ops=3)
+------                               ospec FPMAddSCData
+
+                StageChain: FPMAddSpecialCasesMod,
+                            FPMAddDeNormMod
+                            FPMAddAlignMod
+
+fmastages - FPMAddStages             ispec FPMAddSCData
+---------                            ospec FPPostCalcData
+
+                StageChain: FPMAddStage0Mod
+                            FPMAddStage1Mod
+
+normpack  - FPNormToPack             ispec FPPostCalcData
+--------                             ospec FPPackData
+
+                StageChain: Norm1ModSingle,
+                            RoundMod,
+                            CorrectionsMod,
+                            PackMod
+
+FPMAddStage0Mod is the (exact) mantissa multiply, as in FPMUL.
+FPMAddStage1Mod aligns c against the double-width product, adds, and
+normalises: the result is already normalised by the time it gets to
+FPNormToPack, which then rounds (once) and packs.
+
+the operand (ctx.op, op_wid=2) selects FMADD, FMSUB, FNMSUB or FNMADD:
+see FPMAddSpecialCasesMod.
+"""
+
+from nmutil.singlepipe import ControlBase
+from nmutil.concurrentunit import ReservationStations, num_bits
+
+from ieee754.fpcommon.normtopack import FPNormToPack
+from ieee754.fpfma.specialcases import FPMAddSpecialCasesDeNorm
+from ieee754.fpfma.fmastages import FPMAddStages
+from ieee754.pipeline import PipelineSpec
+
+
+class FPMADDBasePipe(ControlBase):
+    def __init__(self, pspec):
+        ControlBase.__init__(self)
+        self.pipe1 = FPMAddSpecialCasesDeNorm(pspec)
+        self.pipe2 = FPMAddStages(pspec)
+        self.pipe3 = FPNormToPack(pspec)
+
+        self._eqs = self.connect([self.pipe1, self.pipe2, self.pipe3])
+
+    def elaborate(self, platform):
+        m = ControlBase.elaborate(self, platform)
+        m.submodules.scnorm = self.pipe1
+        m.submodules.fmastages = self.pipe2
+        m.submodules.normpack = self.pipe3
+        m.d.comb += self._eqs
+        return m
+
+
+class FPMADDMuxInOut(ReservationStations):
+    """ Reservation-Station version of FPMADD pipeline.
+
+        * fan-in on inputs (an array of FPBaseData: a,b,c,mid)
+        * 2-stage fused multiply-add pipeline
+        * fan-out on outputs (an array of FPPackData: z,mid)
+
+        Fan-in and Fan-out are combinatorial.
+
+        :op_wid: 2 (or more) for FMADD/FMSUB/FNMSUB/FNMADD selection,
+                 0 for FMADD only.
+    """
+
+    def __init__(self, width, num_rows, op_wid=2):
+        self.id_wid = num_bits(num_rows)
+        self.op_wid = op_wid
+        self.pspec = PipelineSpec(width, self.id_wid, self.op_wid, n_ops=3)
+        self.alu = FPMADDBasePipe(self.pspec)
+        ReservationStations.__init__(self, num_rows)
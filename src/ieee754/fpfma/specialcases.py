@@ -0,0 +1,184 @@
+"""IEEE754 Floating Point Fused Multiply-Add
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+"""
+
+from nmigen import Module, Signal, Cat, Mux
+
+from nmutil.pipemodbase import PipeModBase, PipeModBaseChain
+from ieee754.fpcommon.fpbase import FPNumDecode, FPNumBaseRecord, FPNumBase
+from ieee754.fpcommon.basedata import FPBaseData
+from ieee754.fpcommon.denorm import FPAddDeNormMod
+from ieee754.fpmul.align import FPAlignModSingle
+from ieee754.fpfma.datastruct import FPMAddSCData
+
+
+class FPMAddSpecialCasesMod(PipeModBase):
+    """ special cases: NaNs, infs, zeros, denormalised
+
+        the operand (ctx.op) selects the negations, RISC-V style:
+
+        * 0b00 FMADD:    (a * b) + c
+        * 0b01 FMSUB:    (a * b) - c
+        * 0b10 FNMSUB: -(a * b) + c
+        * 0b11 FNMADD: -(a * b) - c
+
+        these are done here by flipping the signs of a and c, so that
+        the rest of the pipeline only ever has to do (a * b) + c.
+    """
+
+    def __init__(self, pspec):
+        super().__init__(pspec, "specialcases")
+
+    def ispec(self):
+        return FPBaseData(self.pspec)
+
+    def ospec(self):
+        return FPMAddSCData(self.pspec, False)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        # decode a/b/c
+        width = self.pspec.width
+        a1 = FPNumBaseRecord(width, False)
+        b1 = FPNumBaseRecord(width, False)
+        c1 = FPNumBaseRecord(width, False)
+        m.submodules.sc_decode_a = a1 = FPNumDecode(None, a1)
+        m.submodules.sc_decode_b = b1 = FPNumDecode(None, b1)
+        m.submodules.sc_decode_c = c1 = FPNumDecode(None, c1)
+        comb += [a1.v.eq(self.i.a),
+                 b1.v.eq(self.i.b),
+                 c1.v.eq(self.i.c),
+                ]
+
+        # negate product (via a) and/or c
+        negp = Signal(reset_less=True)
+        negc = Signal(reset_less=True)
+        if self.pspec.op_wid:
+            comb += [negc.eq(self.i.ctx.op[0]),
+                     negp.eq(self.i.ctx.op[1]),
+                    ]
+        comb += [self.o.a.eq(a1),
+                 self.o.a.s.eq(a1.s ^ negp),
+                 self.o.b.eq(b1),
+                 self.o.c.eq(c1),
+                 self.o.c.s.eq(c1.s ^ negc),
+                ]
+
+        # intermediaries / tests
+        sp = Signal(reset_less=True)     # sign of product
+        sc = Signal(reset_less=True)     # sign of c
+        t_abcnan = Signal(reset_less=True)
+        t_pinf = Signal(reset_less=True)
+        t_pzero = Signal(reset_less=True)
+        t_pnan = Signal(reset_less=True)
+        t_c1inf = Signal(reset_less=True)
+        t_c1zero = Signal(reset_less=True)
+        t_special = Signal(reset_less=True)
+
+        comb += sp.eq(a1.s ^ b1.s ^ negp)
+        comb += sc.eq(c1.s ^ negc)
+        comb += t_abcnan.eq(a1.is_nan | b1.is_nan | c1.is_nan)
+        comb += t_pinf.eq(a1.is_inf | b1.is_inf)
+        comb += t_pzero.eq(a1.is_zero | b1.is_zero)
+        comb += t_pnan.eq(t_pinf & t_pzero) # inf * 0
+        comb += t_c1inf.eq(c1.is_inf)
+        comb += t_c1zero.eq(c1.is_zero)
+        comb += t_special.eq(Cat(t_abcnan, t_pinf, t_pzero, t_c1inf).bool())
+
+        # prepare inf/zero/nans
+        z_nan = FPNumBaseRecord(width, False, name="z_nan")
+        z_infp = FPNumBaseRecord(width, False, name="z_infp")
+        z_infc = FPNumBaseRecord(width, False, name="z_infc")
+        comb += z_nan.nan(0)
+        comb += z_infp.inf(sp)
+        comb += z_infc.inf(sc)
+
+        # special case pipeline bypass enabled y/n.  note that c zero
+        # is *not* special: a*b still needs rounding
+        comb += self.o.out_do_z.eq(t_special)
+
+        # if a, b or c is NaN return NaN
+        # elif a*b is inf * 0 return NaN
+        # elif a*b is inf return inf (or NaN)
+        #   if c is inf and signs don't match return NaN
+        # elif c is inf return inf(c)
+        # elif a*b is zero:
+        #   if c is zero return zero (-ve only if both -ve)
+        #   else return c
+
+        # invert the sequence above to create the Mux tree
+        oz = 0
+        oz = Mux(t_pzero, Mux(t_c1zero, Cat(self.i.c[:-1], sp & sc),
+                                        Cat(self.i.c[:-1], sc)), oz)
+        oz = Mux(t_c1inf, z_infc.v, oz)
+        oz = Mux(t_pinf, Mux(t_c1inf & (sp != sc), z_nan.v, z_infp.v), oz)
+        oz = Mux(t_pnan, z_nan.v, oz)
+        oz = Mux(t_abcnan, z_nan.v, oz)
+        comb += self.o.oz.eq(oz)
+
+        # pass through context
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
+
+
+class FPMAddDeNormMod(FPAddDeNormMod):
+    """ denormalisation: as for a and b, also for c
+    """
+
+    def ispec(self):
+        return FPMAddSCData(self.pspec, self.m_extra)
+
+    def ospec(self):
+        return FPMAddSCData(self.pspec, self.m_extra)
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        comb = m.d.comb
+
+        m.submodules.denorm_in_c = in_c = FPNumBase(self.i.c)
+
+        comb += self.o.c.eq(self.i.c)
+        ce = self.i.c.e
+        cm = self.i.c.m
+        # either limit exponent, or set top mantissa bit
+        comb += self.o.c.e.eq(Mux(in_c.exp_n127, self.i.c.N126, ce))
+        comb += self.o.c.m[-1].eq(Mux(in_c.exp_n127, cm[-1], 1))
+
+        return m
+
+
+class FPMAddAlignMod(FPAlignModSingle):
+    """ normalises a and b (so that the product MSB is in the top 2 bits).
+
+        c is passed through as-is: the sum is normalised later anyway.
+    """
+
+    def ispec(self):
+        return FPMAddSCData(self.pspec, False)
+
+    def ospec(self):
+        return FPMAddSCData(self.pspec, False)
+
+    def elaborate(self, platform):
+        m = super().elaborate(platform)
+        m.d.comb += self.o.c.eq(self.i.c)
+        return m
+
+
+class FPMAddSpecialCasesDeNorm(PipeModBaseChain):
+    """ special cases: NaNs, infs, zeros, denormalised
+    """
+
+    def get_chain(self):
+        """ gets chain of modules
+        """
+        smod = FPMAddSpecialCasesMod(self.pspec)
+        dmod = FPMAddDeNormMod(self.pspec, False)
+        amod = FPMAddAlignMod(self.pspec, False)
+
+        return [smod, dmod, amod]
@@ -0,0 +1,91 @@
+""" test of FPMADDMuxInOut
+"""
+
+from ieee754.fpfma.pipeline import (FPMADDMuxInOut,)
+from ieee754.fpcommon.test.fpmux import runfp, repeat
+from ieee754.fpcommon.test.case_gen import corner_cases, get_rval
+from ieee754.fpcommon.test import (unit_test_half, unit_test_single,
+                                   unit_test_double)
+
+from sfpy import Float64, Float32, Float16
+from itertools import product
+from random import randint
+
+
+# sfpy's x.fma(y, z) is x + (y * z)
+def fmadd(a, b, c):
+    return c.fma(a, b)
+
+def fmsub(a, b, c):
+    return (-c).fma(a, b)
+
+def fnmsub(a, b, c):
+    return c.fma(-a, b)
+
+def fnmadd(a, b, c):
+    return (-c).fma(-a, b)
+
+fma_ops = [fmadd, fmsub, fnmsub, fnmadd] # in ctx.op order
+
+
+def get_corner_cases(mod, width):
+    """ all permutations of +/- zero/inf/nan and a random number
+    """
+    cc = corner_cases(mod) + [get_rval(width), get_rval(width)]
+    return list(product(cc, repeat=3))
+
+
+def get_cancellation(mod, fpkls, width, count):
+    """ c is (nearly) -(a*b): massive cancellation
+    """
+    for i in range(count):
+        a = get_rval(width)
+        b = mod.set_exponent(get_rval(width), randint(-4, 4))
+        p = (fpkls(a) * fpkls(b)).bits
+        c = p ^ (1<<(width-1))
+        c += randint(-2, 2) # nearby
+        yield (a, b, c & ((1<<width)-1))
+
+
+def get_nearly_zero(mod, width, count):
+    """ products that are near or below the denormal range
+    """
+    for i in range(count):
+        a = mod.set_exponent(get_rval(width), -mod.max_e+2)
+        b = mod.set_exponent(get_rval(width), randint(-4, 4))
+        c = mod.set_exponent(get_rval(width), -mod.max_e+randint(1, 4))
+        yield (a, b, c)
+
+
+def run_fma(width, mod, fpkls, count):
+    dut = FPMADDMuxInOut(width, 4)
+    for opcode, fn in enumerate(fma_ops):
+        name = "test_fpfma_pipe_fp%d_%s" % (width, fn.__name__)
+        vals = repeat(dut.num_rows, get_corner_cases(mod, width))
+        runfp(dut, width, name+"_cornercases", fpkls, fn, vals=vals,
+              opcode=opcode)
+        vals = repeat(dut.num_rows, get_cancellation(mod, fpkls, width, count))
+        runfp(dut, width, name+"_cancel", fpkls, fn, vals=vals,
+              opcode=opcode)
+        vals = repeat(dut.num_rows, get_nearly_zero(mod, width, count))
+        runfp(dut, width, name+"_nearlyzero", fpkls, fn, vals=vals,
+              opcode=opcode)
+        runfp(dut, width, name+"_rand", fpkls, fn, n_vals=count,
+              opcode=opcode, n_ops=3)
+
+
+def test_pipe_fp16():
+    run_fma(16, unit_test_half, Float16, 20)
+
+def test_pipe_fp32():
+    run_fma(32, unit_test_single, Float32, 20)
+
+def test_pipe_fp64():
+    run_fma(64, unit_test_double, Float64, 20)
+
+
+if __name__ == '__main__':
+    for i in range(1000):
+        test_pipe_fp16()
+        test_pipe_fp32()
+        test_pipe_fp64()
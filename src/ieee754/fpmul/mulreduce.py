@@ -0,0 +1,193 @@
+"""IEEE754 Floating Point Multiplier: pipelined (Wallace-tree) mantissa multiply
+
+Copyright (C) 2019 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
+
+Relevant bugreport: http://bugs.libre-riscv.org/show_bug.cgi?id=60
+
+FPMulStage0Mod does the mantissa multiply as a single (massive)
+combinatorial block (am0 * bm0).  for FP64 that is far too deep to
+close timing at the same clock as FPADD.
+
+this instead builds the product out of the part_mul_add adder tree:
+one partial product per mantissa bit (FPMulTermsMod) followed by the
+levels of AddReduceInternal (carry-save full-adders, then a FinalAdd),
+unpartitioned and sized to the mantissas, (m_width+1) x (m_width+1) as
+in FPMulStage0Mod.  that is 11, 24 and 53 terms for FP16, FP32 and
+FP64, rather than the 68 of the 64-bit (8-way partitioned) AllTerms.
+
+each of those modules is a PipeModBase, which means that registers can
+be placed between any of them: PipelineSpec.mul_register_levels gives
+the AddReduce levels after which a register is inserted (5, 7 and 9
+levels and the FinalAdd, for FP16, FP32 and FP64).  FPMulStage1Mod then
+carries on exactly as before.
+
+    multerms - FPMulTermsMod      ispec FPSCData
+                                  ospec FPMulReduceData(AddReduceData)
+    mul_addreduce_N - FPMulReduceMod (one per AddReduce level)
+    mul_finaladd    - FPMulReduceMod ospec FPMulReduceData(FinalReduceData)
+    mulproduct      - FPMulProductMod ospec FPMulStage0Data
+    mul1            - FPMulStage1Mod  ospec FPPostCalcData
+"""
+
+from nmigen import Module, Signal, Mux
+
+from nmutil.pipemodbase import PipeModBase
+from ieee754.fpcommon.fpbase import FPNumBaseRecord
+from ieee754.fpcommon.getop import FPPipeContext
+from ieee754.fpcommon.denorm import FPSCData
+from ieee754.fpmul.datastructs import FPMulStage0Data
+from ieee754.fpmul.mul1 import FPMulStage1Mod
+from ieee754.part_mul_add.multiply import AddReduceData, AddReduceInternal
+from ieee754.part_mul_add.partpoints import PartitionPoints
+from ieee754.pipeline import PipelineSpec
+
+
+class FPMulReduceData:
+    """ part_mul_add stage data, with the FP sign/exponent and context
+        carried alongside
+    """
+
+    def __init__(self, pspec, data):
+        width = pspec.width
+        self.z = FPNumBaseRecord(width, False) # s and e carried: m ignored
+        self.out_do_z = Signal(reset_less=True)
+        self.oz = Signal(width, reset_less=True)
+        self.data = data
+        self.ctx = FPPipeContext(pspec)
+        self.muxid = self.ctx.muxid
+
+    def eq(self, i):
+        return [self.z.eq(i.z), self.out_do_z.eq(i.out_do_z), self.oz.eq(i.oz),
+                self.ctx.eq(i.ctx)] + self.data.eq(i.data)
+
+
+class FPMulTermsMod(PipeModBase):
+    """ partial products of the two mantissas: a << i, for each bit i of b
+    """
+
+    def __init__(self, pspec, mul_pspec):
+        self.mul_pspec = mul_pspec
+        self.part_pts = PartitionPoints() # unpartitioned
+        super().__init__(pspec, "multerms")
+
+    def ispec(self):
+        return FPSCData(self.pspec, False)
+
+    def ospec(self):
+        data = AddReduceData(self.part_pts, len(self.i.b.m),
+                             self.mul_pspec.width * 2,
+                             self.mul_pspec.n_parts)
+        return FPMulReduceData(self.pspec, data)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        a = self.i.a.m
+        b = self.i.b.m
+        for i, term in enumerate(self.o.data.terms):
+            comb += term.eq(Mux(b[i], a << i, 0))
+
+        # same sign and exponent as FPMulStage0Mod
+        comb += [self.o.z.e.eq(self.i.a.e + self.i.b.e + 1),
+                 self.o.z.s.eq(self.i.a.s ^ self.i.b.s)
+                ]
+
+        # pass through context
+        comb += self.o.oz.eq(self.i.oz)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
+
+
+class FPMulReduceMod(PipeModBase):
+    """ wraps one AddReduceSingle (or the FinalAdd), passing through context
+    """
+
+    def __init__(self, pspec, stage):
+        self.stage = stage
+        super().__init__(pspec, "mul_" + stage.modname)
+
+    def ispec(self):
+        return FPMulReduceData(self.pspec, self.stage.ispec())
+
+    def ospec(self):
+        return FPMulReduceData(self.pspec, self.stage.ospec())
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        self.stage.setup(m, self.i.data)
+        comb += self.o.data.eq(self.stage.o)
+
+        # pass through sign/exponent and context
+        comb += self.o.z.eq(self.i.z)
+        comb += self.o.oz.eq(self.i.oz)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
+
+
+class FPMulProductMod(PipeModBase):
+    """ converts the FinalAdd output to FPMulStage0Data (for FPMulStage1Mod)
+    """
+
+    def __init__(self, pspec, finaladd):
+        self.finaladd = finaladd
+        super().__init__(pspec, "mulproduct")
+
+    def ispec(self):
+        return FPMulReduceData(self.pspec, self.finaladd.ospec())
+
+    def ospec(self):
+        return FPMulStage0Data(self.pspec)
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        # same scaling (* 4) as FPMulStage0Mod
+        comb += self.o.product.eq(self.i.data.output << 2)
+
+        # pass through sign/exponent and context
+        comb += self.o.z.eq(self.i.z)
+        comb += self.o.oz.eq(self.i.oz)
+        comb += self.o.out_do_z.eq(self.i.out_do_z)
+        comb += self.o.ctx.eq(self.i.ctx)
+
+        return m
+
+
+def mul_reduce_chains(pspec):
+    """ returns the Wallace-tree multiply as a list of module chains,
+        split (for registers) after each of pspec.mul_register_levels
+    """
+    # (m_width+1) x (m_width+1), the mantissas zero-extended by one bit
+    m_width = FPNumBaseRecord(pspec.width, False).m_width
+    mul_pspec = PipelineSpec(m_width+1, pspec.id_wid, pspec.op_wid, n_ops=3)
+    mul_pspec.n_parts = 1
+
+    tmod = FPMulTermsMod(pspec, mul_pspec)
+    n_terms = len(tmod.o.data.terms)
+    at = AddReduceInternal(mul_pspec, n_terms, tmod.part_pts)
+    n_levels = len(at.levels)
+    bad = [idx for idx in pspec.mul_register_levels
+           if not 0 <= idx < n_levels]
+    if bad:
+        raise ValueError("mul_register_levels %s: the FP%d multiply only "
+                         "has levels 0 to %d (the last is the FinalAdd)" %
+                         (repr(bad), pspec.width, n_levels - 1))
+    levels = [FPMulReduceMod(pspec, level) for level in at.levels]
+    pmod = FPMulProductMod(pspec, at.levels[-1])
+    m1mod = FPMulStage1Mod(pspec)
+
+    chains = [[tmod]]
+    for idx, level in enumerate(levels):
+        chains[-1].append(level)
+        if idx in pspec.mul_register_levels:
+            chains.append([])
+    chains[-1] += [pmod, m1mod]
+    return chains
@@ -10,14 +10,30 @@ from ieee754.fpcommon.denorm import FPSCData
 from ieee754.fpcommon.postcalc import FPPostCalcData
 from ieee754.fpmul.mul0 import FPMulStage0Mod
 from ieee754.fpmul.mul1 import FPMulStage1Mod
+from ieee754.fpmul.mulreduce import mul_reduce_chains
 
 
 class FPMulStages(PipeModBaseChain):
 
+    def __init__(self, pspec, chain=None):
+        self.mul_chain = chain # optional: one chain of mul_reduce_chains
+        super().__init__(pspec)
+
     def get_chain(self):
+        if self.mul_chain is not None:
+            return self.mul_chain
+
         # chain MulStage0 and MulStage1
         m0mod = FPMulStage0Mod(self.pspec)
         m1mod = FPMulStage1Mod(self.pspec)
 
         return [m0mod, m1mod]
 
+
+def get_mul_stages(pspec):
+    """ returns the list of (registered) FPMulStages pipes: just the one,
+        unless the Wallace-tree multiplier is requested (mul_register_levels)
+    """
+    if pspec.mul_register_levels is None:
+        return [FPMulStages(pspec)]
+    return [FPMulStages(pspec, chain) for chain in mul_reduce_chains(pspec)]
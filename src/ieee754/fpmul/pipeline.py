@@ -38,30 +38,111 @@ single (massive) combinatorial block.  This can be fixed by using
 a multi-stage fixed-point multiplier pipeline, which was implemented
 in #60: http://bugs.libre-riscv.org/show_bug.cgi?id=60
 
+Setting mul_register_levels does exactly that: FPMulStage0Mod is replaced
+by the part_mul_add Wallace tree (see mulreduce.py), and mulstages is
+split into several registered pipes, one more than the number of levels:
+
+mulstages0 - FPMulStages           ispec FPSCData
+----------                         ospec FPMulReduceData
+
+                StageChain: FPMulTermsMod,
+                            FPMulReduceMod (AddReduce level 0)
+                            ...
+
+...
+
+mulstagesN - FPMulStages           ispec FPMulReduceData
+----------                         ospec FPPostCalcData
+
+                StageChain: FPMulReduceMod (... FinalAdd)
+                            FPMulProductMod
+                            FPMulStage1Mod
+
+Setting PipelineSpec.early_out lets NaN / Inf / zero results (out_do_z)
+leave after scnorm, through a bypass stage: see fpcommon/bypass.py.
+
+Alternatively the stages may be regrouped with PipelineSpec.stage_splits
+(as for FPADD): the building blocks, in order, are split at the given
+indices, one registered PipeModChain per group.  [3, 5] is the default
+3-stage grouping.
+
+    0 FPMulSpecialCasesMod      3 FPMulStage0Mod       5 FPNorm1ModSingle
+    1 FPAddDeNormMod            4 FPMulStage1Mod       6 FPRoundMod
+    2 FPAlignModSingle                                 7 FPCorrectionsMod
+                                                       8 FPPackMod
+
+(with mul_register_levels, 3-4 are replaced by all of the Wallace-tree
+ modules, FPMulTermsMod to FPMulStage1Mod, and mul_register_levels is
+ then only used to build the tree: stage_splits places the registers.
+ with compound_round, 6-7 are the one FPCompoundRoundMod)
+
 """
 
 from nmutil.singlepipe import ControlBase
 from nmutil.concurrentunit import ReservationStations, num_bits
 
-from ieee754.fpcommon.normtopack import FPNormToPack
-from ieee754.fpmul.specialcases import FPMulSpecialCasesDeNorm
-from ieee754.fpmul.mulstages import FPMulStages
+from ieee754.fpcommon.normtopack import FPNormToPack, normtopack_mods
+from ieee754.fpcommon.denorm import FPAddDeNormMod
+from ieee754.fpmul.specialcases import (FPMulSpecialCasesDeNorm,
+                                        FPMulSpecialCasesMod)
+from ieee754.fpmul.align import FPAlignModSingle
+from ieee754.fpmul.mul0 import FPMulStage0Mod
+from ieee754.fpmul.mul1 import FPMulStage1Mod
+from ieee754.fpmul.mulreduce import mul_reduce_chains
+from ieee754.fpmul.mulstages import get_mul_stages
 from ieee754.pipeline import PipelineSpec
+from ieee754.fpcommon.modchain import split_pipe_mods
+from ieee754.fpcommon.bypass import connect_early_out
+
+
+def get_mul_mods(pspec):
+    """ the (flat) list of FPMUL modules, for regrouping by stage_splits
+    """
+    mods = [FPMulSpecialCasesMod(pspec),
+            FPAddDeNormMod(pspec, False),
+            FPAlignModSingle(pspec, False)]
+    if pspec.mul_register_levels is None:
+        mods += [FPMulStage0Mod(pspec),
+                 FPMulStage1Mod(pspec)]
+    else:
+        for chain in mul_reduce_chains(pspec):
+            mods += chain
+    mods += normtopack_mods(pspec)
+    return mods
 
 
 class FPMULBasePipe(ControlBase):
     def __init__(self, pspec):
         ControlBase.__init__(self)
+        if pspec.stage_splits is not None:
+            self.pipechain = split_pipe_mods(pspec, get_mul_mods(pspec))
+            self._eqs = connect_early_out(self, pspec, self.pipechain)
+            return
+
+        self.pipechain = None
         self.pipe1 = FPMulSpecialCasesDeNorm(pspec)
-        self.pipe2 = FPMulStages(pspec)
+        self.mulstages = get_mul_stages(pspec)
         self.pipe3 = FPNormToPack(pspec)
 
-        self._eqs = self.connect([self.pipe1, self.pipe2, self.pipe3])
+        pipechain = [self.pipe1] + self.mulstages + [self.pipe3]
+        self._eqs = connect_early_out(self, pspec, pipechain)
 
     def elaborate(self, platform):
         m = ControlBase.elaborate(self, platform)
+        if self.early_out is not None:
+            self.early_out.elaborate(m)
+        if self.pipechain is not None:
+            for i, p in enumerate(self.pipechain):
+                setattr(m.submodules, "stage%d" % i, p)
+            m.d.comb += self._eqs
+            return m
+
         m.submodules.scnorm = self.pipe1
-        m.submodules.mulstages = self.pipe2
+        if len(self.mulstages) == 1:
+            m.submodules.mulstages = self.mulstages[0]
+        else:
+            for i, p in enumerate(self.mulstages):
+                setattr(m.submodules, "mulstages%d" % i, p)
         m.submodules.normpack = self.pipe3
         m.d.comb += self._eqs
         return m
@@ -75,11 +156,26 @@ class FPMULMuxInOut(ReservationStations):
         * fan-out on outputs (an array of FPPackData: z,mid)
 
         Fan-in and Fan-out are combinatorial.
+
+        :mul_register_levels: None (default) for a single-block mantissa
+                              multiply, or a list of Wallace-tree levels
+                              after which to put a register.  an empty
+                              list is the Wallace tree, fully combinatorial.
+        :stage_splits: None for the default stages, or a list of split
+                       points (see get_mul_mods) giving the stages
+        :compound_round: round with FPCompoundRoundMod (see normtopack)
+        :early_out: special-case results bypass the pipeline (see bypass)
     """
 
-    def __init__(self, width, num_rows, op_wid=0):
+    def __init__(self, width, num_rows, op_wid=0, mul_register_levels=None,
+                       stage_splits=None, compound_round=False,
+                       early_out=False):
         self.id_wid = num_bits(num_rows)
         self.op_wid = op_wid
         self.pspec = PipelineSpec(width, self.id_wid, self.op_wid, n_ops=3)
+        self.pspec.mul_register_levels = mul_register_levels
+        self.pspec.stage_splits = stage_splits
+        self.pspec.compound_round = compound_round
+        self.pspec.early_out = early_out
         self.alu = FPMULBasePipe(self.pspec)
         ReservationStations.__init__(self, num_rows)
@@ -0,0 +1,35 @@
+""" test of FPMULMuxInOut with the special-case bypass (early_out)
+"""
+
+from ieee754.fpmul.pipeline import (FPMULMuxInOut,)
+from ieee754.fpcommon.test.case_gen import run_pipe_fp
+from ieee754.fpcommon.test import unit_test_half
+from ieee754.fpcommon.test import unit_test_single
+from ieee754.fpmul.test.mul_data16 import regressions as regressions16
+from ieee754.fpmul.test.mul_data32 import regressions as regressions32
+
+from sfpy import Float32, Float16
+from operator import mul
+
+
+def test_pipe_early_out_fp16():
+    dut = FPMULMuxInOut(16, 4, early_out=True)
+    run_pipe_fp(dut, 16, "mul_early_out", unit_test_half, Float16,
+                   regressions16, mul, 10)
+
+def test_pipe_early_out_5stage_fp32():
+    dut = FPMULMuxInOut(32, 4, early_out=True, stage_splits=[3, 4, 5, 7])
+    run_pipe_fp(dut, 32, "mul_early_out_5stage", unit_test_single, Float32,
+                   regressions32, mul, 10)
+
+def test_pipe_early_out_split_mul0_fp16():
+    # the bypass is taken after FPMulStage0Mod, not the special-cases
+    dut = FPMULMuxInOut(16, 4, early_out=True, stage_splits=[4])
+    run_pipe_fp(dut, 16, "mul_early_out_split4", unit_test_half, Float16,
+                   regressions16, mul, 10)
+
+
+if __name__ == '__main__':
+    test_pipe_early_out_fp16()
+    test_pipe_early_out_5stage_fp32()
+    test_pipe_early_out_split_mul0_fp16()
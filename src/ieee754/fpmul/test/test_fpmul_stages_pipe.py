@@ -0,0 +1,26 @@
+""" test of FPMULMuxInOut with the stages regrouped (stage_splits)
+"""
+
+from ieee754.fpmul.pipeline import (FPMULMuxInOut,)
+from ieee754.fpcommon.test.fpmux import runfp
+
+from sfpy import Float64, Float32, Float16
+from operator import mul
+
+def test_pipe_2stage_fp16():
+    dut = FPMULMuxInOut(16, 4, stage_splits=[3])
+    runfp(dut, 16, "test_fpmul_stages_pipe_fp16", Float16, mul, n_vals=50)
+
+def test_pipe_5stage_fp32():
+    dut = FPMULMuxInOut(32, 4, stage_splits=[2, 4, 5, 7])
+    runfp(dut, 32, "test_fpmul_stages_pipe_fp32", Float32, mul, n_vals=50)
+
+def test_pipe_reduce_fp64():
+    dut = FPMULMuxInOut(64, 4, mul_register_levels=[], stage_splits=[3, 8])
+    runfp(dut, 64, "test_fpmul_stages_pipe_fp64", Float64, mul, n_vals=50)
+
+if __name__ == '__main__':
+    for i in range(1000):
+        test_pipe_2stage_fp16()
+        test_pipe_5stage_fp32()
+        test_pipe_reduce_fp64()
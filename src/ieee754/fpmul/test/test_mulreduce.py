@@ -0,0 +1,36 @@
+""" test of the sizing of the Wallace-tree mantissa multiply (mulreduce)
+
+    the multiply itself is checked by test_fpmul_reduce_pipe.
+"""
+
+from ieee754.fpmul.pipeline import FPMULMuxInOut
+from ieee754.fpmul.mulreduce import mul_reduce_chains
+
+import unittest
+
+
+class MulReduceTestCase(unittest.TestCase):
+
+    def test_sizes(self):
+        # (m_width+1) x (m_width+1): one term per mantissa bit
+        for width, m_width, n_levels in ((16, 11, 6), (32, 24, 8),
+                                         (64, 53, 10)):
+            with self.subTest(width=width):
+                dut = FPMULMuxInOut(width, 4, mul_register_levels=[])
+                chain, = mul_reduce_chains(dut.pspec)
+                terms = chain[0].o.data.terms
+                self.assertEqual(len(terms), m_width)
+                self.assertEqual(len(terms[0]), 2 * (m_width + 1))
+                # terms, the levels (FinalAdd last), product and mul1
+                self.assertEqual(len(chain), n_levels + 3)
+
+    def test_register_levels_range(self):
+        FPMULMuxInOut(16, 4, mul_register_levels=[0, 5])
+        for levels in ([6], [2, 9], [-1]):
+            with self.subTest(levels=levels):
+                with self.assertRaises(ValueError):
+                    FPMULMuxInOut(16, 4, mul_register_levels=levels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+# See Notices.txt for copyright information
+
+"""
+naming of the submodules that the partitioned (SIMD) operators create
+
+each operator (PartitionedSignal's add, eq, shifts..., PMux, PCat,
+PAssign) adds a submodule to the Module it is used in.  the names are
+scoped to that Module, and derived from what the submodule is:
+
+    <category>_w<width>_<n>
+
+where n counts the submodules of that category and width in that Module
+(from 1), in the order they are created.  so the same design always
+elaborates to the same names (and RTLIL), whatever else has been
+elaborated in the process, or in other threads, before or at the same
+time.
+"""
+
+import threading
+import weakref
+
+
+_counts = weakref.WeakKeyDictionary() # Module: {(category, width): n}
+_lock = threading.Lock()
+
+
+def per_module(registry, m):
+    """ the dict for Module m in registry (a WeakKeyDictionary),
+        created if needed (thread-safe)
+    """
+    with _lock:
+        return registry.setdefault(m, {})
+
+
+def get_modname(m, category, width):
+    """ the name for a new category submodule, of width, of Module m
+    """
+    counts = per_module(_counts, m)
+    key = (category, width)
+    with _lock:
+        counts[key] = n = counts.get(key, 0) + 1
+    return "%s_w%d_%d" % (category, width, n)
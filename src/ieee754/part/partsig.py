@@ -25,10 +25,12 @@ from ieee754.part_mul_add.partpoints import make_partition2, PartitionPoints
 from ieee754.part_mux.part_mux import PMux
 from ieee754.part_ass.passign import PAssign
 from ieee754.part_cat.pcat import PCat
+from ieee754.part.modnames import get_modname, per_module
 from operator import or_, xor, and_, not_
+import weakref
 
 from nmigen import (Signal, Const)
-from nmigen.hdl.ast import UserValue
+from nmigen.hdl.ast import UserValue, Slice
 
 
 def getsig(op1):
@@ -45,15 +47,32 @@ def applyop(op1, op2, op):
     result.m.d.comb += result.sig.eq(op(getsig(op1), getsig(op2)))
     return result
 
-global modnames
-modnames = {}
-# for sub-modules to be created on-demand. Mux is done slightly
-# differently (has its own global)
-for name in ['add', 'eq', 'gt', 'ge', 'ls', 'xor']:
-    modnames[name] = 0
+def cse_key(val):
+    """ a key for val for memoising operators: PartitionedSignals and
+        other Values by identity (slices of the same Value match),
+        Consts and ints by value
+    """
+    if isinstance(val, PartitionedSignal):
+        return ("p", id(val.sig))
+    if isinstance(val, Const):
+        return ("c", val.value, val.width, val.signed)
+    if isinstance(val, int):
+        return ("i", val)
+    if isinstance(val, Slice):
+        return ("s", cse_key(val.value), val.start, val.stop)
+    return ("v", id(val))
+
+
+# memoised operator results, per Module: {key: (result, operands)}.
+# the operands are kept, so that their ids are not re-used.
+cse_cache = weakref.WeakKeyDictionary()
 
 
 class PartitionedSignal(UserValue):
+    # identical operators (same operator, operands and partition points)
+    # in the same Module share one submodule (and result)
+    cse = True
+
     def __init__(self, mask, *args, src_loc_at=0, **kwargs):
         super().__init__(src_loc_at=src_loc_at)
         self.sig = Signal(*args, **kwargs)
@@ -68,9 +87,22 @@ class PartitionedSignal(UserValue):
     def set_module(self, m):
         self.m = m
 
+    def memoise(self, opname, operands, build):
+        """ returns build(), or, if this operator has already been built
+            on these operands and partition points in self.m, its result
+        """
+        if not PartitionedSignal.cse:
+            return build()
+        ppts = tuple((pos, cse_key(val))
+                     for (pos, val) in sorted(self.partpoints.items()))
+        key = (opname, ppts) + tuple(map(cse_key, operands))
+        cache = per_module(cse_cache, self.m)
+        if key not in cache:
+            cache[key] = (build(), operands)
+        return cache[key][0]
+
     def get_modname(self, category):
-        modnames[category] += 1
-        return "%s_%d" % (category, modnames[category])
+        return get_modname(self.m, category, len(self.sig))
 
     @staticmethod
     def like(other, *args, **kwargs):
@@ -152,6 +184,10 @@ class PartitionedSignal(UserValue):
     # PartitionedSignal.  if it's a Const or a Signal, a global shift
     # can occur.  if it's a PartitionedSignal, that's much more interesting.
     def ls_op(self, op1, op2, carry, shr_flag=0):
+        return self.memoise("ls", (op1, op2, shr_flag),
+                            lambda: self._ls_op(op1, op2, carry, shr_flag))
+
+    def _ls_op(self, op1, op2, carry, shr_flag):
         op1 = getsig(op1)
         if isinstance(op2, Const) or isinstance(op2, Signal):
             scalar = True
@@ -193,6 +229,10 @@ class PartitionedSignal(UserValue):
         return Operator(">>", [other, self])
 
     def add_op(self, op1, op2, carry):
+        return self.memoise("add", (op1, op2, carry),
+                            lambda: self._add_op(op1, op2, carry))
+
+    def _add_op(self, op1, op2, carry):
         op1 = getsig(op1)
         op2 = getsig(op2)
         pa = PartitionedAdder(len(op1), self.partpoints)
@@ -206,6 +246,10 @@ class PartitionedSignal(UserValue):
         return result, pa.carry_out
 
     def sub_op(self, op1, op2, carry=~0):
+        return self.memoise("sub", (op1, op2, carry),
+                            lambda: self._sub_op(op1, op2, carry))
+
+    def _sub_op(self, op1, op2, carry):
         op1 = getsig(op1)
         op2 = getsig(op2)
         pa = PartitionedAdder(len(op1), self.partpoints)
@@ -275,6 +319,11 @@ class PartitionedSignal(UserValue):
     # binary comparison ops that need partitioning
 
     def _compare(self, width, op1, op2, opname, optype):
+        return self.memoise(opname, (op1, op2, width),
+                            lambda: self._compare_op(width, op1, op2,
+                                                     opname, optype))
+
+    def _compare_op(self, width, op1, op2, opname, optype):
         # print (opname, op1, op2)
         pa = PartitionedEqGtGe(width, self.partpoints)
         setattr(self.m.submodules, self.get_modname(opname), pa)
@@ -362,6 +411,9 @@ class PartitionedSignal(UserValue):
             ``1`` if an odd number of bits are set, ``0`` if an
                   even number of bits are set.
         """
+        return self.memoise("xor", (self,), self._xor)
+
+    def _xor(self):
         width = len(self.sig)
         pa = PartitionedXOR(width, self.partpoints)
         setattr(self.m.submodules, self.get_modname("xor"), pa)
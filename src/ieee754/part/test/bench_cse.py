@@ -0,0 +1,100 @@
+""" how much the PartitionedSignal operator memoisation (cse) saves
+
+    the partsig test designs are elaborated with PartitionedSignal.cse
+    off and on, and the number of partitioned-operator submodules (and,
+    if there is a yosys with synth, the size of the RTLIL and the
+    synthesised cell count: see bench_synth) compared.  written to
+    sim_out/bench_cse.json.
+
+    note that yosys' own opt_merge finds most of the duplicates, once
+    flattened: the saving is mostly in the elaborated design (and so the
+    time spent in nmigen, simulation and the early yosys passes), and in
+    designs that are not flattened.
+
+    run as:
+
+        python3 bench_cse.py
+"""
+
+import os
+import json
+
+from nmigen import Signal
+from nmigen.hdl.ir import Fragment
+
+from ieee754.part.partsig import PartitionedSignal, getsig
+from ieee754.part.test.test_partsig import TestAddMod, TestCSEMod
+from ieee754.fpcommon.test.bench_synth import synth, find_yosys
+
+
+def addmod_ports(module, mask):
+    outputs = [sig for (name, sig) in sorted(vars(module).items())
+               if name.endswith("_output")]
+    return [mask, module.a.sig, module.b.sig, module.carry_in] + outputs
+
+
+def csemod_ports(module, mask):
+    outputs = [getsig(out) for outs in module.outputs.values()
+               for out in outs]
+    return [mask, module.a.sig, module.b.sig] + outputs
+
+
+DESIGNS = {"add": (TestAddMod, addmod_ports),
+           "cse": (TestCSEMod, csemod_ports)}
+
+
+def build(name, cse, width=16):
+    """ elaborates design name, returns (fragment, ports)
+    """
+    kls, get_ports = DESIGNS[name]
+    mask = Signal(3) # 4-bit partitions
+    module = kls(width, mask)
+    PartitionedSignal.cse = cse
+    try:
+        fragment = Fragment.get(module, None)
+    finally:
+        PartitionedSignal.cse = True
+    return fragment, get_ports(module, mask)
+
+
+def bench_cse(width=16):
+    try:
+        find_yosys()
+        have_yosys = True
+    except FileNotFoundError:
+        have_yosys = False
+    results = []
+    for name in DESIGNS:
+        res = {"design": name}
+        for cse in (False, True):
+            key = "cse" if cse else "no_cse"
+            fragment, ports = build(name, cse, width)
+            res[key] = {"submodules": len(fragment.subfragments)}
+            if have_yosys:
+                workdir = os.path.join("sim_out", "synth",
+                                       "partsig_%s_%s" % (name, key))
+                stat = synth(fragment, ports, workdir)
+                il_size = os.path.getsize(os.path.join(workdir, "top.il"))
+                res[key].update(cells=stat["cells"], depth=stat["depth"],
+                                rtlil_bytes=il_size)
+        results.append(res)
+    return results
+
+
+if __name__ == '__main__':
+    results = bench_cse()
+    os.makedirs("sim_out", exist_ok=True)
+    with open(os.path.join("sim_out", "bench_cse.json"), "w") as f:
+        json.dump(results, f, indent=1)
+    for res in results:
+        line = "%-4s submodules %3d -> %3d" % (res["design"],
+                                               res["no_cse"]["submodules"],
+                                               res["cse"]["submodules"])
+        if "cells" in res["cse"]:
+            o, n = res["no_cse"]["cells"], res["cse"]["cells"]
+            line += ", cells %5d -> %5d (%.1f%% saved)" % \
+                        (o, n, (o - n) * 100.0 / o)
+            line += ", rtlil %d -> %d bytes" % \
+                        (res["no_cse"]["rtlil_bytes"],
+                         res["cse"]["rtlil_bytes"])
+        print(line)
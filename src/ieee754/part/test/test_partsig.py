@@ -5,6 +5,7 @@
 from nmigen import Signal, Module, Elaboratable, Mux, Cat, Shape
 from nmigen.back.pysim import Simulator, Delay, Settle
 from nmigen.cli import rtlil
+from nmigen.hdl.ir import Fragment
 
 from ieee754.part.partsig import PartitionedSignal
 from ieee754.part_mux.part_mux import PMux
@@ -862,5 +863,79 @@ class TestPartitionedSignal(unittest.TestCase):
             sim.run()
 
 
+class TestCSEMod(Elaboratable):
+    def __init__(self, width, partpoints):
+        self.partpoints = partpoints
+        self.a = PartitionedSignal(partpoints, width)
+        self.b = PartitionedSignal(partpoints, width)
+        self.outputs = {}
+
+    def elaborate(self, platform):
+        m = Module()
+        self.a.set_module(m)
+        self.b.set_module(m)
+        a, b = self.a, self.b
+        self.outputs = {"add": [a + b, a + b],
+                        "eq": [a == b, a != b, a.bool(), a.any()],
+                        "gt": [a > b, b < a, a < b],
+                        "xor": [a.xor(), a.xor()],
+                        "ls": [a << b, a << b, a >> b]}
+        return m
+
+
+class TestCSE(unittest.TestCase):
+    def elaborate(self):
+        module = TestCSEMod(16, Signal(3))
+        fragment = Fragment.get(module, None)
+        counts = {}
+        for sub, name in fragment.subfragments:
+            category = name.split("_")[0]
+            counts[category] = counts.get(category, 0) + 1
+        return module, counts
+
+    def test_cse(self):
+        module, counts = self.elaborate()
+        # a == b shared with a != b, and a.bool() with a.any()
+        self.assertEqual(counts, {"add": 1, "eq": 2, "gt": 2, "xor": 1,
+                                  "ls": 2})
+        outputs = module.outputs
+        self.assertIs(outputs["add"][0], outputs["add"][1])
+        self.assertIs(outputs["gt"][0], outputs["gt"][1])
+        self.assertIs(outputs["xor"][0], outputs["xor"][1])
+        self.assertIs(outputs["ls"][0], outputs["ls"][1])
+
+    def test_no_cse(self):
+        PartitionedSignal.cse = False
+        try:
+            module, counts = self.elaborate()
+        finally:
+            PartitionedSignal.cse = True
+        self.assertEqual(counts, {"add": 2, "eq": 4, "gt": 3, "xor": 2,
+                                  "ls": 3})
+
+
+class TestModNames(unittest.TestCase):
+    def build(self):
+        mask = Signal(3)
+        module = TestCSEMod(16, mask)
+        fragment = Fragment.get(module, None)
+        names = [name for (sub, name) in fragment.subfragments]
+        ports = [mask, module.a.sig, module.b.sig]
+        return names, rtlil.convert(module, ports=ports)
+
+    def test_names(self):
+        names, _ = self.build()
+        self.assertIn("add_w16_1", names)
+        self.assertIn("eq_w16_2", names)
+        self.assertNotIn("eq_w16_3", names)
+
+    def test_reproducible(self):
+        # the names do not depend on what was elaborated before
+        names1, il1 = self.build()
+        names2, il2 = self.build()
+        self.assertEqual(names1, names2)
+        self.assertEqual(il1, il2)
+
+
 if __name__ == '__main__':
     unittest.main()
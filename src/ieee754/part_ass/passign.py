@@ -14,15 +14,13 @@ See:
 
 """
 
+from ieee754.part.modnames import get_modname
 
 
-modcount = 0 # global for now
 def PAssign(m, val, assign, mask):
     from ieee754.part_ass.assign import PartitionedAssign # recursion issue
-    global modcount
-    modcount += 1
     pc = PartitionedAssign(val.shape(), assign, mask)
-    setattr(m.submodules, "pass%d" % modcount, pc)
+    setattr(m.submodules, get_modname(m, "pass", len(val)), pc)
     return val.lower().eq(pc.output.lower())
 
 
@@ -2,12 +2,12 @@
 # See Notices.txt for copyright information
 # Copyright (C) 2021 Luke Kenneth Casson Leighton <lkcl@lkcl.net>
 
+from ieee754.part.modnames import get_modname
+
 
-modcount = 0 # global for now
 def PCat(m, arglist, mask):
     from ieee754.part_cat.cat import PartitionedCat # avoid recursive import
-    global modcount
-    modcount += 1
     pc = PartitionedCat(arglist, mask)
-    setattr(m.submodules, "pcat%d" % modcount, pc)
+    width = len(pc.output)
+    setattr(m.submodules, get_modname(m, "pcat", width), pc)
     return pc.output
@@ -7,7 +7,8 @@ from nmigen.cli import main
 
 from ieee754.part_mul_add.multiply import (InputData, OutputData,
                                            AllTerms, AddReduceInternal,
-                                           Intermediates, FinalOut)
+                                           Intermediates, FinalOut,
+                                           get_n_terms)
                                             
 from nmutil.pipemodbase import PipeModBaseChain
 from nmutil.singlepipe import ControlBase
@@ -16,14 +17,15 @@ from ieee754.pipeline import PipelineSpec
 
 class MulStages(PipeModBaseChain):
 
-    def __init__(self, pspec, part_pts):
+    def __init__(self, pspec, part_pts, n_inputs):
         self.part_pts = part_pts
+        self.n_inputs = n_inputs
         super().__init__(pspec)
 
     def get_chain(self):
         # chain AddReduce, Intermediates and FinalOut
         part_pts = self.part_pts
-        n_inputs = 64 + 4
+        n_inputs = self.n_inputs
         at = AddReduceInternal(self.pspec, n_inputs, part_pts, partition_step=2)
         levels = at.levels
 
@@ -36,14 +38,15 @@ class MulStages(PipeModBaseChain):
 
 class AllTermsPipe(PipeModBaseChain):
 
-    def __init__(self, pspec, n_inputs):
+    def __init__(self, pspec, n_inputs, booth=False):
         self.n_inputs = n_inputs
+        self.booth = booth
         super().__init__(pspec)
 
     def get_chain(self):
         """ gets module
         """
-        nmod = AllTerms(self.pspec, self.n_inputs)
+        nmod = AllTerms(self.pspec, self.n_inputs, self.booth)
 
         return [nmod]
 
@@ -52,9 +55,10 @@ class MulPipe_8_16_32_64(ControlBase):
     """Signed/Unsigned 8/16/32/64-bit partitioned integer multiplier pipeline
     """
 
-    def __init__(self, id_wid=0, op_wid=0):
+    def __init__(self, id_wid=0, op_wid=0, booth=False):
         """ register_levels: specifies the points in the cascade at which
             flip-flops are to be inserted.
+            booth: use radix-4 Booth partial products (see AllTerms)
         """
 
         self.id_wid = id_wid # num_bits(num_rows)
@@ -64,11 +68,11 @@ class MulPipe_8_16_32_64(ControlBase):
 
         ControlBase.__init__(self)
 
-        n_inputs = 64 + 4
-        self.allterms = AllTermsPipe(self.pspec, n_inputs)
+        n_inputs = get_n_terms(booth)
+        self.allterms = AllTermsPipe(self.pspec, n_inputs, booth)
         stage = self.allterms.chain[0]
         part_pts = stage.i.part_pts
-        self.mulstages = MulStages(self.pspec, part_pts)
+        self.mulstages = MulStages(self.pspec, part_pts, n_inputs)
 
         self._eqs = self.connect([self.allterms, self.mulstages])
 
@@ -493,6 +493,153 @@ class ProductTerms(Elaboratable):
         return m
 
 
+class BoothTerm(Elaboratable):
+    """ creates a single radix-4 (modified) Booth partial product, for the
+        digit at b[2*digit-1:2*digit+2].  the digit is in {-2,-1,0,1,2}.
+
+        the partial product is (a * digit) << (2*digit), where a is only
+        those bytes of a that are in the same partition as the digit.
+        a and b are both treated as unsigned (the Part terms correct for
+        signed, exactly as for the ProductTerms).
+
+        negative digits are done as 1's complement, inverted all the way
+        up to the top of the (double-width) output partition, plus one.
+        the "plus one" comes out separately (neg_lsb) so that all of them
+        can be ORed into a single term.  at the bottom of a partition, the
+        Booth "b[2*digit-1]" bit is zero.
+    """
+
+    def __init__(self, twidth, pbwid, digit):
+        self.digit = digit
+        self.b_index = digit // 4 # the byte of b that the digit is in
+        self.twidth = twidth
+        self.pbwid = pbwid
+
+        self.a = Signal(twidth//2, reset_less=True)
+        self.b = Signal(twidth//2, reset_less=True)
+        self.pb_en = Signal(pbwid, reset_less=True)
+        self.term = Signal(twidth, name="booth_%d" % digit, reset_less=True)
+        self.neg_lsb = Signal(twidth, reset_less=True)
+        self.am = Signal(twidth//2, reset_less=True) # partition-selected a
+
+    def elaborate(self, platform):
+        m = Module()
+        comb = m.d.comb
+
+        b_index, twidth = self.b_index, self.twidth
+        pb_en = self.pb_en
+        shift = 2 * self.digit
+
+        # which bytes of a are in the same partition as this digit
+        te = []
+        for a_index in range(self.pbwid):
+            tl = []
+            for i in range(min(a_index, b_index), max(a_index, b_index)):
+                tl.append(pb_en[i])
+            if len(tl) == 0:
+                te.append(C(1, 1))
+                continue
+            en = Signal(name="te_%d" % a_index, reset_less=True)
+            comb += en.eq(~(Cat(*tl).bool()))
+            te.append(en)
+
+        # a (partition-selected), mask of the bits from the bottom of the
+        # partition upwards, the LSB of the partition, the output partition
+        asel, lmask, alsb, omask = [], [], [], []
+        for a_index in range(self.pbwid):
+            en = te[a_index]
+            asel.append(Mux(en, self.a.bit_select(a_index*8, 8), 0))
+            lmask.append(Repl(en if a_index < b_index else 1, 8))
+            if a_index == 0:
+                lsb = en
+            else:
+                lsb = en & pb_en[a_index-1]
+            alsb.append(Cat(lsb, C(0, 7)))
+        for a_index in range(self.pbwid*2):
+            omask.append(Repl(te[a_index//2], 8))
+
+        am = self.am
+        comb += am.eq(Cat(*asel))
+
+        # Booth recoding.  at the bottom of a partition, b[2*digit-1] is zero
+        b2 = self.b[shift+1]
+        b1 = self.b[shift]
+        if shift == 0:
+            b0 = C(0, 1)
+        elif shift % 8 == 0:
+            b0 = Mux(pb_en[b_index-1], 0, self.b[shift-1])
+        else:
+            b0 = self.b[shift-1]
+        one = Signal(reset_less=True)
+        two = Signal(reset_less=True)
+        neg = Signal(reset_less=True)
+        comb += [one.eq(b1 ^ b0),
+                 two.eq(Mux(b2, ~(b1 | b0), b1 & b0)),
+                 neg.eq(b2 & ~(b1 & b0)),
+                ]
+
+        # a, 2*a or zero, then 1's complement if negative
+        x = Signal(twidth, reset_less=True)
+        nx = Signal(twidth, reset_less=True)
+        comb += x.eq(Mux(one, am, 0) | Mux(two, am << 1, 0))
+        comb += nx.eq(Mux(neg, ~x & Cat(*lmask, Repl(1, twidth//2)), x))
+
+        comb += self.term.eq((nx << shift)[:twidth] & Cat(*omask))
+        comb += self.neg_lsb.eq(Mux(neg, Cat(*alsb) << shift, 0))
+
+        return m
+
+
+class BoothTerms(Elaboratable):
+    """ creates a bank of (4) radix-4 Booth terms, one byte of b.
+
+        if this byte is at the top of its partition, the top Booth digit
+        (for unsigned b, which has zero for its sign bits) is also created:
+        it is just a << (the top of the partition), if the MSB of b is set.
+    """
+
+    def __init__(self, twidth, pbwid, b_index):
+        self.b_index = b_index
+        self.twidth = twidth
+        self.pbwid = pbwid
+        self.a = Signal(twidth//2, reset_less=True)
+        self.b = Signal(twidth//2, reset_less=True)
+        self.pb_en = Signal(pbwid, reset_less=True)
+        self.terms = [Signal(twidth, name="term%d"%i, reset_less=True) \
+                            for i in range(4)]
+        self.neg_lsb = Signal(twidth, reset_less=True)
+        self.top = Signal(twidth, reset_less=True)
+
+    def elaborate(self, platform):
+
+        m = Module()
+        comb = m.d.comb
+        b_index = self.b_index
+
+        neg_lsbs = []
+        for i in range(4):
+            t = BoothTerm(self.twidth, self.pbwid, b_index*4+i)
+            setattr(m.submodules, "booth_%d" % i, t)
+
+            comb += t.a.eq(self.a)
+            comb += t.b.eq(self.b)
+            comb += t.pb_en.eq(self.pb_en)
+
+            comb += self.terms[i].eq(t.term)
+            neg_lsbs.append(t.neg_lsb)
+
+        # none of the +1s overlap (each is at a different bit)
+        comb += self.neg_lsb.eq(reduce(or_, neg_lsbs))
+
+        # top digit (b is unsigned), uses the partition-selected a of the
+        # last Booth term.  overlaps none of the other top terms
+        top_en = Signal(reset_less=True)
+        comb += top_en.eq(self.pb_en[b_index] & self.b[b_index*8+7])
+        comb += self.top.eq(Mux(top_en, t.am << ((b_index+1)*8), 0))
+
+        return m
+
+
 class LSBNegTerm(Elaboratable):
 
     def __init__(self, bit_width):
@@ -865,13 +1012,29 @@ class OutputData:
                 self.output.eq(rhs.output)]
 
 
+def get_n_terms(booth=False):
+    """ the number of terms that AllTerms creates (the AddReduce inputs)
+
+        * 64 byte-products (8x8), or 32 radix-4 Booth terms plus one
+          for the top (unsigned) digits and one for the Booth "+1"s
+        * plus the 4 signed correction terms (Part)
+    """
+    if booth:
+        return 32 + 2 + 4
+    return 64 + 4
+
+
 class AllTerms(PipeModBase):
     """Set of terms to be added together
     """
 
-    def __init__(self, pspec, n_inputs):
+    def __init__(self, pspec, n_inputs, booth=False):
         """Create an ``AllTerms``.
+
+        :param booth: use radix-4 (modified) Booth partial products, which
+            halves the number of terms (see get_n_terms)
         """
+        self.booth = booth
         self.n_inputs = n_inputs
         self.n_parts = pspec.n_parts
         self.output_width = pspec.width * 2
@@ -925,16 +1088,37 @@ class AllTerms(PipeModBase):
 
         terms = []
 
-        for a_index in range(8):
-            t = ProductTerms(8, 128, 8, a_index, 8)
-            setattr(m.submodules, "terms_%d" % a_index, t)
+        if self.booth:
+            tops, neg_lsbs = [], []
+            for b_index in range(8):
+                t = BoothTerms(128, 8, b_index)
+                setattr(m.submodules, "booth_%d" % b_index, t)
+
+                m.d.comb += t.a.eq(self.i.a)
+                m.d.comb += t.b.eq(self.i.b)
+                m.d.comb += t.pb_en.eq(pbs)
+
+                for term in t.terms:
+                    terms.append(term)
+                tops.append(t.top)
+                neg_lsbs.append(t.neg_lsb)
+
+            # again, these never overlap, so may be ORed together
+            for name, l in [("booth_top", tops), ("booth_neg_lsb", neg_lsbs)]:
+                term = Signal(128, name=name, reset_less=True)
+                m.d.comb += term.eq(reduce(or_, l))
+                terms.append(term)
+        else:
+            for a_index in range(8):
+                t = ProductTerms(8, 128, 8, a_index, 8)
+                setattr(m.submodules, "terms_%d" % a_index, t)
 
-            m.d.comb += t.a.eq(self.i.a)
-            m.d.comb += t.b.eq(self.i.b)
-            m.d.comb += t.pb_en.eq(pbs)
+                m.d.comb += t.a.eq(self.i.a)
+                m.d.comb += t.b.eq(self.i.b)
+                m.d.comb += t.pb_en.eq(pbs)
 
-            for term in t.terms:
-                terms.append(term)
+                for term in t.terms:
+                    terms.append(term)
 
         # it's fine to bitwise-or data together since they are never enabled
         # at the same time
@@ -1051,9 +1235,10 @@ class Mul8_16_32_64(Elaboratable):
             instruction.
     """
 
-    def __init__(self, register_levels=()):
+    def __init__(self, register_levels=(), booth=False):
         """ register_levels: specifies the points in the cascade at which
             flip-flops are to be inserted.
+            booth: use radix-4 Booth partial products (see AllTerms)
         """
 
         self.id_wid = 0 # num_bits(num_rows)
@@ -1063,6 +1248,7 @@ class Mul8_16_32_64(Elaboratable):
 
         # parameter(s)
         self.register_levels = list(register_levels)
+        self.booth = booth
 
         self.i = self.ispec()
         self.o = self.ospec()
@@ -1088,8 +1274,8 @@ class Mul8_16_32_64(Elaboratable):
 
         part_pts = self.part_pts
 
-        n_inputs = 64 + 4
-        t = AllTerms(self.pspec, n_inputs)
+        n_inputs = get_n_terms(self.booth)
+        t = AllTerms(self.pspec, n_inputs, self.booth)
         t.setup(m, self.i)
 
         terms = t.o.terms
@@ -43,15 +43,12 @@ def make_partition2(mask, width):
     jumpsize = width // mlen # amount to jump by (size of each partition)
     ppoints = {}
     ppos = jumpsize
-    print ("make_partition2", width, mask, len(mask), mlen, jumpsize)
     assert jumpsize > 0,  "incorrect width // mlen (%d // %d)" % (width, mlen)
     midx = 0
     while ppos < width and midx < mlen: # -1, ignore last bit
-        print ("    make_partition2", ppos, width, midx, mlen)
         ppoints[ppos] = mask[midx]
         ppos += jumpsize
         midx += 1
-    print ("    make_partition2", mask, width, ppoints)
     return ppoints
 
 
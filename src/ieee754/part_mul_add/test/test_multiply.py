@@ -516,9 +516,12 @@ class TestMul8_16_32_64(unittest.TestCase):
             yield from self.subtest_lanes_2(lanes, module, gen_or_check)
 
     def subtest_file(self,
-                     register_levels: List[int]) -> None:
-        module = Mul8_16_32_64(register_levels)
+                     register_levels: List[int],
+                     booth: bool = False) -> None:
+        module = Mul8_16_32_64(register_levels, booth)
         file_name = "mul8_16_32_64"
+        if booth:
+            file_name += "-booth"
         if len(register_levels) != 0:
             file_name += f"-{'_'.join(map(repr, register_levels))}"
         ports = [module.a,
@@ -633,9 +636,10 @@ class TestMul8_16_32_64(unittest.TestCase):
             sim.add_process(check_process)
             sim.run()
 
-    def subtest_register_levels(self, register_levels: List[int]) -> None:
+    def subtest_register_levels(self, register_levels: List[int],
+                                booth: bool = False) -> None:
         with self.subTest(register_levels=repr(register_levels)):
-            self.subtest_file(register_levels)
+            self.subtest_file(register_levels, booth)
 
     def test_empty(self) -> None:
         self.subtest_register_levels([])
@@ -718,6 +722,15 @@ class TestMul8_16_32_64(unittest.TestCase):
     def test_0_5(self) -> None:
         self.subtest_register_levels([0, 5])
 
+    def test_booth_0(self) -> None:
+        self.subtest_register_levels([0], True)
+
+    def test_booth_0_1_2_3_4_5_6_7_8(self) -> None:
+        self.subtest_register_levels([0, 1, 2, 3, 4, 5, 6, 7, 8], True)
+
+    def test_booth_2_5(self) -> None:
+        self.subtest_register_levels([2, 5], True)
+
     def test_0_6(self) -> None:
         self.subtest_register_levels([0, 6])
 
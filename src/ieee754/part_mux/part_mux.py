@@ -16,19 +16,17 @@ See:
 from nmigen import Signal, Module, Elaboratable, Mux
 from ieee754.part_mul_add.partpoints import PartitionPoints
 from ieee754.part_mul_add.partpoints import make_partition2
+from ieee754.part.modnames import get_modname
 
 
-modcount = 0 # global for now
 def PMux(m, mask, sel, a, b):
-    global modcount
-    modcount += 1
     width = len(a.sig)  # get width
     part_pts = make_partition2(mask, width) # create partition points
     pm = PartitionedMux(width, part_pts)
     m.d.comb += pm.a.eq(a.sig)
     m.d.comb += pm.b.eq(b.sig)
     m.d.comb += pm.sel.eq(sel)
-    setattr(m.submodules, "pmux%d" % modcount, pm)
+    setattr(m.submodules, get_modname(m, "pmux", width), pm)
     return pm.output
 
 
@@ -12,6 +12,28 @@ class PipelineSpec:
     :attribute id_wid: the Reservation Station muxid bitwidth
     :attribute op_wid: an "operand bitwidth" passed down all stages
     :attribute opkls: an optional class that is instantiated as the "operand"
+    :attribute dual_path: FPADD only: use the near/far dual-path adder
+    :attribute lza: FPADD only: normalise using a leading-zero anticipator
+    :attribute mul_register_levels: FPMUL only: None for a single-block
+               mantissa multiply, otherwise a list of the Wallace-tree
+               AddReduce levels after which to insert pipeline registers
+    :attribute compound_round: use FPCompoundRoundMod in FPNormToPack
+    :attribute early_out: FPADD/FPMUL/FPDIV: special-case (out_do_z)
+               results bypass all but the first stage (fpcommon/bypass)
+    :attribute stage_splits: FPADD/FPMUL: None for the default stages,
+               otherwise a list of the points (indices into the flat list
+               of PipeModBase modules) at which to insert pipeline registers
+    :attribute srt: FPDIV only: use the radix-4 SRT div/sqrt core
+               (div_rem_sqrt_rsqrt/srt.py) instead of the restoring one
+    :attribute newton: FPDIV only: use the Newton-Raphson div/sqrt/rsqrt
+               core (div_rem_sqrt_rsqrt/newton.py) instead of the restoring
+               one
+    :attribute iterative: FPDIV only: 0 for the pipelined restoring core,
+               otherwise the number of calculate stages in a multi-cycle
+               (FSM) one, which loops over them (fpdiv/divstages.py)
+    :attribute lanes: FPDIV iterative only: the number of those FSMs.  as
+               many operations are in flight, and they finish early on an
+               exact result, so out of order (ctx.muxid routes them)
 
     See ieee754/fpcommon/getop FPPipeContext for how (where) PipelineSpec
     is used.  FPPipeContext is passed down *every* stage of a pipeline
@@ -35,4 +57,14 @@ class PipelineSpec:
         self.core_config = None
         self.fpformat = None
         self.n_comb_stages = None
+        self.dual_path = False
+        self.lza = False
+        self.mul_register_levels = None
+        self.stage_splits = None
+        self.compound_round = False
+        self.early_out = False
+        self.srt = False
+        self.newton = False
+        self.iterative = 0
+        self.lanes = 1
 